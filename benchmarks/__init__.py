@@ -0,0 +1,4 @@
+"""Performance benchmarks for json_path_parser.
+
+Run ``python -m benchmarks --help`` from the repository root.
+"""
@@ -0,0 +1,136 @@
+"""Run the benchmarks.
+
+Examples, from the repository root::
+
+    python -m benchmarks                         # parse + evaluate, 1KB-1MB
+    python -m benchmarks --sizes 1MB,100MB --shapes array
+    python -m benchmarks --save benchmarks/baseline.json
+    python -m benchmarks --compare benchmarks/baseline.json
+    python -m benchmarks generate array 1GB big.json
+
+Evaluation benchmarks build the document in memory, which takes several
+times its JSON size; ``generate`` writes a document of any size to a
+file in constant memory, for the streaming, lazy and bulk APIs.
+"""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from collections.abc import Iterator, Sequence
+
+from .documents import SHAPES, parse_size, write_document
+from .runner import Result, calibrate, compare, run_evaluate, run_parse, save
+
+
+def _build_argument_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks",
+        description="Benchmark parsing, compiling and evaluating JSONPath.",
+    )
+    parser.add_argument(
+        "--group",
+        choices=("all", "parse", "evaluate"),
+        default="all",
+        help="which measurements to run",
+    )
+    parser.add_argument(
+        "--shapes",
+        default=",".join(SHAPES),
+        help=f"comma-separated document shapes ({', '.join(SHAPES)})",
+    )
+    parser.add_argument(
+        "--sizes",
+        default="1KB,1MB",
+        help="comma-separated document sizes, 1KB to 1GB",
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="timing rounds")
+    parser.add_argument(
+        "--no-memory",
+        action="store_true",
+        help="skip the peak memory measurement of evaluations",
+    )
+    parser.add_argument("--filter", default="", help="only ids containing this")
+    parser.add_argument("--save", metavar="FILE", help="write results as baseline")
+    parser.add_argument(
+        "--compare", metavar="FILE", help="fail on regressions against a baseline"
+    )
+    parser.add_argument(
+        "--threshold",
+        type=float,
+        default=0.25,
+        help="allowed slowdown for --compare (default: 0.25, i.e. 25%%)",
+    )
+    return parser
+
+
+def _print(result: Result) -> None:
+    peak = "" if result.peak_bytes is None else f"{result.peak_bytes / 1024:10.1f} KiB"
+    print(
+        f"{result.id:<60} {result.seconds * 1e6:12.2f} us"
+        f" {result.throughput:12.1f} {result.unit:<7} {peak}",
+        flush=True,
+    )
+
+
+def _generate(argv: Sequence[str]) -> int:
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks generate",
+        description="Write a synthetic JSON document to a file.",
+    )
+    parser.add_argument("shape", choices=SHAPES)
+    parser.add_argument("size", type=parse_size, help="e.g. 1KB, 10MB, 1GB")
+    parser.add_argument("file")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args(argv)
+    written = write_document(args.file, args.shape, args.size, args.seed)
+    print(f"wrote {written} bytes to {args.file}")
+    return 0
+
+
+def _measure(
+    args: argparse.Namespace, shapes: list[str], sizes: list[int]
+) -> Iterator[Result]:
+    """Run the selected benchmark groups, printing each kept result."""
+    measurements = []
+    if args.group in ("all", "parse"):
+        measurements.append(run_parse(args.repeat))
+    if args.group in ("all", "evaluate"):
+        measurements.append(
+            run_evaluate(shapes, sizes, args.repeat, memory=not args.no_memory)
+        )
+    for measurement in measurements:
+        for result in measurement:
+            if args.filter in result.id:
+                _print(result)
+                yield result
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Benchmark entry point; returns 1 if ``--compare`` finds regressions."""
+    argv = sys.argv[1:] if argv is None else list(argv)
+    if argv[:1] == ["generate"]:
+        return _generate(argv[1:])
+    args = _build_argument_parser().parse_args(argv)
+    shapes = args.shapes.split(",")
+    unknown = set(shapes) - set(SHAPES)
+    if unknown:
+        print(f"unknown shapes: {', '.join(sorted(unknown))}", file=sys.stderr)
+        return 2
+    sizes = [parse_size(size) for size in args.sizes.split(",")]
+
+    calibration = calibrate(args.repeat)
+    results = list(_measure(args, shapes, sizes))
+    calibration = min(calibration, calibrate(args.repeat))
+    if args.save:
+        save(results, calibration, args.save)
+    if args.compare:
+        regressions = compare(results, calibration, args.compare, args.threshold)
+        for result_id, ratio in regressions:
+            print(f"REGRESSION {result_id}: {ratio:.2f}x baseline", file=sys.stderr)
+        return 1 if regressions else 0
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,59 @@
+from __future__ import annotations
+
+from .documents import DEPTH
+
+# Every selector and filter construct of the grammar, for the parse,
+# transform and compile measurements. Names are stable benchmark ids.
+PARSE_PATHS = {
+    "root": "$",
+    "field": "$.store.book",
+    "field_wildcard": "$.store.*",
+    "index": "$.store.book[0]",
+    "negative_index": "$.store.book[-1]",
+    "index_list": "$.store.book[0,2,-1]",
+    "slice": "$.store.book[1:3]",
+    "slice_step": "$.store.book[::2]",
+    "wildcard_index": "$.store.book[*].title",
+    "quoted_name": "$['store']['special-key']",
+    "double_quoted_name": '$["store"]["book"]',
+    "recursive_name": "$..price",
+    "recursive_wildcard": "$.store..*",
+    "recursive_bracket": "$..[0]",
+    "filter_comparison": "$.store.book[?@.price < 10].title",
+    "filter_existence": "$.store.book[?@.isbn]",
+    "filter_logical": "$..book[?@.price >= 5 && (@.category == 'fiction' || !@.isbn)]",
+    "filter_absolute": "$.store.book[?@.price < $.expensive]",
+    "long_dotted": "$.a.b.c.d.e.f.g.h.i.j.k.l.m.n.o.p",
+}
+
+# Paths evaluated against each generated document shape.
+EVALUATE_PATHS = {
+    "wide": {
+        "field": "$.k0000000.name",
+        "field_wildcard": "$.*.price",
+        "recursive_name": "$..rating",
+        "filter_comparison": "$.*[?@.price < 50]",
+        "filter_logical": "$.*[?@.in_stock && @.meta.rating >= 4].id",
+    },
+    "deep": {
+        "index_chain": "$.branches[0]" + ".child" * DEPTH + ".name",
+        "wildcard_chain": "$.branches[*]" + ".child" * DEPTH + ".price",
+        "recursive_name": "$..price",
+        "recursive_wildcard": "$.branches[0]..*",
+        "filter_depth": f"$..[?@.level == {DEPTH // 2}].level",
+    },
+    "array": {
+        "index": "$.items[0].name",
+        "wildcard_index": "$.items[*].price",
+        "slice_step": "$.items[::10].id",
+        "index_list": "$.items[0,1,-1].id",
+        "recursive_name": "$..price",
+        "recursive_bracket": "$..[0]",
+        "quoted_name": "$.items[*]['special-key']",
+        "filter_comparison": "$.items[?@.price < 50].name",
+        "filter_existence": "$.items[?@.meta.discount].id",
+        "filter_logical": (
+            "$.items[?@.in_stock && (@.price < 20 || @.meta.rating == 5)]"
+        ),
+    },
+}
@@ -0,0 +1,143 @@
+from __future__ import annotations
+
+import json
+import random
+import re
+from collections.abc import Iterator
+from pathlib import Path
+from typing import Any
+
+SHAPES = ("wide", "deep", "array")
+DEPTH = 64
+
+_UNITS = {"B": 1, "KB": 1 << 10, "MB": 1 << 20, "GB": 1 << 30}
+_SIZE = re.compile(r"(\d+)\s*(B|KB|MB|GB)", re.IGNORECASE)
+# Share of generated records with ``in_stock`` true.
+_IN_STOCK_RATE = 0.7
+
+
+def parse_size(text: str) -> int:
+    """Convert a size such as ``"1KB"`` or ``"10MB"`` to bytes.
+
+    Raises:
+        ValueError: If ``text`` is not a number followed by B, KB, MB or GB.
+
+    """
+    match = _SIZE.fullmatch(text.strip())
+    if match is None:
+        msg = f"Invalid size {text!r}, expected e.g. 1KB, 10MB or 1GB"
+        raise ValueError(msg)
+    return int(match.group(1)) * _UNITS[match.group(2).upper()]
+
+
+def format_size(size: int) -> str:
+    """Render ``size`` bytes the way :func:`parse_size` reads it."""
+    for unit in ("GB", "MB", "KB"):
+        if size >= _UNITS[unit] and size % _UNITS[unit] == 0:
+            return f"{size // _UNITS[unit]}{unit}"
+    return f"{size}B"
+
+
+def _record(rng: random.Random, i: int) -> dict[str, Any]:
+    return {
+        "id": i,
+        "name": f"item-{i}",
+        "price": round(rng.uniform(1, 500), 2),
+        "in_stock": rng.random() < _IN_STOCK_RATE,
+        "tags": rng.sample(["a", "b", "c", "d", "e", "f"], rng.randint(0, 4)),
+        "special-key": rng.choice([None, "x", "y"]),
+        "meta": {"rating": rng.randint(1, 5), "discount": rng.choice([None, 0.1])},
+    }
+
+
+def _chain(rng: random.Random, i: int) -> dict[str, Any]:
+    node: dict[str, Any] = _record(rng, i)
+    for level in range(DEPTH, 0, -1):
+        node = {"level": level, "child": node}
+    return node
+
+
+def _items(shape: str, rng: random.Random) -> Iterator[tuple[str, Any]]:
+    # (member name, value) pairs of the document's single container.
+    i = 0
+    while True:
+        if shape == "wide":
+            yield f"k{i:07d}", _record(rng, i)
+        elif shape == "deep":
+            yield "", _chain(rng, i)
+        else:
+            yield "", _record(rng, i)
+        i += 1
+
+
+def iter_json(shape: str, size: int, seed: int = 0) -> Iterator[str]:
+    """Serialize a synthetic document of about ``size`` bytes, piece by piece.
+
+    The document is generated as it is written, so arbitrarily large
+    documents need constant memory. Its shape is one of:
+
+    * ``wide``: one object with a member per record (``$.k0000000``...).
+    * ``deep``: ``{"branches": [...]}`` of chains nested ``DEPTH`` levels
+      deep (``{"level": 1, "child": {...}}``), each ending in a record.
+    * ``array``: ``{"items": [...]}`` of records.
+
+    Args:
+        shape: One of :data:`SHAPES`.
+        size: Target size in bytes; the document stops at the first
+            record that reaches it, and always has at least one.
+        seed: Seed of the random values, for reproducible documents.
+
+    Yields:
+        Consecutive pieces of the JSON text.
+
+    Raises:
+        ValueError: If ``shape`` is unknown.
+
+    """
+    if shape not in SHAPES:
+        msg = f"Unknown shape {shape!r}, expected one of {SHAPES}"
+        raise ValueError(msg)
+    rng = random.Random(seed)
+    if shape == "wide":
+        opening, closing = "{", "}"
+    else:
+        opening = '{"branches": [' if shape == "deep" else '{"items": ['
+        closing = "]}"
+    yield opening
+    written = len(opening) + len(closing)
+    separator = ""
+    for name, value in _items(shape, rng):
+        piece = separator + json.dumps(value)
+        if shape == "wide":
+            piece = f'{separator}"{name}": {piece[len(separator) :]}'
+        yield piece
+        written += len(piece)
+        separator = ", "
+        if written >= size:
+            break
+    yield closing
+
+
+def build_document(shape: str, size: int, seed: int = 0) -> tuple[Any, int]:
+    """Generate a document in memory.
+
+    Returns:
+        The parsed document and the size of its JSON text in bytes.
+
+    """
+    text = "".join(iter_json(shape, size, seed))
+    return json.loads(text), len(text.encode())
+
+
+def write_document(path: str | Path, shape: str, size: int, seed: int = 0) -> int:
+    """Write a document to ``path`` without holding it in memory.
+
+    Returns:
+        The number of bytes written.
+
+    """
+    written = 0
+    with Path(path).open("w", encoding="utf-8") as f:
+        for piece in iter_json(shape, size, seed):
+            written += f.write(piece)
+    return written
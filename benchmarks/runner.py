@@ -0,0 +1,195 @@
+from __future__ import annotations
+
+import gc
+import json
+import platform
+import sys
+import timeit
+import tracemalloc
+from collections.abc import Callable, Iterator
+from dataclasses import asdict, dataclass
+from functools import partial
+from pathlib import Path
+from typing import TYPE_CHECKING, Any
+
+from json_path_parser.fast_parser import parse_fast
+from json_path_parser.parser import create_parser
+from json_path_parser.plan import BACKENDS, QueryPlan
+from json_path_parser.transformer import JSONPathTransformer
+
+from .corpus import EVALUATE_PATHS, PARSE_PATHS
+from .documents import build_document, format_size
+
+if TYPE_CHECKING:
+    from lark import Lark
+
+
+@dataclass
+class Result:
+    """One measurement: the best time per call and what it amounts to."""
+
+    id: str
+    seconds: float
+    throughput: float
+    unit: str
+    peak_bytes: int | None = None
+
+
+def best_time(
+    function: Callable[[], Any], repeat: int, min_time: float = 0.05
+) -> float:
+    """Return the fastest time per call of ``function`` over ``repeat`` rounds.
+
+    Each round runs ``function`` as many times as take ``min_time``
+    seconds (at least once), with the garbage collector disabled, as
+    :mod:`timeit` does.
+    """
+    timer = timeit.Timer(function)
+    number = 1
+    while (elapsed := timer.timeit(number)) < min_time:
+        number *= 2
+    rounds = [elapsed, *timer.repeat(repeat - 1, number)]
+    return min(rounds) / number
+
+
+_CALIBRATION_DOCUMENT = json.dumps(
+    {"items": [{"id": i, "name": f"item-{i}", "tags": ["a", "b"]} for i in range(50)]}
+)
+
+
+def _calibration_workload() -> None:
+    document = json.loads(_CALIBRATION_DOCUMENT)
+    total = 0
+    for item in document["items"]:
+        total += item["id"] + len(item["name"]) + len(item["tags"])
+    sorted(str(i) for i in range(200))
+
+
+def calibrate(repeat: int = 5) -> float:
+    """Time a fixed workload that does not use this package.
+
+    Baselines store it so :func:`compare` can factor out the speed of the
+    machine: results are compared relative to the calibration of the run
+    that produced them.
+    """
+    return best_time(_calibration_workload, repeat)
+
+
+def peak_memory(function: Callable[[], Any]) -> int:
+    """Return the peak bytes allocated by Python while ``function`` runs."""
+    gc.collect()
+    tracemalloc.start()
+    try:
+        function()
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return peak
+
+
+def run_parse(repeat: int) -> Iterator[Result]:
+    """Measure the parser stages separately for every path of the corpus.
+
+    ``parse`` is the Lark parse to a tree, ``transform`` the tree to AST
+    conversion, ``fast_parse`` the hand-written scanner (for the paths it
+    accepts) and ``compile/<backend>`` the AST to plan step.
+    """
+    parser = create_parser()
+    for name, path in PARSE_PATHS.items():
+        tree = parser.parse(path)
+        ast = JSONPathTransformer().transform(tree)
+        stages = {
+            "parse": lambda path=path: parser.parse(path),
+            "transform": lambda tree=tree: JSONPathTransformer().transform(tree),
+        }
+        if parse_fast(path) is not None:
+            stages["fast_parse"] = lambda path=path: parse_fast(path)
+        for backend in BACKENDS:
+            stages[f"compile/{backend}"] = lambda ast=ast, backend=backend: (
+                QueryPlan.from_path(ast, backend)
+            )
+        for stage, function in stages.items():
+            seconds = best_time(function, repeat)
+            yield Result(f"{stage}/{name}", seconds, 1 / seconds, "paths/s")
+
+
+def run_evaluate(
+    shapes: list[str], sizes: list[int], repeat: int, *, memory: bool = True
+) -> Iterator[Result]:
+    """Measure evaluation of the shape's paths on generated documents.
+
+    Throughput is the size of the document's JSON text processed per
+    second. The peak is the memory allocated during one evaluation, not
+    counting the document itself.
+    """
+    parser = create_parser()
+    for shape in shapes:
+        for size in sizes:
+            yield from _evaluate_document(parser, shape, size, repeat, memory=memory)
+
+
+def _evaluate_document(
+    parser: Lark, shape: str, size: int, repeat: int, *, memory: bool
+) -> Iterator[Result]:
+    # The document lives only in this frame, so it is freed before the
+    # next, possibly much larger, one is generated.
+    document, nbytes = build_document(shape, size)
+    for name, path in EVALUATE_PATHS[shape].items():
+        ast = JSONPathTransformer().transform(parser.parse(path))
+        for backend in BACKENDS:
+            plan = QueryPlan.from_path(ast, backend)
+            function = partial(plan.evaluate, document)
+            seconds = best_time(function, repeat)
+            yield Result(
+                f"evaluate/{shape}/{format_size(size)}/{backend}/{name}",
+                seconds,
+                nbytes / seconds / (1 << 20),
+                "MB/s",
+                peak_memory(function) if memory else None,
+            )
+
+
+def save(results: list[Result], calibration: float, path: str | Path) -> None:
+    """Write ``results`` and a description of the interpreter to ``path``."""
+    data = {
+        "python": sys.version,
+        "implementation": platform.python_implementation(),
+        "machine": platform.machine(),
+        "calibration": calibration,
+        "results": {result.id: asdict(result) for result in results},
+    }
+    Path(path).write_text(json.dumps(data, indent=2) + "\n", encoding="utf-8")
+
+
+def compare(
+    results: list[Result], calibration: float, path: str | Path, threshold: float
+) -> list[tuple[str, float]]:
+    """Compare ``results`` with a baseline written by :func:`save`.
+
+    Only benchmarks present in both are compared. Times are first divided
+    by the calibration of their run, so a baseline recorded on a faster or
+    slower machine (or a busier moment) still gives meaningful ratios.
+
+    Args:
+        results: The current measurements.
+        calibration: :func:`calibrate` time of the current run.
+        path: Baseline file.
+        threshold: Allowed slowdown, e.g. ``0.25`` for 25%.
+
+    Returns:
+        ``(id, ratio)`` of every benchmark slower than the baseline by
+        more than ``threshold``, where ``ratio`` is the calibrated current
+        time over the calibrated baseline time.
+
+    """
+    baseline = json.loads(Path(path).read_text(encoding="utf-8"))
+    speed = baseline["calibration"] / calibration
+    regressions = []
+    for result in results:
+        before = baseline["results"].get(result.id)
+        if before is None:
+            continue
+        ratio = result.seconds * speed / before["seconds"]
+        if ratio > 1 + threshold:
+            regressions.append((result.id, ratio))
+    return regressions
@@ -0,0 +1,79 @@
+"""Measure how evaluation against one shared document scales with threads.
+
+Run from the repository root, preferably on a free-threaded interpreter::
+
+    python3.13t -X gil=0 -m benchmarks.threads --size 10MB
+
+With the GIL enabled the speedup stays near 1x: threads take turns. With
+it disabled, evaluations run in parallel on one copy of the document.
+"""
+
+from __future__ import annotations
+
+import argparse
+import resource
+import sys
+import time
+from collections.abc import Sequence
+from concurrent.futures import ThreadPoolExecutor
+
+from json_path_parser.evaluator import as_plan
+from json_path_parser.threaded import default_workers, gil_enabled, select_batch
+
+from .corpus import EVALUATE_PATHS
+from .documents import SHAPES, build_document, parse_size
+
+
+def _thread_counts(text: str | None) -> list[int]:
+    if text:
+        return [int(count) for count in text.split(",")]
+    counts, count = [], 1
+    while count < default_workers():
+        counts.append(count)
+        count *= 2
+    return [*counts, default_workers()]
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Print throughput and speedup per thread count."""
+    parser = argparse.ArgumentParser(prog="python -m benchmarks.threads")
+    parser.add_argument("--shape", choices=SHAPES, default="array")
+    parser.add_argument("--size", type=parse_size, default=parse_size("1MB"))
+    parser.add_argument("--threads", help="comma-separated thread counts")
+    parser.add_argument(
+        "--queries", type=int, default=256, help="evaluations per measurement"
+    )
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args(argv)
+
+    document, nbytes = build_document(args.shape, args.size)
+    paths = list(EVALUATE_PATHS[args.shape].values())
+    plans = [as_plan(paths[i % len(paths)]) for i in range(args.queries)]
+    gil = "enabled" if gil_enabled() else "disabled"
+    print(
+        f"python {sys.version.split()[0]}, GIL {gil}, {default_workers()} CPUs,"
+        f" {args.shape} document of {nbytes} bytes"
+    )
+    print(f"{'threads':>7} {'queries/s':>12} {'speedup':>8} {'efficiency':>10}")
+    single = None
+    for count in _thread_counts(args.threads):
+        with ThreadPoolExecutor(count) as pool:
+            select_batch(document, plans[:count], executor=pool, max_workers=count)
+            best = float("inf")
+            for _ in range(args.repeat):
+                start = time.perf_counter()
+                select_batch(document, plans, executor=pool, max_workers=count)
+                best = min(best, time.perf_counter() - start)
+        rate = args.queries / best
+        single = single or rate
+        print(
+            f"{count:>7} {rate:>12.1f} {rate / single:>7.2f}x"
+            f" {rate / single / count:>9.0%}"
+        )
+    maxrss = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    print(f"peak RSS {maxrss / 1024:.0f} MiB (one shared document)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
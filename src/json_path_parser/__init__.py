@@ -0,0 +1,106 @@
+"""JSONPath (RFC 9535) parsing and evaluation.
+
+Public names are imported on first access (PEP 562), so importing the
+package stays cheap: Lark and the grammar are only loaded when a path
+actually needs the general parser.
+"""
+
+from __future__ import annotations
+
+import importlib
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .aio import aiter_stream, aiter_stream_many, astream_select
+    from .cache import (
+        PathCache,
+        cache_stats,
+        compile,  # noqa: A004
+        invalidate,
+        set_cache_size,
+    )
+    from .evaluator import JSONPathEvaluator
+    from .index import DocumentIndex
+    from .lazy import LazyDocument
+    from .locations import Location
+    from .multi import MultiPlan
+    from .mutation import delete_values, set_values, update_values
+    from .parser import create_parser
+    from .patch import apply_patch
+    from .plan import QueryPlan
+    from .streaming import StreamingQuery, iter_stream, stream_select
+    from .subscriptions import LiveDocument
+    from .threaded import select_batch, select_each
+    from .transformer import JSONPathTransformer
+
+_EXPORTS = {
+    "DocumentIndex": ".index",
+    "JSONPathEvaluator": ".evaluator",
+    "JSONPathTransformer": ".transformer",
+    "LazyDocument": ".lazy",
+    "LiveDocument": ".subscriptions",
+    "Location": ".locations",
+    "MultiPlan": ".multi",
+    "PathCache": ".cache",
+    "QueryPlan": ".plan",
+    "StreamingQuery": ".streaming",
+    "aiter_stream": ".aio",
+    "aiter_stream_many": ".aio",
+    "apply_patch": ".patch",
+    "astream_select": ".aio",
+    "cache_stats": ".cache",
+    "compile": ".cache",
+    "create_parser": ".parser",
+    "delete_values": ".mutation",
+    "invalidate": ".cache",
+    "iter_stream": ".streaming",
+    "select_batch": ".threaded",
+    "select_each": ".threaded",
+    "set_cache_size": ".cache",
+    "set_values": ".mutation",
+    "stream_select": ".streaming",
+    "update_values": ".mutation",
+}
+
+__all__ = [
+    "DocumentIndex",
+    "JSONPathEvaluator",
+    "JSONPathTransformer",
+    "LazyDocument",
+    "LiveDocument",
+    "Location",
+    "MultiPlan",
+    "PathCache",
+    "QueryPlan",
+    "StreamingQuery",
+    "aiter_stream",
+    "aiter_stream_many",
+    "apply_patch",
+    "astream_select",
+    "cache_stats",
+    "compile",
+    "create_parser",
+    "delete_values",
+    "invalidate",
+    "iter_stream",
+    "select_batch",
+    "select_each",
+    "set_cache_size",
+    "set_values",
+    "stream_select",
+    "update_values",
+]
+
+
+def __getattr__(name: str) -> Any:
+    module = _EXPORTS.get(name)
+    if module is None:
+        msg = f"module {__name__!r} has no attribute {name!r}"
+        raise AttributeError(msg)
+    value = getattr(importlib.import_module(module, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    return sorted({*globals(), *__all__})
@@ -1,80 +1,90 @@
+import argparse
+import json
+import logging
+import sys
+from collections.abc import Sequence
+
+from .bulk import DEFAULT_CHUNK_SIZE, iter_bulk
+from .evaluator import JSONPathEvaluator
 from .logger import logger
-from .parser import create_parser
-from .transformer import JSONPathTransformer
 
 
-from lark import Lark, Tree, Token, Transformer
-
-
-# First, let's create a detailed inspector
-def inspect_transformer_input(rule_name, items):
-    print(f"\n=== {rule_name} received ===")
-    print(f"Items count: {len(items)}")
-
-    for i, item in enumerate(items):
-        print(f"  [{i}] Type: {type(item).__name__}")
-
-        if isinstance(item, Tree):
-            print(f"      Tree.data: '{item.data}'")
-            print(f"      Tree.children: {item.children}")
-        elif isinstance(item, Token):
-            print(f"      Token.type: '{item.type}'")
-            print(f"      Token.value: '{item.value}' (repr: {repr(item.value)})")
-        else:
-            print(f"      Raw value: {repr(item)}")
-
-
-# Now let's create a transformer that shows us everything
-class InspectorTransformer(Transformer):
-    def field(self, items):
-        inspect_transformer_input("field", items)
-        # Don't transform, just return as-is to see the flow
-        return ("FIELD", items)
-
-    def bracket_selector(self, items):
-        inspect_transformer_input("bracket_selector", items)
-        return ("BRACKET_SELECTOR", items)
-
-    def index(self, items):
-        inspect_transformer_input("index", items)
-        return ("INDEX", items)
-
-    def slice(self, items):
-        inspect_transformer_input("slice", items)
-        return ("SLICE", items)
-
-    def wildcard_index(self, items):
-        inspect_transformer_input("wildcard_index", items)
-        return ("WILDCARD_INDEX", items)
-
-    def name(self, items):
-        inspect_transformer_input("name", items)
-        return ("NAME", items)
-
-    def recursive_selector(self, items):
-        inspect_transformer_input("recursive_selector", items)
-        return ("RECURSIVE_SELECTOR", items)
-
-    def root(self, items):
-        inspect_transformer_input("root", items)
-        return ("ROOT", items)
-
-
-def main():
+def _build_argument_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(
+        prog="parse",
+        description="Evaluate a JSONPath expression against a JSON or JSON Lines file.",
+    )
+    parser.add_argument(
+        "path", help="JSONPath expression, e.g. '$.store.book[*].title'"
+    )
+    parser.add_argument("file", nargs="?", help="input file (default: standard input)")
+    parser.add_argument(
+        "--jsonl",
+        action="store_true",
+        help="treat the input as JSON Lines; print one array of matches per record",
+    )
+    parser.add_argument(
+        "-j",
+        "--jobs",
+        type=int,
+        default=None,
+        help="worker processes for --jsonl (default: CPU count, 0: no pool)",
+    )
+    parser.add_argument(
+        "--unordered",
+        action="store_true",
+        help="with --jsonl, print records as they finish instead of in input order",
+    )
+    parser.add_argument(
+        "--chunk-size",
+        type=int,
+        default=DEFAULT_CHUNK_SIZE,
+        help="bytes of JSON Lines input sent to a worker at once",
+    )
+    return parser
+
+
+def main(argv: Sequence[str] | None = None) -> int:
+    """Command-line entry point.
+
+    Without ``--jsonl`` the input is loaded as one JSON document and each
+    match is printed on its own line. With ``--jsonl`` every record is
+    queried independently, in parallel, and printed as an array.
+    """
+    logging.basicConfig(
+        level=logging.WARNING,
+        format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
+    )
+    args = _build_argument_parser().parse_args(argv)
+    source = (
+        open(args.file, "rb")  # noqa: SIM115, PTH123
+        if args.file
+        else sys.stdin.buffer
+    )
+    out = sys.stdout
     try:
-        parser = create_parser()
-        sample_json_path = r"$.store.book[1:2].title"
-        parse_tree = parser.parse(sample_json_path)
-        # logger.info(parse_tree.pretty())
-
-        inspector = InspectorTransformer()
-        json_transformer = JSONPathTransformer()
-        result = json_transformer.transform(parse_tree)
-        logger.info(f"Result is {result}")
+        if args.jsonl:
+            for lineno, matches in iter_bulk(
+                args.path,
+                source,
+                workers=args.jobs,
+                ordered=not args.unordered,
+                chunk_size=args.chunk_size,
+            ):
+                if args.unordered:
+                    out.write(f"{lineno + 1}\t")
+                out.write(json.dumps(matches) + "\n")
+        else:
+            for match in JSONPathEvaluator(json.load(source)).iter_select(args.path):
+                out.write(json.dumps(match) + "\n")
     except Exception as e:
-        logger.error("An error occurred while parsing JSON.", exc_info=e)
-        raise
+        logger.error("An error occurred while evaluating %s.", args.path, exc_info=e)
+        return 1
+    finally:
+        if source is not sys.stdin.buffer:
+            source.close()
+    return 0
 
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())
@@ -0,0 +1,114 @@
+from __future__ import annotations
+
+import asyncio
+from collections.abc import AsyncIterable, AsyncIterator, Mapping
+from typing import Any, Protocol
+
+from .evaluator import PathLike
+from .streaming import DEFAULT_CHUNK_SIZE, StreamingQuery
+
+
+class AsyncReader(Protocol):
+    """An object with an ``async read(n)`` method.
+
+    :class:`asyncio.StreamReader` is one.
+    """
+
+    async def read(self, n: int = -1) -> bytes:
+        """Return up to ``n`` bytes, or all until EOF if ``n`` is -1."""
+
+
+AsyncSource = AsyncIterable[bytes] | AsyncIterable[str] | AsyncReader
+
+
+async def _chunks(source: AsyncSource, chunk_size: int) -> AsyncIterator[Any]:
+    # Readers are checked first: asyncio.StreamReader is also async
+    # iterable, but by lines. Chunks of an iterable are cut to at most
+    # chunk_size so that one large network read is tokenized in several
+    # steps, with the loop running in between.
+    if callable(getattr(source, "read", None)):
+        while chunk := await source.read(chunk_size):
+            yield chunk
+        return
+    async for chunk in source:
+        if isinstance(chunk, str):
+            for start in range(0, len(chunk), chunk_size):
+                yield chunk[start : start + chunk_size]
+        else:
+            view = memoryview(chunk)
+            for start in range(0, len(view), chunk_size):
+                yield view[start : start + chunk_size]
+
+
+async def aiter_stream(
+    path: PathLike, source: AsyncSource, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> AsyncIterator[Any]:
+    """Asynchronously yield the values ``path`` selects from a JSON byte stream.
+
+    The asyncio counterpart of :func:`~json_path_parser.streaming.iter_stream`:
+    the document is tokenized as chunks arrive and never buffered whole, and
+    each match is yielded as soon as its value is complete. After every
+    ``chunk_size`` bytes of input the generator hands control back to the
+    event loop, so a large document cannot stall other tasks.
+
+    Args:
+        path: A path string, parsed JSONPath or compiled QueryPlan.
+        source: Async iterable of ``bytes`` (or ``str``) chunks, e.g. an
+            HTTP body stream, or a reader with ``async read(n)`` such as
+            :class:`asyncio.StreamReader`.
+        chunk_size: Most bytes tokenized between two yields to the loop.
+
+    Yields:
+        Matched values, in document order.
+
+    Raises:
+        ValueError: If the input is not valid JSON, see
+            :class:`~json_path_parser.streaming.StreamingQuery`.
+
+    """
+    query = StreamingQuery(path)
+    async for chunk in _chunks(source, chunk_size):
+        for match in query.feed(chunk):
+            yield match
+        await asyncio.sleep(0)
+    for match in query.close():
+        yield match
+
+
+async def aiter_stream_many(
+    paths: Mapping[str, PathLike],
+    source: AsyncSource,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> AsyncIterator[tuple[str, Any]]:
+    """Evaluate several paths over one JSON byte stream in a single pass.
+
+    Every chunk is fed to one streaming query per path, so the body is
+    read once however many paths are asked for.
+
+    Args:
+        paths: Mapping of caller-chosen key to path.
+        source: As for :func:`aiter_stream`.
+        chunk_size: As for :func:`aiter_stream`.
+
+    Yields:
+        ``(key, value)`` pairs. Each path's matches come in document
+        order; matches of different paths completed by the same chunk
+        are grouped by path, in the order of ``paths``.
+
+    """
+    queries = {key: StreamingQuery(path) for key, path in paths.items()}
+    async for chunk in _chunks(source, chunk_size):
+        for key, query in queries.items():
+            for match in query.feed(chunk):
+                yield key, match
+        await asyncio.sleep(0)
+    for key, query in queries.items():
+        for match in query.close():
+            yield key, match
+
+
+async def astream_select(
+    path: PathLike, source: AsyncSource, chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> list[Any]:
+    """Return every value ``path`` selects from a JSON byte stream."""
+    return [match async for match in aiter_stream(path, source, chunk_size)]
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import json
+import os
+from collections import deque
+from collections.abc import Iterator
+from concurrent.futures import (
+    FIRST_COMPLETED,
+    Executor,
+    Future,
+    ProcessPoolExecutor,
+    wait,
+)
+from typing import IO, Any
+
+from .cache import compile as compile_path
+from .plan import QueryPlan
+
+DEFAULT_CHUNK_SIZE = 1 << 23
+
+Record = tuple[int, list[Any]]
+"""The zero-based line number of a JSON Lines record and the values selected from it."""
+
+_worker_plan: QueryPlan | None = None
+
+
+def _init_worker(path: str) -> None:
+    # Each worker compiles the path once and keeps the plan for every chunk.
+    global _worker_plan  # noqa: PLW0603
+    _worker_plan = compile_path(path)
+
+
+def _evaluate_chunk(plan: QueryPlan, chunk: bytes, first_line: int) -> list[Record]:
+    records = []
+    for offset, line in enumerate(chunk.split(b"\n")):
+        if not line.strip():
+            continue
+        lineno = first_line + offset
+        try:
+            document = json.loads(line)
+        except ValueError as e:
+            msg = f"Invalid JSON on line {lineno + 1}: {e}"
+            raise ValueError(msg) from None
+        records.append((lineno, plan.evaluate(document)))
+    return records
+
+
+def _worker_evaluate(chunk: bytes, first_line: int) -> list[Record]:
+    return _evaluate_chunk(_worker_plan, chunk, first_line)
+
+
+def iter_chunks(
+    stream: IO[bytes], chunk_size: int = DEFAULT_CHUNK_SIZE
+) -> Iterator[tuple[bytes, int]]:
+    """Split a JSON Lines stream into chunks of whole lines.
+
+    Args:
+        stream: Binary file object to read.
+        chunk_size: Approximate number of bytes per chunk; a chunk is
+            extended to the end of the line it stops in.
+
+    Yields:
+        ``(chunk, first_line)`` pairs, where ``first_line`` is the
+        zero-based line number of the chunk's first line.
+
+    """
+    first_line = 0
+    remainder = b""
+    while data := stream.read(chunk_size):
+        data = remainder + data
+        cut = data.rfind(b"\n") + 1
+        if cut == 0:
+            remainder = data
+            continue
+        chunk, remainder = data[:cut], data[cut:]
+        yield chunk, first_line
+        first_line += chunk.count(b"\n")
+    if remainder:
+        yield remainder, first_line
+
+
+def iter_bulk(  # noqa: PLR0913
+    path: str,
+    source: IO[bytes] | str | os.PathLike[str],
+    *,
+    workers: int | None = None,
+    ordered: bool = True,
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+    max_in_flight: int | None = None,
+) -> Iterator[Record]:
+    """Evaluate ``path`` against every record of a JSON Lines input.
+
+    The input is read in large chunks of whole lines, which are fanned
+    out to a process pool; each worker compiles the path once, then parses
+    and queries its chunks independently, so throughput scales with the
+    number of cores. At most ``max_in_flight`` chunks are read ahead of
+    the consumer, which bounds memory use regardless of the input size.
+
+    Args:
+        path: JSONPath expression. It is sent to the workers as a string
+            and compiled there.
+        source: Binary file object, or a filesystem path.
+        workers: Number of worker processes; defaults to the CPU count.
+            ``0`` evaluates in the calling process, without a pool.
+        ordered: Yield records in input order. When False, the records of
+            each chunk are yielded as soon as that chunk is done.
+        chunk_size: Approximate number of bytes sent to a worker at once.
+        max_in_flight: Maximum number of chunks submitted but not yet
+            consumed; defaults to twice the number of workers.
+
+    Yields:
+        ``(line_number, matches)`` for every non-blank line.
+
+    Raises:
+        ValueError: If a line is not valid JSON.
+
+    """
+    plan = compile_path(path)  # Fail fast on an invalid path.
+    if isinstance(source, str | os.PathLike):
+        with open(source, "rb") as stream:  # noqa: PTH123
+            yield from iter_bulk(
+                path,
+                stream,
+                workers=workers,
+                ordered=ordered,
+                chunk_size=chunk_size,
+                max_in_flight=max_in_flight,
+            )
+        return
+
+    chunks = iter_chunks(source, chunk_size)
+    if workers == 0:
+        for chunk, first_line in chunks:
+            yield from _evaluate_chunk(plan, chunk, first_line)
+        return
+
+    workers = workers or os.cpu_count() or 1
+    limit = max(1, max_in_flight or 2 * workers)
+    with ProcessPoolExecutor(
+        workers, initializer=_init_worker, initargs=(path,)
+    ) as pool:
+        if ordered:
+            yield from _iter_ordered(pool, chunks, limit)
+        else:
+            yield from _iter_unordered(pool, chunks, limit)
+
+
+def _iter_ordered(
+    pool: Executor, chunks: Iterator[tuple[bytes, int]], limit: int
+) -> Iterator[Record]:
+    """Keep up to ``limit`` chunks in flight, yielding them in input order."""
+    queue: deque[Future[list[Record]]] = deque()
+    for chunk, first_line in chunks:
+        if len(queue) >= limit:
+            yield from queue.popleft().result()
+        queue.append(pool.submit(_worker_evaluate, chunk, first_line))
+    while queue:
+        yield from queue.popleft().result()
+
+
+def _iter_unordered(
+    pool: Executor, chunks: Iterator[tuple[bytes, int]], limit: int
+) -> Iterator[Record]:
+    """Keep up to ``limit`` chunks in flight, yielding each as it completes."""
+    pending: set[Future[list[Record]]] = set()
+    for chunk, first_line in chunks:
+        if len(pending) >= limit:
+            done, pending = wait(pending, return_when=FIRST_COMPLETED)
+            for future in done:
+                yield from future.result()
+        pending.add(pool.submit(_worker_evaluate, chunk, first_line))
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            yield from future.result()
+
+
+def bulk_select(
+    path: str,
+    source: IO[bytes] | str | os.PathLike[str],
+    **kwargs: Any,
+) -> list[list[Any]]:
+    """Return the matches for every record of a JSON Lines input, in order.
+
+    Keyword arguments are passed to :func:`iter_bulk`.
+    """
+    return [matches for _, matches in iter_bulk(path, source, ordered=True, **kwargs)]
@@ -0,0 +1,246 @@
+from __future__ import annotations
+
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass
+from time import perf_counter
+from typing import TYPE_CHECKING
+
+from . import metrics
+from .fast_parser import parse_fast
+from .parsed_dataclasses import JSONPath
+from .plan import QueryPlan
+
+if TYPE_CHECKING:
+    from lark import Lark
+
+    from .metrics import MetricsRegistry
+
+DEFAULT_CACHE_SIZE = 1024
+
+
+@dataclass(frozen=True)
+class CacheStats:
+    """Snapshot of a :class:`PathCache`'s counters."""
+
+    hits: int
+    misses: int
+    evictions: int
+    size: int
+    maxsize: int
+
+    @property
+    def hit_rate(self) -> float:
+        """Fraction of lookups served from the cache."""
+        lookups = self.hits + self.misses
+        return self.hits / lookups if lookups else 0.0
+
+
+class PathCache:
+    """Bounded, thread-safe LRU cache of compiled JSONPath expressions.
+
+    Entries are immutable :class:`QueryPlan` objects, so one cached plan
+    can be shared by every caller and evaluated any number of times. Keys
+    are expression strings or, since parsed paths are hashable, parsed
+    :class:`JSONPath` objects.
+
+    Simple paths are parsed by :func:`parse_fast`; only other
+    expressions load Lark and build the grammar. Parsing happens outside
+    the lock, so a slow miss never blocks hits on other threads. If two
+    threads miss on the same string concurrently the first result to be
+    stored wins and both callers receive it.
+    """
+
+    def __init__(
+        self,
+        maxsize: int = DEFAULT_CACHE_SIZE,
+        parser: Lark | None = None,
+        backend: str = "interpreter",
+    ) -> None:
+        """Create an empty cache.
+
+        Args:
+            maxsize: Maximum number of paths kept. ``0`` disables caching.
+            parser: Parser used on a miss; a shared LALR parser by default.
+            backend: Evaluation backend of the cached plans, see
+                :meth:`QueryPlan.from_path`.
+
+        Raises:
+            ValueError: If ``maxsize`` is negative.
+
+        """
+        if maxsize < 0:
+            msg = "maxsize must be >= 0"
+            raise ValueError(msg)
+        self._maxsize = maxsize
+        self._parser = parser
+        self._backend = backend
+        self._entries: OrderedDict[str | JSONPath, QueryPlan] = OrderedDict()
+        self._lock = threading.Lock()
+        self._hits = 0
+        self._misses = 0
+        self._evictions = 0
+
+    def get(self, path_str: str | JSONPath) -> QueryPlan:
+        """Return the compiled plan for ``path_str``, parsing it on a miss.
+
+        Args:
+            path_str: JSONPath expression, e.g. ``"$.store.book[0]"``, or
+                an already parsed JSONPath.
+
+        Returns:
+            The cached (or freshly compiled) QueryPlan.
+
+        """
+        with self._lock:
+            plan = self._entries.get(path_str)
+            if plan is not None:
+                self._entries.move_to_end(path_str)
+                self._hits += 1
+                return plan
+            self._misses += 1
+
+        plan = self._compile(path_str)
+
+        with self._lock:
+            existing = self._entries.get(path_str)
+            if existing is not None:
+                return existing
+            if self._maxsize:
+                self._entries[path_str] = plan
+                self._evict()
+        return plan
+
+    def invalidate(self, path_str: str | JSONPath | None = None) -> None:
+        """Drop one entry, or every entry when ``path_str`` is None."""
+        with self._lock:
+            if path_str is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(path_str, None)
+
+    def resize(self, maxsize: int) -> None:
+        """Change the capacity, evicting least recently used entries if needed."""
+        if maxsize < 0:
+            msg = "maxsize must be >= 0"
+            raise ValueError(msg)
+        with self._lock:
+            self._maxsize = maxsize
+            self._evict()
+
+    def reset_stats(self) -> None:
+        """Zero the hit, miss and eviction counters."""
+        with self._lock:
+            self._hits = self._misses = self._evictions = 0
+
+    def stats(self) -> CacheStats:
+        """Return a consistent snapshot of the cache counters."""
+        with self._lock:
+            return CacheStats(
+                hits=self._hits,
+                misses=self._misses,
+                evictions=self._evictions,
+                size=len(self._entries),
+                maxsize=self._maxsize,
+            )
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, path_str: object) -> bool:
+        return path_str in self._entries
+
+    def _evict(self) -> None:
+        while len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+            self._evictions += 1
+
+    def _compile(self, path_str: str | JSONPath) -> QueryPlan:
+        recorder = metrics.active
+        if isinstance(path_str, JSONPath):
+            path, source = path_str, None
+        else:
+            path, source = None, path_str
+            if self._parser is None:
+                start = perf_counter()
+                path = parse_fast(path_str)
+                if path is not None and recorder is not None:
+                    recorder.parse_seconds.observe(perf_counter() - start, ("fast",))
+            if path is None:
+                path = self._parse(path_str, recorder)
+        start = perf_counter()
+        plan = QueryPlan.from_path(path, backend=self._backend, source=source)
+        if recorder is not None:
+            recorder.compile_seconds.observe(perf_counter() - start, (self._backend,))
+        return plan
+
+    def _parse(self, path_str: str, recorder: MetricsRegistry | None) -> JSONPath:
+        from .transformer import JSONPathTransformer
+
+        parser = self._parser if self._parser is not None else _shared_parser()
+        start = perf_counter()
+        try:
+            tree = parser.parse(path_str)
+            parsed = perf_counter()
+            path = JSONPathTransformer().transform(tree)
+        except Exception:
+            if recorder is not None:
+                recorder.parse_errors.inc()
+            raise
+        if recorder is not None:
+            recorder.parse_seconds.observe(parsed - start, ("lark",))
+            recorder.transform_seconds.observe(perf_counter() - parsed)
+        return path
+
+
+_parser_lock = threading.Lock()
+_parser: Lark | None = None
+
+
+def _shared_parser() -> Lark:
+    """Return the process-wide LALR parser, loading it on first use."""
+    global _parser  # noqa: PLW0603
+    if _parser is None:
+        from .parser import default_parser
+
+        with _parser_lock:
+            if _parser is None:
+                # Lark's LALR parser keeps all parse state per call; the only
+                # shared write is the lazy, idempotent build of each lexer
+                # state's scanner. One parser is therefore shared by all
+                # threads.
+                _parser = default_parser()
+    return _parser
+
+
+default_cache = PathCache()
+
+
+def compile(path_str: str | JSONPath) -> QueryPlan:  # noqa: A001
+    """Compile a JSONPath expression, memoized in the default cache.
+
+    Args:
+        path_str: JSONPath expression, e.g. ``"$.store.book[*].author"``,
+            or an already parsed JSONPath.
+
+    Returns:
+        The immutable plan for the expression. The same object is returned
+        for repeated calls.
+
+    """
+    return default_cache.get(path_str)
+
+
+def cache_stats() -> CacheStats:
+    """Return hit/miss/eviction counters of the default cache."""
+    return default_cache.stats()
+
+
+def invalidate(path_str: str | JSONPath | None = None) -> None:
+    """Drop ``path_str`` (or everything) from the default cache."""
+    default_cache.invalidate(path_str)
+
+
+def set_cache_size(maxsize: int) -> None:
+    """Resize the default cache."""
+    default_cache.resize(maxsize)
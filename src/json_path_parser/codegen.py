@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Iterator
+from typing import Any
+
+from .optimizer import expand
+from .parsed_dataclasses import (
+    BracketSelector,
+    Field,
+    Index,
+    IndexList,
+    JSONPath,
+    Name,
+    RecursiveSelector,
+    Slice,
+    WildcardIndex,
+)
+from .plan import compile_segment, iter_containers
+
+QueryFunction = Callable[[Any], list[Any] | Iterator[Any]]
+
+_INDENT = "    "
+
+
+_MISSING = object()
+
+
+class _Emitter:
+    """Accumulates generated source lines and the objects they reference."""
+
+    def __init__(self) -> None:
+        self.lines: list[str] = []
+        self.namespace: dict[str, Any] = {"_MISSING": _MISSING}
+        self.depth = 1
+        self._counter = 0
+
+    def emit(self, line: str) -> None:
+        self.lines.append(_INDENT * self.depth + line)
+
+    def fresh(self, prefix: str) -> str:
+        self._counter += 1
+        return f"{prefix}{self._counter}"
+
+    def bind(self, prefix: str, obj: Any) -> str:
+        name = self.fresh(f"_{prefix}")
+        self.namespace[name] = obj
+        return name
+
+
+def _emit_field(out: _Emitter, current: str, name: str) -> str:
+    child = out.fresh("v")
+    out.emit(f"if isinstance({current}, dict):")
+    out.depth += 1
+    out.emit(f"{child} = {current}.get({name!r}, _MISSING)")
+    out.emit(f"if {child} is not _MISSING:")
+    out.depth += 1
+    return child
+
+
+def _emit_all(out: _Emitter, current: str) -> str:
+    child = out.fresh("v")
+    out.emit(
+        f"for {child} in ({current} if isinstance({current}, list) "
+        f"else {current}.values() if isinstance({current}, dict) else ()):",
+    )
+    out.depth += 1
+    return child
+
+
+def _emit_index(out: _Emitter, current: str, idx: int) -> str:
+    child = out.fresh("v")
+    bound = f"len({current}) > {idx}" if idx >= 0 else f"len({current}) >= {-idx}"
+    out.emit(f"if isinstance({current}, list) and {bound}:")
+    out.depth += 1
+    out.emit(f"{child} = {current}[{idx}]")
+    return child
+
+
+def _emit_indices(out: _Emitter, current: str, indices: tuple[int, ...]) -> str:
+    child = out.fresh("v")
+    length = out.fresh("n")
+    idx = out.fresh("i")
+    out.emit(f"if isinstance({current}, list):")
+    out.depth += 1
+    out.emit(f"{length} = len({current})")
+    out.emit(f"for {idx} in {tuple(indices)!r}:")
+    out.depth += 1
+    out.emit(f"if -{length} <= {idx} < {length}:")
+    out.depth += 1
+    out.emit(f"{child} = {current}[{idx}]")
+    return child
+
+
+def _emit_slice(out: _Emitter, current: str, slice_obj: Slice) -> str:
+    child = out.fresh("v")
+    if slice_obj.step == 0:
+        # RFC 9535: a zero step selects nothing.
+        out.emit(f"for {child} in ():")
+        out.depth += 1
+        return child
+    parts = (slice_obj.start, slice_obj.end, slice_obj.step)
+    bounds = ":".join("" if part is None else str(part) for part in parts)
+    out.emit(f"if isinstance({current}, list):")
+    out.depth += 1
+    # A full slice iterates the array itself rather than a copy.
+    items = current if bounds == "::" else f"{current}[{bounds}]"
+    out.emit(f"for {child} in {items}:")
+    out.depth += 1
+    return child
+
+
+def _emit_recursive(out: _Emitter, current: str, segment: RecursiveSelector) -> str:
+    descend = out.bind("descend", iter_containers)
+    node = out.fresh("d")
+    out.emit(f"for {node} in {descend}({current}):")
+    out.depth += 1
+    inner = segment.name if segment.name is not None else Field(name="*", wildcard=True)
+    return _emit_segment(out, node, inner)
+
+
+def _emit_step(out: _Emitter, current: str, segment: Any) -> str:
+    # Segments without a specialized template run the interpreter's step.
+    step = out.bind("step", compile_segment(segment))
+    child = out.fresh("v")
+    out.emit(f"for {child} in {step}({current}, document):")
+    out.depth += 1
+    return child
+
+
+def _emit_segment(out: _Emitter, current: str, segment: Any) -> str:  # noqa: PLR0911
+    """Emit code selecting from ``current``; return the child variable name."""
+    if isinstance(segment, Field):
+        if segment.wildcard:
+            return _emit_all(out, current)
+        return _emit_field(out, current, segment.name)
+    if isinstance(segment, BracketSelector):
+        content = segment.content
+        if isinstance(content, Index):
+            return _emit_index(out, current, content.idx)
+        if isinstance(content, Name):
+            return _emit_field(out, current, content.name)
+        if isinstance(content, WildcardIndex):
+            return _emit_all(out, current)
+        if isinstance(content, IndexList):
+            return _emit_indices(out, current, content.indices)
+        if isinstance(content, Slice):
+            return _emit_slice(out, current, content)
+    if isinstance(segment, RecursiveSelector):
+        return _emit_recursive(out, current, segment)
+    return _emit_step(out, current, segment)
+
+
+def _generate(
+    segments: tuple[Any, ...] | list[Any], *, generator: bool = False
+) -> _Emitter:
+    out = _Emitter()
+    if not generator:
+        out.emit("_out = []")
+        out.emit("_append = _out.append")
+    body_depth = out.depth
+    current = "document"
+    for segment in expand(segments):
+        current = _emit_segment(out, current, segment)
+    out.emit(f"yield {current}" if generator else f"_append({current})")
+    out.depth = body_depth
+    if not generator:
+        out.emit("return _out")
+    out.lines.insert(0, "def query(document):")
+    return out
+
+
+def generate_source(path: JSONPath, *, generator: bool = False) -> str:
+    """Return the Python source generated for ``path``.
+
+    Useful for inspecting what the code-generation backend produces; the
+    function defined is named ``query`` and takes the document.
+    """
+    return "\n".join(_generate(path.segments, generator=generator).lines) + "\n"
+
+
+def compile_function(
+    segments: tuple[Any, ...] | list[Any],
+    *,
+    generator: bool = False,
+) -> QueryFunction:
+    """Compile path segments into a specialized Python function.
+
+    Each segment becomes a nested ``if``/``for`` block that works directly
+    on ``dict.get``, list indexing and slicing, so evaluation does no type
+    dispatch and builds no intermediate selections. The results are
+    identical to :meth:`QueryPlan.evaluate`.
+
+    Args:
+        segments: Segments of a parsed JSONPath.
+        generator: Emit a generator function that yields matches lazily
+            instead of returning a list.
+
+    Returns:
+        A function mapping a document to the selected values.
+
+    Raises:
+        SyntaxError: If the path nests deeper than CPython can compile.
+
+    """
+    out = _generate(segments, generator=generator)
+    source = "\n".join(out.lines) + "\n"
+    code = compile(source, "<jsonpath-codegen>", "exec")
+    exec(code, out.namespace)  # noqa: S102
+    return out.namespace["query"]
@@ -0,0 +1,209 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Mapping
+from itertools import islice
+from typing import TYPE_CHECKING, Any
+
+from .evaluator import PathLike, as_plan
+from .filters import NOTHING, compile_singular_query
+from .optimizer import expand
+from .parsed_dataclasses import FilterQuery
+
+if TYPE_CHECKING:
+    import numpy as np
+    from numpy.typing import DTypeLike
+
+_INITIAL_CAPACITY = 1 << 14
+_CHUNK_SIZE = 1 << 12
+
+
+def _numpy() -> Any:
+    try:
+        import numpy as np
+    except ImportError as e:
+        msg = "Columnar selection requires NumPy: pip install 'json-path-parser[numpy]'"
+        raise ImportError(msg) from e
+    return np
+
+
+_ACCEPTED_TYPES = {
+    "i": frozenset({int}),
+    "u": frozenset({int}),
+    "f": frozenset({int, float}),
+    "c": frozenset({int, float}),
+    "b": frozenset({bool}),
+    "U": frozenset({str}),
+    "S": frozenset({str}),
+}
+
+
+def _fill_each(
+    values: list[Any],
+    data: np.ndarray,
+    mask: np.ndarray,
+    start: int,
+    types: frozenset[type] | None,
+) -> None:
+    for i, value in enumerate(values, start):
+        if (
+            value is None
+            or value is NOTHING
+            or (types is not None and type(value) not in types)
+        ):
+            mask[i] = True
+            continue
+        try:
+            data[i] = value
+        except OverflowError:
+            mask[i] = True
+
+
+def _fill(
+    values: Iterable[Any], data: np.ndarray, mask: np.ndarray, start: int = 0
+) -> int:
+    """Write ``values`` into ``data`` from ``start`` and return the end offset.
+
+    Values are stored if their JSON type fits the dtype and their value
+    is in its range; anything else, including null, is masked rather than
+    coerced: ``true`` is not stored as ``1.0``, ``1.5`` truncated to
+    ``1``, nor ``-1`` wrapped around in an unsigned column. Chunks whose
+    values all fit are assigned as one slice, which NumPy converts
+    without a Python-level loop.
+    """
+    types = _ACCEPTED_TYPES.get(data.dtype.kind)
+    values = iter(values)
+    while chunk := list(islice(values, _CHUNK_SIZE)):
+        end = start + len(chunk)
+        if types is not None and types.issuperset(map(type, chunk)):
+            try:
+                data[start:end] = chunk
+            except OverflowError:
+                _fill_each(chunk, data, mask, start, types)
+        else:
+            _fill_each(chunk, data, mask, start, types)
+        start = end
+    return start
+
+
+def _grow(buffers: list[np.ndarray], capacity: int, needed: int) -> int:
+    # ndarray.resize reallocates in place; large blocks are remapped, not copied.
+    if needed <= capacity:
+        return capacity
+    capacity = max(needed, capacity + capacity // 2)
+    for buffer in buffers:
+        buffer.resize(capacity, refcheck=False)
+    return capacity
+
+
+def select_array(
+    document: Any, path: PathLike, dtype: DTypeLike = "float64"
+) -> np.ma.MaskedArray:
+    """Collect the values ``path`` selects into a masked NumPy array.
+
+    Values are written into a preallocated buffer, chunk by chunk as
+    evaluation produces them, and the buffer grows in place, so no list
+    of all the results is ever built. JSON nulls and values that do not
+    fit ``dtype`` (strings or booleans in a numeric column, fractions in
+    an integer one, integers out of its range) are masked.
+
+    Args:
+        document: Parsed JSON value to query.
+        path: A path string, parsed JSONPath or compiled QueryPlan.
+        dtype: NumPy dtype of the result.
+
+    Returns:
+        Masked array with one element per selected value, in document order.
+
+    """
+    np = _numpy()
+    capacity = _INITIAL_CAPACITY
+    buffers = [np.empty(capacity, np.dtype(dtype)), np.zeros(capacity, bool)]
+    size = 0
+    values = as_plan(path).iterate(document)
+    while chunk := list(islice(values, _CHUNK_SIZE)):
+        capacity = _grow(buffers, capacity, size + len(chunk))
+        size = _fill(chunk, *buffers, size)
+    data, mask = buffers
+    data.resize(size, refcheck=False)
+    mask.resize(size, refcheck=False)
+    return np.ma.MaskedArray(data, mask=mask)
+
+
+def _column_getter(path: PathLike) -> Callable[[Any], Any]:
+    """Return ``get(row)`` giving the first value ``path`` selects from a row."""
+    plan = as_plan(path)
+    query = FilterQuery(segments=expand(plan.segments))
+    if query.singular:
+        get = compile_singular_query(query)
+        return lambda row: get(row, row)
+    return lambda row: next(plan.iterate(row), NOTHING)
+
+
+def select_columns(
+    document: Any,
+    rows: PathLike,
+    columns: Mapping[str, PathLike],
+    dtype: DTypeLike | Mapping[str, DTypeLike] = "float64",
+    *,
+    structured: bool = False,
+) -> dict[str, np.ma.MaskedArray] | np.ma.MaskedArray:
+    """Project fields of the values ``rows`` selects into NumPy columns.
+
+    Every row gets exactly one slot in every column, so the columns stay
+    aligned: when a column's path selects nothing from a row, or selects
+    null or a value that does not fit the column's dtype, that slot is
+    masked. Rows are consumed in chunks as they are selected and each
+    chunk is written straight into every column.
+
+    Args:
+        document: Parsed JSON value to query.
+        rows: Path selecting the records, e.g. ``$.store.book[*]``.
+        columns: Mapping of column name to a path evaluated with each
+            record as its root, e.g. ``{"price": "$.price"}``. The first
+            value selected is used.
+        dtype: One dtype for every column, or a mapping of column name to
+            dtype.
+        structured: Return a single masked structured array with one
+            field per column instead of a dict of masked arrays.
+
+    Returns:
+        Dict of column name to masked array, or a masked structured array.
+
+    """
+    np = _numpy()
+    getters = {name: _column_getter(path) for name, path in columns.items()}
+    dtypes = {
+        name: np.dtype(dtype[name] if isinstance(dtype, Mapping) else dtype)
+        for name in columns
+    }
+    capacity = _INITIAL_CAPACITY
+    if structured:
+        buffers = [
+            np.empty(capacity, dtype=[(name, dtypes[name]) for name in columns]),
+            np.zeros(capacity, dtype=[(name, bool) for name in columns]),
+        ]
+    else:
+        buffers = [
+            array
+            for name in columns
+            for array in (np.empty(capacity, dtypes[name]), np.zeros(capacity, bool))
+        ]
+    size = 0
+    records = as_plan(rows).iterate(document)
+    while chunk := list(islice(records, _CHUNK_SIZE)):
+        capacity = _grow(buffers, capacity, size + len(chunk))
+        for i, (name, get) in enumerate(getters.items()):
+            if structured:
+                data, mask = buffers[0][name], buffers[1][name]
+            else:
+                data, mask = buffers[2 * i], buffers[2 * i + 1]
+            _fill(map(get, chunk), data, mask, size)
+        size += len(chunk)
+    for buffer in buffers:
+        buffer.resize(size, refcheck=False)
+    if structured:
+        return np.ma.MaskedArray(buffers[0], mask=buffers[1])
+    return {
+        name: np.ma.MaskedArray(buffers[2 * i], mask=buffers[2 * i + 1])
+        for i, name in enumerate(columns)
+    }
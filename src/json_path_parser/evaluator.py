@@ -1,123 +1,289 @@
-import json
-
-from json_path_parser.parsed_dataclasses import (
-    JSONPath,
-    Slice,
-    WildcardIndex,
-    IndexList,
-    Index,
-    Field,
-    Name,
-    BracketSelector,
-    FilterSelector,
-    RecursiveSelector,
-)
+from __future__ import annotations
+
+import threading
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from itertools import islice
+from typing import TYPE_CHECKING, Any
+
+from .cache import compile as compile_path
+from .parsed_dataclasses import JSONPath
+from .plan import QueryPlan
+
+if TYPE_CHECKING:
+    from concurrent.futures import Executor
+
+    import numpy as np
+    from numpy.typing import DTypeLike
+
+    from .explain import Explanation
+    from .index import DocumentIndex
+    from .locations import Location
+    from .multi import MultiPlan
+
+PathLike = JSONPath | QueryPlan | str
+
+_NOTHING = object()
+
+
+def as_plan(path: PathLike) -> QueryPlan:
+    """Coerce a path string, parsed JSONPath or plan into a QueryPlan.
+
+    Strings and parsed paths go through the compiled-path cache, so
+    repeated queries with the same expression are compiled only once.
+    """
+    if isinstance(path, QueryPlan):
+        return path
+    return compile_path(path)
 
 
 class JSONPathEvaluator:
-    def __init__(self, json_data: dict[str, any]):
+    def __init__(self, json_data: dict[str, Any], *, index: bool = False) -> None:
+        """Wrap a parsed JSON document for querying.
+
+        Args:
+            json_data: The document.
+            index: Build a :class:`~json_path_parser.index.DocumentIndex`
+                so recursive descent (``..name``, ``..[0]``, ``..*``) is
+                answered from precomputed tables instead of a walk. Worth
+                it when the same document is queried many times.
+
+        """
+        self._index: DocumentIndex | None = None
+        self._index_lock = threading.Lock()
+        self._indexed = index
         self.json_data = json_data
 
-    def select(self, path: JSONPath) -> list[any]:
-        """Evaluate the JSONPath against the JSON data."""
-        current_selection = [self.json_data]
-
-        while path.segments:
-            segment = path.segments.pop(0)
-            next_selection = []
-
-            # Apply segments in sequence, passing results to the next segment
-            for item in current_selection:
-                results = self._apply_segment_to_value(item, segment)
-                next_selection.extend(results)
-
-            current_selection = next_selection
-        return current_selection
-
-    def _apply_segment_to_value(self, value: any, segment: any) -> list[any]:
-        """Apply a segment to a value (object, array, or primitive)."""
-        if isinstance(segment, Field):
-            return self._apply_field(value, segment.name)
-        if isinstance(segment, BracketSelector):
-            return self._apply_bracket_selector(value, segment.content)
-        if isinstance(segment, RecursiveSelector):
-            return self._apply_recursive(value, segment)
-        if isinstance(segment, FilterSelector):
-            return self._apply_filter(value, segment)
-        return []
-
-    def _apply_field(self, item: any, field_name: str) -> list[any]:
-        """Apply a field selector to an item.
+    @property
+    def json_data(self) -> Any:
+        """The queried document. Assigning a new one discards the index."""
+        return self._json_data
+
+    @json_data.setter
+    def json_data(self, value: Any) -> None:
+        self._json_data = value
+        self._index = None
+
+    @property
+    def index(self) -> DocumentIndex | None:
+        """The document index, built on first use; None if indexing is off."""
+        if self._index is None and self._indexed:
+            from .index import DocumentIndex
+
+            with self._index_lock:
+                if self._index is None:
+                    self._index = DocumentIndex(self._json_data)
+        return self._index
+
+    def rebuild_index(self, path: PathLike | None = None) -> None:
+        """Bring the index up to date after the document was modified in place.
+
+        Args:
+            path: Re-index only the objects and arrays this path selects,
+                which must contain every change. By default, or if a
+                selected container was not indexed yet, the whole
+                document is re-indexed.
+
+        """
+        self._indexed = True
+        index = self.index
+        if path is None:
+            index.rebuild()
+            return
+        for value in as_plan(path).evaluate(self._json_data):
+            if isinstance(value, dict | list) and not index.refresh(value):
+                index.rebuild()
+                return
+
+    def _plan(self, path: PathLike) -> QueryPlan:
+        plan = as_plan(path)
+        index = self.index
+        return plan if index is None else index.bind(plan)
+
+    def select(self, path: PathLike, limit: int | None = None) -> list[Any]:
+        """Evaluate the JSONPath against the JSON data.
+
+        Args:
+            path: A path string, parsed JSONPath or compiled QueryPlan. A
+                JSONPath is left untouched and can be evaluated again.
+            limit: Stop after this many matches. Evaluation is lazy when a
+                limit is given, so no work is done past the last match.
+
+        Returns:
+            The selected values, in document order.
+
+        """
+        plan = self._plan(path)
+        if limit is None:
+            return plan.evaluate(self.json_data)
+        return list(islice(plan.iterate(self.json_data), limit))
+
+    def iter_select(self, path: PathLike) -> Iterator[Any]:
+        """Lazily yield the values selected by ``path``, in document order."""
+        return self._plan(path).iterate(self.json_data)
+
+    def locate(self, path: PathLike, limit: int | None = None) -> list[Location]:
+        """Evaluate ``path`` and return each match with its location.
+
+        Locations give the value and its RFC 9535 normalized path, e.g.
+        ``$['store']['book'][0]``, which is only rendered when read.
+
+        Args:
+            path: A path string, parsed JSONPath or compiled QueryPlan.
+            limit: Stop after this many matches, as for :meth:`select`.
+
+        Returns:
+            :class:`~json_path_parser.locations.Location` objects, in the
+            order :meth:`select` returns the values.
+
+        """
+        plan = as_plan(path)
+        if limit is None:
+            return plan.locate(self.json_data)
+        return list(islice(plan.iter_locate(self.json_data), limit))
+
+    def iter_locate(self, path: PathLike) -> Iterator[Location]:
+        """Lazily yield the locations of the values ``path`` selects."""
+        return as_plan(path).iter_locate(self.json_data)
+
+    def first(self, path: PathLike, default: Any = None) -> Any:
+        """Return the first value selected by ``path``, or ``default``.
+
+        Evaluation stops at the first match.
+        """
+        return next(self.iter_select(path), default)
+
+    def exists(self, path: PathLike) -> bool:
+        """Return True if ``path`` selects at least one value.
+
+        Evaluation stops at the first match, so the cost is proportional
+        to the work needed to find it rather than to the document size.
+        """
+        return next(self.iter_select(path), _NOTHING) is not _NOTHING
+
+    def count(self, path: PathLike) -> int:
+        """Return the number of values selected by ``path``.
+
+        Matches are counted as they are produced, without building a list.
+        """
+        return sum(1 for _ in self.iter_select(path))
+
+    def set(self, path: PathLike, value: Any) -> None:
+        """Replace every value ``path`` selects with ``value``, in place.
+
+        The index, if built, is brought up to date. See
+        :func:`json_path_parser.mutation.set_values`.
+        """
+        from .mutation import set_values
+
+        self._replace(set_values(self._json_data, path, value, index=self._index))
+
+    def update(self, path: PathLike, function: Callable[[Any], Any]) -> None:
+        """Replace every value ``path`` selects with ``function(value)``.
+
+        See :func:`json_path_parser.mutation.update_values`.
+        """
+        from .mutation import update_values
+
+        self._replace(update_values(self._json_data, path, function, index=self._index))
+
+    def delete(self, path: PathLike) -> None:
+        """Remove every value ``path`` selects from its container, in place.
+
+        See :func:`json_path_parser.mutation.delete_values`.
+        """
+        from .mutation import delete_values
+
+        delete_values(self._json_data, path, index=self._index)
+
+    def _replace(self, document: Any) -> None:
+        # Only a path selecting the root gives a new document.
+        if document is not self._json_data:
+            self.json_data = document
+
+    def select_many(
+        self, paths: Mapping[str, PathLike] | MultiPlan
+    ) -> dict[str, list[Any]]:
+        """Evaluate several named paths in a single walk of the document.
+
+        Paths are merged into a prefix trie so shared prefixes such as
+        ``$.store.book[*]`` are traversed once. Pass a prebuilt
+        :class:`~json_path_parser.multi.MultiPlan` to skip the merge when
+        the same set of paths is applied to many documents.
 
         Args:
-            item: The JSON item (object or array) to apply the field selector to.
-            field_name: The name of the field to select, or '*' for wildcard selection.
+            paths: Mapping of result name to path, or a MultiPlan.
 
         Returns:
-            A list of selected values. If the field does not exist, returns empty list.
-
-        Example:
-        item = {"name": "Alice", "age": 30}
-        field_name = "name"
-        Returns: ["Alice"]
-
-        """
-        if not isinstance(item, dict):
-            return []
-
-        if field_name == "*":
-            return list(item.values())
-        if field_name in item:
-            return [item[field_name]]
-        return []
-
-    def _apply_filter(self, items: list[any], filter: FilterSelector) -> list[any]:
-        """Apply a filter to a list of items."""
-        # Placeholder implementation; actual filter logic would depend on filter structure
-        msg = "Filter application not implemented yet."
-        raise NotImplementedError(msg)
-
-    def _apply_wildcard(self, item: any) -> list[any]:
-        """Apply a wildcard segment to an item."""
-        if isinstance(item, list):
-            return item  # All elements in the array
-        if isinstance(item, dict):
-            return list(item.values())  # All values in the object
-        return []
-
-    def _apply_index_list(self, item: any, indices: list[int]) -> list[any]:
-        """Apply a list of indices to an item."""
-        if not isinstance(item, list):
-            return []
-        return [item[idx] for idx in indices if -len(item) <= idx < len(item)]
-
-    def _apply_slice(self, item: any, slice_obj: Slice) -> list[any]:
-        """Apply a slice to an item."""
-        if not isinstance(item, list):
-            return []
-        start = slice_obj.start
-        end = slice_obj.end
-        step = slice_obj.step
-        return item[start:end:step]
-
-    def _apply_bracket_selector(
+            Dict mapping each name to the values its path selects.
+
+        """
+        from .multi import MultiPlan
+
+        if not isinstance(paths, MultiPlan):
+            paths = MultiPlan.from_paths(paths)
+        return paths.evaluate(self.json_data)
+
+    def select_array(
+        self, path: PathLike, dtype: DTypeLike = "float64"
+    ) -> np.ma.MaskedArray:
+        """Collect the selected values into a masked NumPy array.
+
+        See :func:`json_path_parser.columnar.select_array`; requires NumPy.
+        """
+        from .columnar import select_array
+
+        return select_array(self.json_data, self._plan(path), dtype)
+
+    def select_columns(
+        self,
+        rows: PathLike,
+        columns: Mapping[str, PathLike],
+        dtype: DTypeLike | Mapping[str, DTypeLike] = "float64",
+        *,
+        structured: bool = False,
+    ) -> dict[str, np.ma.MaskedArray] | np.ma.MaskedArray:
+        """Project fields of each selected record into aligned NumPy columns.
+
+        See :func:`json_path_parser.columnar.select_columns`; requires NumPy.
+        """
+        from .columnar import select_columns
+
+        return select_columns(
+            self.json_data, self._plan(rows), columns, dtype, structured=structured
+        )
+
+    def explain(self, path: PathLike) -> Explanation:
+        """Describe how ``path`` would be evaluated on this document.
+
+        See :func:`json_path_parser.explain.explain`.
+        """
+        from .explain import explain
+
+        return explain(path, index=self.index)
+
+    def explain_analyze(self, path: PathLike) -> Explanation:
+        """Run ``path`` and report per-segment cardinality, work and time.
+
+        See :func:`json_path_parser.explain.explain_analyze`.
+        """
+        from .explain import explain_analyze
+
+        return explain_analyze(self.json_data, path, index=self.index)
+
+    def select_batch(
         self,
-        item: any,
-        segment: any,
-    ) -> list[any]:
-        """Apply a bracket selector to an item."""
-        if isinstance(segment, Index):
-            return self._apply_index_list(item, [segment.idx])
-        if isinstance(segment, Slice):
-            return self._apply_slice(item, segment)
-        if isinstance(segment, WildcardIndex):
-            return self._apply_wildcard(item)
-        if isinstance(segment, IndexList):
-            return self._apply_index_list(item, segment.indices)
-        if isinstance(segment, Name):
-            return self._apply_field(item, segment.name)
-        return []
-
-    def _apply_recursive(self, item: any, segment: any) -> list[any]:
-        """Recursively apply a segment to an item and its children."""
-        return []  # Placeholder for recursive logic
+        paths: Iterable[PathLike],
+        *,
+        max_workers: int | None = None,
+        executor: Executor | None = None,
+    ) -> list[list[Any]]:
+        """Evaluate many paths against the document on a thread pool.
+
+        See :func:`json_path_parser.threaded.select_batch`.
+        """
+        from .threaded import select_batch
+
+        plans = [self._plan(path) for path in paths]
+        return select_batch(
+            self.json_data, plans, max_workers=max_workers, executor=executor
+        )
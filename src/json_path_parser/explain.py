@@ -0,0 +1,284 @@
+from __future__ import annotations
+
+from dataclasses import dataclass, replace
+from time import perf_counter
+from typing import TYPE_CHECKING, Any
+
+from .evaluator import PathLike, as_plan
+from .fast_parser import parse_fast
+from .formatting import format_path, format_segment
+from .parsed_dataclasses import (
+    BracketSelector,
+    Field,
+    FieldChain,
+    FilterSelector,
+    Index,
+    IndexList,
+    JSONPath,
+    Name,
+    RecursiveSelector,
+    Slice,
+    WildcardIndex,
+)
+from .plan import iter_containers
+
+if TYPE_CHECKING:
+    from .index import DocumentIndex
+    from .plan import QueryPlan
+
+_KINDS = {
+    Name: "name",
+    FieldChain: "name chain",
+    Index: "index",
+    IndexList: "index list",
+    Slice: "slice",
+    WildcardIndex: "wildcard",
+    FilterSelector: "filter",
+}
+
+
+@dataclass(frozen=True)
+class SegmentPlan:
+    """How one segment of a path will be evaluated."""
+
+    position: int
+    selector: str
+    kind: str
+    notes: tuple[str, ...]
+
+
+@dataclass(frozen=True)
+class SegmentStats:
+    """What one segment did during :func:`explain_analyze`.
+
+    ``visited`` counts the values the segment examined: its inputs, plus
+    the children it enumerated for wildcards and filters, plus every value
+    below its inputs for a recursive descent that walks the document.
+    """
+
+    inputs: int
+    outputs: int
+    visited: int
+    seconds: float
+
+
+@dataclass(frozen=True)
+class Explanation:
+    """The plan of a query and, after analysis, its per-segment statistics.
+
+    ``str()`` renders it as a table, one row per segment.
+    """
+
+    path: str
+    backend: str
+    notes: tuple[str, ...]
+    segments: tuple[SegmentPlan, ...]
+    warnings: tuple[str, ...]
+    stats: tuple[SegmentStats, ...] | None = None
+
+    @property
+    def seconds(self) -> float | None:
+        """Total time of the analyzed run, or None if not analyzed."""
+        if self.stats is None:
+            return None
+        return sum(stats.seconds for stats in self.stats)
+
+    def __str__(self) -> str:
+        lines = [f"{self.path}  ({', '.join((self.backend, *self.notes))})"]
+        # The header names count too: every selector may be shorter.
+        width = max(map(len, ["segment", *(s.selector for s in self.segments)]))
+        kind_width = max(map(len, ["kind", *(s.kind for s in self.segments)]))
+        if self.stats is not None:
+            header = "in", "out", "visited", "ms"
+            lines.append(
+                f"{'#':>3}  {'segment':<{width}}  {'kind':<{kind_width}}"
+                f"  {header[0]:>8} {header[1]:>8} {header[2]:>9} {header[3]:>9}"
+            )
+        for i, segment in enumerate(self.segments):
+            row = (
+                f"{segment.position:>3}  {segment.selector:<{width}}"
+                f"  {segment.kind:<{kind_width}}"
+            )
+            if self.stats is not None:
+                stats = self.stats[i]
+                row += (
+                    f"  {stats.inputs:>8} {stats.outputs:>8} {stats.visited:>9}"
+                    f" {stats.seconds * 1e3:>9.3f}"
+                )
+            if segment.notes:
+                row += "  " + "; ".join(segment.notes)
+            lines.append(row)
+        if self.stats is not None:
+            outputs = self.stats[-1].outputs if self.stats else 1
+            lines.append(f"{outputs} results in {self.seconds * 1e3:.3f} ms")
+        lines.extend(f"warning: {warning}" for warning in self.warnings)
+        return "\n".join(lines)
+
+
+def _selector(segment: Any) -> Any:
+    selector = segment.name if isinstance(segment, RecursiveSelector) else segment
+    if selector is None:
+        return WildcardIndex()
+    if isinstance(selector, BracketSelector):
+        return selector.content
+    if isinstance(selector, Field):
+        return WildcardIndex() if selector.wildcard else Name(name=selector.name)
+    return selector
+
+
+def _kind(segment: Any) -> str:
+    kind = _KINDS[type(_selector(segment))]
+    if isinstance(segment, RecursiveSelector):
+        return f"descendant {kind}"
+    return kind
+
+
+def _descent_note(selector: Any, *, bound: bool) -> str:
+    if not bound:
+        return "walks every container below the input"
+    if isinstance(selector, Name):
+        return "document index: member lookup"
+    if isinstance(selector, Index):
+        return "document index: arrays by length"
+    return "document index: container range"
+
+
+def _notes(segment: Any, *, bound: bool) -> tuple[str, ...]:
+    selector = _selector(segment)
+    if isinstance(segment, RecursiveSelector):
+        return (_descent_note(selector, bound=bound),)
+    if isinstance(selector, Name | FieldChain | Index | IndexList | Slice):
+        return ("direct lookup",)
+    if isinstance(selector, FilterSelector):
+        return ("tests every child",)
+    return ()
+
+
+def _warnings(segments: tuple[Any, ...]) -> tuple[str, ...]:
+    warnings = []
+    for i, segment in enumerate(segments[:-1]):
+        if not isinstance(segment, RecursiveSelector):
+            continue
+        following = segments[i + 1]
+        if isinstance(following, RecursiveSelector):
+            warnings.append(
+                f"{format_segment(segment)} followed by {format_segment(following)}"
+                " walks each subtree once per ancestor"
+            )
+        elif isinstance(_selector(segment), WildcardIndex) and isinstance(
+            _selector(following), WildcardIndex | FilterSelector
+        ):
+            warnings.append(
+                f"{format_segment(segment)} followed by {format_segment(following)}"
+                " examines the children of every descendant; select a name"
+                " before descending if possible"
+            )
+    return tuple(warnings)
+
+
+def _prepare(path: PathLike, index: DocumentIndex | None) -> tuple[QueryPlan, Any]:
+    plan = as_plan(path)
+    return plan, (index.bind(plan) if index is not None else plan)
+
+
+def _describe(plan: QueryPlan, bound: QueryPlan) -> Explanation:
+    notes = []
+    if plan.source is not None:
+        fast = parse_fast(plan.source) is not None
+        notes.append("parsed by fast scanner" if fast else "parsed by Lark grammar")
+    if bound is not plan:
+        notes.append("bound to document index")
+    segments = tuple(
+        SegmentPlan(
+            position=i,
+            selector=format_segment(segment),
+            kind=_kind(segment),
+            notes=_notes(segment, bound=bound.steps[i] is not plan.steps[i]),
+        )
+        for i, segment in enumerate(plan.segments)
+    )
+    return Explanation(
+        path=format_path(JSONPath(segments=plan.segments)),
+        backend="codegen" if bound.function is not None else "interpreter",
+        notes=tuple(notes),
+        segments=segments,
+        warnings=_warnings(plan.segments),
+    )
+
+
+def explain(path: PathLike, *, index: DocumentIndex | None = None) -> Explanation:
+    """Describe how ``path`` will be evaluated, without running it.
+
+    Args:
+        path: A path string, parsed JSONPath or compiled QueryPlan.
+        index: Document index the plan would be bound to, if any.
+
+    Returns:
+        The normalized path, backend, parser and index notes, one
+        :class:`SegmentPlan` per segment and warnings about segment
+        combinations that are known to be slow.
+
+    """
+    return _describe(*_prepare(path, index))
+
+
+def _visited(segment: Any, inputs: list[Any], outputs: int, *, bound: bool) -> int:
+    selector = _selector(segment)
+    if isinstance(segment, RecursiveSelector):
+        if bound and isinstance(selector, Name | Index):
+            return outputs
+        return sum(
+            1 + sum(len(container) for container in iter_containers(value))
+            for value in inputs
+        )
+    if isinstance(selector, WildcardIndex | FilterSelector):
+        return len(inputs) + sum(
+            len(value) for value in inputs if isinstance(value, dict | list)
+        )
+    return len(inputs)
+
+
+def explain_analyze(
+    document: Any, path: PathLike, *, index: DocumentIndex | None = None
+) -> Explanation:
+    """Run ``path`` against ``document`` segment by segment and report on each.
+
+    The segments run one after another on the whole selection, as in
+    :meth:`QueryPlan.evaluate`, and each is timed separately. Generated
+    code is not used, so times are those of the interpreted steps.
+    Counting visited values happens outside the timed sections.
+
+    Args:
+        document: Parsed JSON value to query.
+        path: A path string, parsed JSONPath or compiled QueryPlan.
+        index: Document index of ``document`` to bind the plan to, if any.
+
+    Returns:
+        The :func:`explain` description with :attr:`Explanation.stats`.
+
+    """
+    plan, bound = _prepare(path, index)
+    explanation = _describe(plan, bound)
+    stats = []
+    selection = [document]
+    for segment, step, original in zip(
+        plan.segments, bound.steps, plan.steps, strict=True
+    ):
+        start = perf_counter()
+        next_selection = []
+        for value in selection:
+            next_selection.extend(step(value, document))
+        seconds = perf_counter() - start
+        visited = _visited(
+            segment, selection, len(next_selection), bound=step is not original
+        )
+        stats.append(
+            SegmentStats(
+                inputs=len(selection),
+                outputs=len(next_selection),
+                visited=visited,
+                seconds=seconds,
+            )
+        )
+        selection = next_selection
+    return replace(explanation, stats=tuple(stats))
@@ -0,0 +1,115 @@
+from __future__ import annotations
+
+import re
+from functools import lru_cache
+
+from .parsed_dataclasses import (
+    BracketSelector,
+    Field,
+    Index,
+    IndexList,
+    JSONPath,
+    Name,
+    RecursiveSelector,
+    Slice,
+    WildcardIndex,
+)
+
+# One alternative per segment form of the simple subset. Tokens are read
+# exactly as the grammar's terminals read them (CNAME, SIGNED_INT, quoted
+# strings). Whitespace, escapes and control characters in quoted names,
+# filters and bare ``..`` are deliberately left out: those paths go to Lark.
+_INT = r"[+-]?[0-9]+"
+_SEGMENT = re.compile(
+    rf"""
+    \.(?P<field>[A-Za-z_][A-Za-z0-9_]*|\*)
+    | \.\.(?P<descendant>[A-Za-z_][A-Za-z0-9_]*|\*)
+    | (?P<recursive>\.\.)?\[(?:
+        (?P<index>{_INT})
+        | (?P<wildcard>\*)
+        | '(?P<single>[^'\\\x00-\x1f]*)'
+        | "(?P<double>[^"\\\x00-\x1f]*)"
+        | (?P<list>{_INT}(?:,{_INT})+)
+        | (?P<slice>(?P<start>{_INT})?:(?P<end>{_INT})?(?::(?P<step>{_INT})?)?)
+    )\]
+    """,
+    re.VERBOSE,
+)
+
+_WILDCARD_FIELD = Field(name="*", wildcard=True)
+_WILDCARD_INDEX = BracketSelector(content=WildcardIndex())
+
+
+# Nodes are immutable, so the common ones are shared between parses.
+@lru_cache(maxsize=1024)
+def _field(name: str) -> Field:
+    return _WILDCARD_FIELD if name == "*" else Field(name=name)
+
+
+@lru_cache(maxsize=256)
+def _index(text: str) -> BracketSelector:
+    return BracketSelector(content=Index(idx=int(text)))
+
+
+def _optional_int(text: str | None) -> int | None:
+    return None if text is None else int(text)
+
+
+def _bracket(match: re.Match[str], kind: str) -> BracketSelector:
+    if kind == "index":
+        return _index(match["index"])
+    if kind == "wildcard":
+        return _WILDCARD_INDEX
+    if kind in ("single", "double"):
+        return BracketSelector(content=Name(name=match[kind]))
+    if kind == "list":
+        indices = tuple(map(int, match["list"].split(",")))
+        return BracketSelector(content=IndexList(indices=indices))
+    return BracketSelector(
+        content=Slice(
+            start=_optional_int(match["start"]),
+            end=_optional_int(match["end"]),
+            step=_optional_int(match["step"]),
+        )
+    )
+
+
+def parse_fast(path_str: str) -> JSONPath | None:
+    """Parse a simple path in one pass, without the Lark grammar.
+
+    Handles ``$`` followed by dotted names and ``.*``, bracketed integer
+    indices, index lists, slices, ``[*]``, quoted names without escapes,
+    and recursive descent into any of these. The nodes built are exactly
+    those the grammar and :class:`JSONPathTransformer` would build.
+
+    Args:
+        path_str: JSONPath expression.
+
+    Returns:
+        The parsed path, or None if the expression is outside the subset
+        (or invalid), in which case the caller should use the grammar.
+
+    """
+    if not path_str.startswith("$"):
+        return None
+    segments = []
+    pos = 1
+    end = len(path_str)
+    match = _SEGMENT.match
+    while pos < end:
+        m = match(path_str, pos)
+        if m is None:
+            return None
+        kind = m.lastgroup
+        if kind == "field":
+            segments.append(_field(m["field"]))
+        elif kind == "descendant":
+            segments.append(RecursiveSelector(name=_field(m["descendant"])))
+        else:
+            bracket = _bracket(m, kind)
+            if m["recursive"] is not None:
+                segments.append(RecursiveSelector(name=bracket))
+            else:
+                segments.append(bracket)
+        pos = m.end()
+    return JSONPath(segments=tuple(segments))
@@ -0,0 +1,223 @@
+from __future__ import annotations
+
+import operator
+from collections.abc import Callable
+from typing import Any
+
+from .parsed_dataclasses import (
+    BracketSelector,
+    Comparison,
+    ExistenceTest,
+    FilterQuery,
+    Index,
+    Literal,
+    LogicalAnd,
+    LogicalNot,
+    LogicalOr,
+)
+from .plan import compile_segment, iterate_steps
+
+Predicate = Callable[[Any, Any], bool]
+"""A compiled filter: ``predicate(node, root)`` is True if ``node`` is kept."""
+
+Operand = Callable[[Any, Any], Any]
+"""Produces a comparison operand for ``(node, root)``, or ``NOTHING``."""
+
+
+class _Nothing:
+    """The RFC 9535 "Nothing" value of a singular query that selects no node."""
+
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "NOTHING"
+
+
+NOTHING = _Nothing()
+
+_ORDERINGS = {
+    "<": operator.lt,
+    "<=": operator.le,
+    ">": operator.gt,
+    ">=": operator.ge,
+}
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, int | float) and not isinstance(value, bool)
+
+
+def json_equal(left: Any, right: Any) -> bool:
+    """Compare two JSON values with RFC 9535 equality.
+
+    Unlike Python equality, booleans never equal numbers, and ``NOTHING``
+    only equals itself.
+    """
+    if isinstance(left, bool) or isinstance(right, bool):
+        return isinstance(left, bool) and isinstance(right, bool) and left == right
+    if _is_number(left) and _is_number(right):
+        return left == right
+    if isinstance(left, str) and isinstance(right, str):
+        return left == right
+    if isinstance(left, list) and isinstance(right, list):
+        return len(left) == len(right) and all(map(json_equal, left, right))
+    if isinstance(left, dict) and isinstance(right, dict):
+        return left.keys() == right.keys() and all(
+            json_equal(v, right[k]) for k, v in left.items()
+        )
+    return left is right
+
+
+def _singular_keys(query: FilterQuery) -> list[tuple[bool, str | int]]:
+    """List ``(is_name, key)`` for each segment of a singular query."""
+    keys = []
+    for segment in query.segments:
+        selector = segment.content if isinstance(segment, BracketSelector) else segment
+        if isinstance(selector, Index):
+            keys.append((False, selector.idx))
+        else:
+            keys.append((True, selector.name))
+    return keys
+
+
+def _get_member(name: str) -> Operand:
+    def get_member(node: Any, _root: Any) -> Any:
+        if isinstance(node, dict):
+            return node.get(name, NOTHING)
+        return NOTHING
+
+    return get_member
+
+
+def compile_singular_query(query: FilterQuery) -> Operand:
+    """Compile a singular query into a direct lookup.
+
+    A singular query (see :attr:`FilterQuery.singular`) selects at most
+    one node, so it is answered by following its names and indices
+    instead of running the general segment steps.
+
+    Args:
+        query: A query whose ``singular`` property is True.
+
+    Returns:
+        ``get(node, root)`` returning the selected value, or ``NOTHING``
+        if there is none.
+
+    """
+    keys = _singular_keys(query)
+    absolute = query.absolute
+    if len(keys) == 1 and keys[0][0] and not absolute:
+        # Fast path for the common ``@.name`` operand.
+        return _get_member(keys[0][1])
+
+    def get(node: Any, root: Any) -> Any:
+        value = root if absolute else node
+        for is_name, key in keys:
+            if is_name:
+                if not isinstance(value, dict):
+                    return NOTHING
+                value = value.get(key, NOTHING)
+                if value is NOTHING:
+                    return NOTHING
+            elif isinstance(value, list) and -len(value) <= key < len(value):
+                value = value[key]
+            else:
+                return NOTHING
+        return value
+
+    return get
+
+
+def _compile_operand(operand: FilterQuery | Literal) -> Operand:
+    if isinstance(operand, Literal):
+        constant = operand.value
+        return lambda _node, _root: constant
+    return compile_singular_query(operand)
+
+
+def _compile_comparison(comparison: Comparison) -> Predicate:
+    left = _compile_operand(comparison.left)
+    right = _compile_operand(comparison.right)
+    op = comparison.op
+
+    if op == "==":
+        return lambda node, root: json_equal(left(node, root), right(node, root))
+    if op == "!=":
+        return lambda node, root: not json_equal(left(node, root), right(node, root))
+
+    compare = _ORDERINGS[op]
+    strict = op in ("<", ">")
+
+    if isinstance(comparison.right, Literal) and _is_number(comparison.right.value):
+        # Specialization for ``@.price < 10``: a number literal can only be
+        # ordered against, or equal to, another number.
+        constant = comparison.right.value
+
+        def against_number(node: Any, root: Any) -> bool:
+            value = left(node, root)
+            return _is_number(value) and compare(value, constant)
+
+        return against_number
+
+    def ordered(node: Any, root: Any) -> bool:
+        a = left(node, root)
+        b = right(node, root)
+        if (_is_number(a) and _is_number(b)) or (
+            isinstance(a, str) and isinstance(b, str)
+        ):
+            return compare(a, b)
+        return not strict and json_equal(a, b)
+
+    return ordered
+
+
+def _compile_existence(test: ExistenceTest) -> Predicate:
+    query = test.query
+    if query.singular:
+        get = compile_singular_query(query)
+        return lambda node, root: get(node, root) is not NOTHING
+
+    steps = tuple(compile_segment(segment) for segment in query.segments)
+    absolute = query.absolute
+
+    def exists(node: Any, root: Any) -> bool:
+        start = root if absolute else node
+        return next(iterate_steps(steps, start, root), NOTHING) is not NOTHING
+
+    return exists
+
+
+def compile_filter(expression: Any) -> Predicate:
+    """Compile a filter expression into a predicate closure.
+
+    The expression tree is walked once, here; evaluating the predicate
+    calls nested closures and never re-inspects the AST, so the per-element
+    cost of filtering a large array stays small.
+
+    Args:
+        expression: Filter expression from a :class:`FilterSelector`.
+
+    Returns:
+        ``predicate(node, root)`` returning True for nodes to keep.
+
+    Raises:
+        TypeError: If the expression contains an unsupported node.
+
+    """
+    if isinstance(expression, Comparison):
+        return _compile_comparison(expression)
+    if isinstance(expression, ExistenceTest):
+        return _compile_existence(expression)
+    if isinstance(expression, LogicalAnd):
+        left, right = compile_filter(expression.left), compile_filter(expression.right)
+        return lambda node, root: left(node, root) and right(node, root)
+    if isinstance(expression, LogicalOr):
+        left, right = compile_filter(expression.left), compile_filter(expression.right)
+        return lambda node, root: left(node, root) or right(node, root)
+    if isinstance(expression, LogicalNot):
+        inner = compile_filter(expression.expression)
+        return lambda node, root: not inner(node, root)
+    if isinstance(expression, FilterQuery):
+        return _compile_existence(ExistenceTest(query=expression))
+    msg = f"Unsupported filter expression: {expression!r}"
+    raise TypeError(msg)
@@ -0,0 +1,142 @@
+from __future__ import annotations
+
+import json
+from typing import Any
+
+from .parsed_dataclasses import (
+    BracketSelector,
+    Comparison,
+    ExistenceTest,
+    Field,
+    FieldChain,
+    FilterQuery,
+    FilterSelector,
+    Index,
+    IndexList,
+    JSONPath,
+    Literal,
+    LogicalAnd,
+    LogicalNot,
+    LogicalOr,
+    Name,
+    RecursiveSelector,
+    Slice,
+    WildcardIndex,
+)
+
+_ESCAPES = {"\\": "\\\\", "'": "\\'", "\b": "\\b", "\f": "\\f", "\n": "\\n"}
+_ESCAPES |= {"\r": "\\r", "\t": "\\t"}
+
+
+def format_name(name: str) -> str:
+    """Render a member name as a normalized ``['name']`` selector.
+
+    Backslashes, single quotes and control characters are escaped as in
+    RFC 9535 normalized paths.
+    """
+    escaped = "".join(
+        _ESCAPES.get(char, f"\\u{ord(char):04x}" if char < " " else char)
+        for char in name
+    )
+    return f"['{escaped}']"
+
+
+def _format_slice(selector: Slice) -> str:
+    parts = [
+        "" if part is None else str(part) for part in (selector.start, selector.end)
+    ]
+    if selector.step is not None:
+        parts.append(str(selector.step))
+    return f"[{':'.join(parts)}]"
+
+
+def _format_selector(selector: Any) -> str:  # noqa: PLR0911
+    if isinstance(selector, Field):
+        return "[*]" if selector.wildcard else format_name(selector.name)
+    if isinstance(selector, FieldChain):
+        return "".join(map(format_name, selector.names))
+    if isinstance(selector, BracketSelector):
+        return _format_selector(selector.content)
+    if isinstance(selector, Name):
+        return format_name(selector.name)
+    if isinstance(selector, Index):
+        return f"[{selector.idx}]"
+    if isinstance(selector, IndexList):
+        return f"[{','.join(map(str, selector.indices))}]"
+    if isinstance(selector, Slice):
+        return _format_slice(selector)
+    if isinstance(selector, WildcardIndex):
+        return "[*]"
+    if isinstance(selector, FilterSelector):
+        return f"[?{format_expression(selector.expression)}]"
+    msg = f"Unsupported selector: {selector!r}"
+    raise TypeError(msg)
+
+
+def format_segment(segment: Any) -> str:
+    """Render one segment in bracket notation, e.g. ``['a']`` or ``..[0]``.
+
+    Raises:
+        TypeError: If the segment type is not recognised.
+
+    """
+    if isinstance(segment, RecursiveSelector):
+        if segment.name is None:
+            return "..[*]"
+        return ".." + _format_selector(segment.name)
+    return _format_selector(segment)
+
+
+def format_path(path: JSONPath | FilterQuery) -> str:
+    """Render a parsed path (or filter query) in bracket notation.
+
+    The result parses back to an equivalent path: it selects the same
+    values, though ``.name`` comes back as ``['name']`` and ``..`` as
+    ``..[*]``.
+    """
+    root = "@" if isinstance(path, FilterQuery) and not path.absolute else "$"
+    return root + "".join(map(format_segment, path.segments))
+
+
+def _format_operand(operand: Any, parent: type | None) -> str:
+    text = format_expression(operand)
+    # ``||`` binds loosest, so it needs parentheses under ``&&``; ``!``
+    # only applies to a parenthesized expression or an existence test.
+    if (isinstance(operand, LogicalOr) and parent is LogicalAnd) or (
+        parent is LogicalNot and not isinstance(operand, ExistenceTest)
+    ):
+        return f"({text})"
+    return text
+
+
+def format_expression(expression: Any) -> str:  # noqa: PLR0911
+    """Render a filter expression, e.g. ``@['price'] < 10 && @['isbn']``.
+
+    Raises:
+        TypeError: If the expression type is not recognised.
+
+    """
+    if isinstance(expression, LogicalOr):
+        return (
+            f"{_format_operand(expression.left, LogicalOr)}"
+            f" || {_format_operand(expression.right, LogicalOr)}"
+        )
+    if isinstance(expression, LogicalAnd):
+        return (
+            f"{_format_operand(expression.left, LogicalAnd)}"
+            f" && {_format_operand(expression.right, LogicalAnd)}"
+        )
+    if isinstance(expression, LogicalNot):
+        return "!" + _format_operand(expression.expression, LogicalNot)
+    if isinstance(expression, Comparison):
+        left = format_expression(expression.left)
+        right = format_expression(expression.right)
+        return f"{left} {expression.op} {right}"
+    if isinstance(expression, ExistenceTest):
+        return format_path(expression.query)
+    if isinstance(expression, FilterQuery):
+        return format_path(expression)
+    if isinstance(expression, Literal):
+        return json.dumps(expression.value)
+    msg = f"Unsupported filter expression: {expression!r}"
+    raise TypeError(msg)
@@ -0,0 +1,331 @@
+from __future__ import annotations
+
+import dataclasses
+import threading
+import weakref
+from bisect import bisect_left
+from collections import Counter
+from collections.abc import Iterable, Sequence
+from itertools import chain, repeat
+from typing import Any
+
+from .parsed_dataclasses import BracketSelector, Field, Index, Name, RecursiveSelector
+from .plan import QueryPlan, Step, compile_segment, iter_containers
+
+OBJECT = ord("o")
+ARRAY = ord("a")
+
+
+def _walk(value: Any, offset: int) -> tuple[list[Any], list[int]]:
+    """List the containers of ``value`` in pre-order.
+
+    Each comes with the absolute position just past its subtree.
+    """
+    containers = [value]
+    ends = [0]
+    stack = [(iter(value.values() if isinstance(value, dict) else value), 0)]
+    while stack:
+        children, pos = stack[-1]
+        for child in children:
+            if isinstance(child, dict):
+                stack.append((iter(child.values()), len(containers)))
+            elif isinstance(child, list):
+                stack.append((iter(child), len(containers)))
+            else:
+                continue
+            containers.append(child)
+            ends.append(0)
+            break
+        else:
+            stack.pop()
+            ends[pos] = offset + len(containers)
+    return containers, ends
+
+
+def _tables(
+    containers: Sequence[Any], offset: int
+) -> tuple[dict[str, list[int]], list[int]]:
+    """Build the member-name and array tables, numbering from ``offset``."""
+    keys: dict[str, list[int]] = {}
+    arrays: list[int] = []
+    for pos, container in enumerate(containers, offset):
+        if isinstance(container, dict):
+            for key in container:
+                entries = keys.get(key)
+                if entries is None:
+                    keys[key] = [pos]
+                else:
+                    entries.append(pos)
+        else:
+            arrays.append(pos)
+    return keys, arrays
+
+
+def _splice(
+    entries: list[int], start: int, end: int, new: Iterable[int], delta: int
+) -> None:
+    """Replace the sorted positions in ``[start, end)`` and shift later ones."""
+    lo = bisect_left(entries, start)
+    hi = bisect_left(entries, end, lo)
+    count = len(entries)
+    entries[lo:hi] = new
+    if delta:
+        later = hi + len(entries) - count
+        entries[later:] = [p + delta for p in entries[later:]]
+
+
+class DocumentIndex:
+    """Structural index of a parsed JSON document.
+
+    Every object and array is numbered in document (pre-)order, so the
+    containers below any container form one contiguous range. On top of
+    that the index keeps an inverted map from member names to the objects
+    that have them, plus the kind and length of every container. Recursive
+    descent is answered from these tables: ``..name`` becomes a range
+    query on the objects having ``name`` and ``..[0]`` on the non-empty
+    arrays, instead of a walk over the whole subtree.
+
+    The index holds references to the containers it was built from and
+    does not observe changes to them. After modifying the document, call
+    :meth:`rebuild` or, when the change is confined to a few containers,
+    :meth:`refresh` on each of them.
+
+    Lookups and :meth:`bind` may be called from any number of threads;
+    :meth:`rebuild` and :meth:`refresh` must not run concurrently with
+    them.
+    """
+
+    def __init__(self, document: Any) -> None:
+        """Index ``document``.
+
+        Args:
+            document: Parsed JSON value; scalars give an empty index.
+
+        """
+        self.document = document
+        self._plans: weakref.WeakKeyDictionary[QueryPlan, QueryPlan] = (
+            weakref.WeakKeyDictionary()
+        )
+        self._plans_lock = threading.Lock()
+        self.rebuild()
+
+    def rebuild(self) -> None:
+        """Re-index the whole document."""
+        if isinstance(self.document, dict | list):
+            self.containers, self.ends = _walk(self.document, 0)
+        else:
+            self.containers, self.ends = [], []
+        self._derive()
+
+    def _derive(self) -> None:
+        self._positions = {
+            id(container): pos for pos, container in enumerate(self.containers)
+        }
+        # Ids of containers stored in more than one place, e.g. one list
+        # under two keys; usually none.
+        self._shared: set[int] = set()
+        if len(self._positions) < len(self.containers):
+            counts = Counter(map(id, self.containers))
+            self._shared = {key for key, count in counts.items() if count > 1}
+        self.lengths = [len(container) for container in self.containers]
+        self.tags = bytes(
+            OBJECT if isinstance(c, dict) else ARRAY for c in self.containers
+        )
+        self._keys, self._arrays = _tables(self.containers, 0)
+
+    def refresh(self, container: Any) -> bool:
+        """Re-index the subtree of one indexed container after it changed.
+
+        Only ``container`` and its descendants are walked again. Their
+        entries are replaced in every table, and the positions after them
+        are shifted if the number of containers changed; the rest of the
+        document is not looked at.
+
+        Args:
+            container: An object or array that is already in the index.
+
+        Returns:
+            True if the subtree was re-indexed. False if ``container`` is
+            not in the index, or if it or a container below it occurs more
+            than once in the document, so that the other occurrences would
+            go stale; the caller should :meth:`rebuild` instead.
+
+        """
+        pos = self.position(container)
+        if pos is None:
+            return False
+        old_end = self.ends[pos]
+        if self._shared and not self._shared.isdisjoint(
+            map(id, self.containers[pos:old_end])
+        ):
+            return False
+        containers, ends = _walk(container, pos)
+        delta = len(containers) - (old_end - pos)
+        self._replace_positions(pos, old_end, containers, delta)
+        self.containers[pos:old_end] = containers
+        self.ends[pos:old_end] = ends
+        self.lengths[pos:old_end] = [len(c) for c in containers]
+        self.tags = b"".join(
+            (
+                self.tags[:pos],
+                bytes(OBJECT if isinstance(c, dict) else ARRAY for c in containers),
+                self.tags[old_end:],
+            )
+        )
+        self._replace_tables(pos, old_end, containers, delta)
+        return True
+
+    def _replace_positions(
+        self, pos: int, old_end: int, containers: list[Any], delta: int
+    ) -> None:
+        """Renumber for ``containers`` replacing ``[pos, old_end)``.
+
+        Shifts ``ends`` and ``_positions`` after the range; ``ends`` in the
+        range are left to the caller.
+        """
+        positions = self._positions
+        for old_pos, old in enumerate(self.containers[pos:old_end], pos):
+            if positions.get(id(old)) == old_pos:
+                del positions[id(old)]
+        if delta:
+            self.ends[:pos] = [
+                end + delta if end >= old_end else end for end in self.ends[:pos]
+            ]
+            self.ends[old_end:] = [end + delta for end in self.ends[old_end:]]
+            for later in self.containers[old_end:]:
+                positions[id(later)] += delta
+        for new_pos, new in enumerate(containers, pos):
+            if id(new) in positions:
+                self._shared.add(id(new))
+            positions[id(new)] = new_pos
+
+    def _replace_tables(
+        self, pos: int, old_end: int, containers: list[Any], delta: int
+    ) -> None:
+        """Splice the member-name and array entries of ``containers`` in."""
+        keys, arrays = _tables(containers, pos)
+        for key in keys.keys() - self._keys.keys():
+            self._keys[key] = []
+        for key, entries in list(self._keys.items()):
+            _splice(entries, pos, old_end, keys.get(key, ()), delta)
+            if not entries:
+                del self._keys[key]
+        _splice(self._arrays, pos, old_end, arrays, delta)
+
+    def position(self, container: Any) -> int | None:
+        """Return the pre-order number of ``container``, or None if not indexed."""
+        pos = self._positions.get(id(container))
+        if pos is None or self.containers[pos] is not container:
+            return None
+        return pos
+
+    def descendants(self, value: Any) -> Sequence[Any] | Iterable[Any]:
+        """Return ``value`` and every container below it, in document order."""
+        pos = self.position(value)
+        if pos is None:
+            return iter_containers(value)
+        return self.containers[pos : self.ends[pos]]
+
+    def with_key(self, value: Any, name: str) -> list[Any] | None:
+        """Return the objects at or below ``value`` that have member ``name``.
+
+        Returns:
+            The objects in document order, or None if ``value`` is not
+            indexed.
+
+        """
+        pos = self.position(value)
+        if pos is None:
+            return None
+        positions = self._keys.get(name, ())
+        lo = bisect_left(positions, pos)
+        hi = bisect_left(positions, self.ends[pos], lo)
+        return [self.containers[p] for p in positions[lo:hi]]
+
+    def arrays(self, value: Any, min_length: int = 0) -> list[Any] | None:
+        """Return the arrays at or below ``value`` with ``min_length`` or more elements.
+
+        Returns:
+            The arrays in document order, or None if ``value`` is not
+            indexed.
+
+        """
+        pos = self.position(value)
+        if pos is None:
+            return None
+        lo = bisect_left(self._arrays, pos)
+        hi = bisect_left(self._arrays, self.ends[pos], lo)
+        lengths = self.lengths
+        return [
+            self.containers[p] for p in self._arrays[lo:hi] if lengths[p] >= min_length
+        ]
+
+    def bind(self, plan: QueryPlan) -> QueryPlan:
+        """Return a plan answering the recursive segments of ``plan`` from the index.
+
+        Plans without recursive descent are returned unchanged. Bound
+        plans are cached per plan and select the same values, in the
+        same order, as the original.
+        """
+        if not any(isinstance(segment, RecursiveSelector) for segment in plan.segments):
+            return plan
+        with self._plans_lock:
+            bound = self._plans.get(plan)
+        if bound is None:
+            steps = tuple(
+                self._recursive_step(segment)
+                if isinstance(segment, RecursiveSelector)
+                else step
+                for segment, step in zip(plan.segments, plan.steps, strict=True)
+            )
+            bound = dataclasses.replace(
+                plan,
+                steps=steps,
+                function=None,
+                iter_function=None,
+            )
+            with self._plans_lock:
+                bound = self._plans.setdefault(plan, bound)
+        return bound
+
+    def _recursive_step(self, segment: RecursiveSelector) -> Step:
+        selector = segment.name
+        if isinstance(selector, BracketSelector):
+            selector = selector.content
+        walk = compile_segment(segment)
+
+        if isinstance(selector, Field | Name) and not getattr(
+            selector, "wildcard", False
+        ):
+            name = selector.name
+
+            def select_name(value: Any, root: Any) -> Iterable[Any]:
+                objects = self.with_key(value, name)
+                if objects is None:
+                    return walk(value, root)
+                return [obj[name] for obj in objects]
+
+            return select_name
+
+        if isinstance(selector, Index):
+            idx = selector.idx
+            min_length = idx + 1 if idx >= 0 else -idx
+
+            def select_index(value: Any, root: Any) -> Iterable[Any]:
+                arrays = self.arrays(value, min_length)
+                if arrays is None:
+                    return walk(value, root)
+                return [array[idx] for array in arrays]
+
+            return select_index
+
+        inner = compile_segment(
+            Field(name="*", wildcard=True) if selector is None else segment.name
+        )
+
+        def select_descendants(value: Any, root: Any) -> Iterable[Any]:
+            return chain.from_iterable(
+                map(inner, self.descendants(value), repeat(root))
+            )
+
+        return select_descendants
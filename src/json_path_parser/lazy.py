@@ -0,0 +1,316 @@
+from __future__ import annotations
+
+import mmap
+import operator
+import os
+import re
+from array import array
+from bisect import bisect_left
+from itertools import accumulate
+from typing import Any, NoReturn, Self
+
+_BRACKET = re.compile(rb'(?:[^"\[\]{}]++|"[^"\\]*+(?:\\.[^"\\]*+)*+")*+[\[\]{}]')
+_WHITESPACE = re.compile(rb"[ \t\n\r]*")
+_STRING = re.compile(rb'"([^"\\]*(?:\\.[^"\\]*)*)"', re.DOTALL)
+_NUMBER = re.compile(rb"-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?")
+_LITERALS = {
+    ord("t"): (b"true", True),
+    ord("f"): (b"false", False),
+    ord("n"): (b"null", None),
+}
+
+_OPEN_OBJECT, _CLOSE_OBJECT = ord("{"), ord("}")
+_OPEN_ARRAY, _CLOSE_ARRAY = ord("["), ord("]")
+_QUOTE, _COLON, _COMMA = ord('"'), ord(":"), ord(",")
+_OPENING = bytes.maketrans(b"{[]}", b"\x01\x01\x00\x00")
+_DELTA = (-1, 1)
+
+
+def _build_index(buffer: Any) -> tuple[array[int], bytes, bytes | array[int]]:
+    """Locate every structural bracket in one scan of ``buffer``.
+
+    Strings are skipped inside the regular expression and positions,
+    kinds and nesting levels are computed with ``map`` and ``accumulate``,
+    so no Python code runs per bracket.
+
+    Returns:
+        The offset just past each bracket, the brackets themselves, and
+        the nesting level of each: the depth outside an object or array
+        for both its opening and closing bracket. The closing bracket of
+        an opening bracket is the next one at the same level.
+
+    """
+    ends = array("q", map(operator.methodcaller("end"), _BRACKET.finditer(buffer)))
+    kinds = bytes(map(buffer.__getitem__, map((-1).__add__, ends)))
+    opening = kinds.translate(_OPENING)
+    try:
+        levels: bytes | array[int] = bytes(
+            map(operator.sub, accumulate(map(_DELTA.__getitem__, opening)), opening),
+        )
+    except ValueError:
+        # Nested deeper than 255 levels, or a closing bracket too many.
+        levels = array(
+            "i",
+            map(operator.sub, accumulate(map(_DELTA.__getitem__, opening)), opening),
+        )
+        if min(levels) < 0:
+            _fail("Unbalanced closing bracket", ends[levels.index(-1)] - 1)
+    if 2 * opening.count(1) != len(opening):
+        _fail("Unclosed bracket", 0)
+    return ends, kinds, levels
+
+
+def _fail(message: str, pos: int) -> NoReturn:
+    msg = f"{message} at offset {pos}"
+    raise ValueError(msg)
+
+
+class LazyDocument:
+    """A JSON document decoded on demand from a memory-mapped file.
+
+    Opening the document maps the file and builds a structural index of
+    where every object and array starts and ends, in a single scan that
+    does not decode anything. :attr:`root` is then a
+    :class:`LazyObject` or :class:`LazyArray`: a real ``dict`` or
+    ``list`` whose own members are decoded the first time it is accessed
+    and cached, while nested containers stay undecoded until they are
+    accessed in turn. Queries that touch a small part of a large file only
+    pay for that part.
+
+    The root can be passed to :class:`~json_path_parser.JSONPathEvaluator`
+    like any parsed document. Subtrees that are never accessed are not
+    validated beyond their brackets. Views must not be accessed after
+    :meth:`close`.
+    """
+
+    def __init__(self, source: str | os.PathLike[str] | bytes) -> None:
+        """Map ``source`` and index its structure.
+
+        Args:
+            source: Path of a JSON file, or the JSON text as bytes.
+
+        Raises:
+            ValueError: If the file is empty or its brackets do not balance.
+
+        """
+        self._mmap: mmap.mmap | None = None
+        if isinstance(source, bytes):
+            self.buffer: Any = source
+        else:
+            with open(source, "rb") as f:  # noqa: PTH123
+                if os.fstat(f.fileno()).st_size == 0:
+                    msg = "Cannot map an empty JSON file"
+                    raise ValueError(msg)
+                self._mmap = self.buffer = mmap.mmap(
+                    f.fileno(), 0, access=mmap.ACCESS_READ
+                )
+        self._ends, self._kinds, self._levels = _build_index(self.buffer)
+        if self._mmap is not None and hasattr(mmap, "MADV_DONTNEED"):
+            # The scan faulted in every page; release them until accessed again.
+            self._mmap.madvise(mmap.MADV_DONTNEED)
+        pos = self._skip_whitespace(0)
+        self.root, end = self.value_at(pos)
+        if self._skip_whitespace(end) != len(self.buffer):
+            _fail("Extra data", end)
+
+    def close(self) -> None:
+        """Unmap the file. Values already decoded remain usable."""
+        if self._mmap is not None:
+            self._mmap.close()
+
+    def __enter__(self) -> Self:
+        return self
+
+    def __exit__(self, *exc_info: object) -> None:
+        self.close()
+
+    @property
+    def container_count(self) -> int:
+        """Number of objects and arrays in the document."""
+        return self._kinds.count(b"{") + self._kinds.count(b"[")
+
+    def _skip_whitespace(self, pos: int) -> int:
+        return _WHITESPACE.match(self.buffer, pos).end()
+
+    def _close_of(self, pos: int) -> int:
+        k = bisect_left(self._ends, pos + 1)
+        j = self._levels.index(self._levels[k], k + 1)
+        if self._kinds[j] != self._kinds[k] + 2:  # "{" -> "}", "[" -> "]"
+            _fail("Mismatched closing bracket", self._ends[j] - 1)
+        return self._ends[j] - 1
+
+    def value_at(self, pos: int) -> tuple[Any, int]:
+        """Decode the value starting at ``pos``.
+
+        Objects and arrays are returned as unloaded views.
+
+        Returns:
+            The value and the offset just past it.
+
+        """
+        buffer = self.buffer
+        if pos >= len(buffer):
+            _fail("Expected a value", pos)
+        char = buffer[pos]
+        if char == _OPEN_OBJECT:
+            return LazyObject(self, pos), self._close_of(pos) + 1
+        if char == _OPEN_ARRAY:
+            return LazyArray(self, pos), self._close_of(pos) + 1
+        if char == _QUOTE:
+            match = _STRING.match(buffer, pos)
+            if match is None:
+                _fail("Invalid string", pos)
+            return _decode_string(match.group(1)), match.end()
+        literal = _LITERALS.get(char)
+        if literal is not None:
+            text, value = literal
+            if buffer[pos : pos + len(text)] != text:
+                _fail("Invalid literal", pos)
+            return value, pos + len(text)
+        match = _NUMBER.match(buffer, pos)
+        if match is None:
+            _fail("Expected a value", pos)
+        text = match.group()
+        if b"." in text or b"e" in text or b"E" in text:
+            return float(text), match.end()
+        return int(text), match.end()
+
+    def load_object(self, start: int) -> dict[str, Any]:
+        """Decode the members of the object opening at ``start``, one level deep."""
+        buffer = self.buffer
+        members: dict[str, Any] = {}
+        pos = self._skip_whitespace(start + 1)
+        if buffer[pos] == _CLOSE_OBJECT:
+            return members
+        while True:
+            match = _STRING.match(buffer, pos)
+            if match is None:
+                _fail("Expected a member name", pos)
+            key = _decode_string(match.group(1))
+            pos = self._skip_whitespace(match.end())
+            if buffer[pos] != _COLON:
+                _fail("Expected ':'", pos)
+            members[key], pos = self.value_at(self._skip_whitespace(pos + 1))
+            pos = self._skip_whitespace(pos)
+            if buffer[pos] == _CLOSE_OBJECT:
+                return members
+            if buffer[pos] != _COMMA:
+                _fail("Expected ',' or '}'", pos)
+            pos = self._skip_whitespace(pos + 1)
+
+    def load_array(self, start: int) -> list[Any]:
+        """Decode the elements of the array opening at ``start``, one level deep."""
+        buffer = self.buffer
+        elements: list[Any] = []
+        pos = self._skip_whitespace(start + 1)
+        if buffer[pos] == _CLOSE_ARRAY:
+            return elements
+        while True:
+            value, pos = self.value_at(pos)
+            elements.append(value)
+            pos = self._skip_whitespace(pos)
+            if buffer[pos] == _CLOSE_ARRAY:
+                return elements
+            if buffer[pos] != _COMMA:
+                _fail("Expected ',' or ']'", pos)
+            pos = self._skip_whitespace(pos + 1)
+
+
+def _decode_string(raw: bytes) -> str:
+    if b"\\" not in raw:
+        return raw.decode("utf-8")
+    import json
+
+    return json.loads(b'"' + raw + b'"')
+
+
+def _loading(base: type, name: str) -> Any:
+    method = getattr(base, name)
+
+    def wrapper(self: Any, *args: Any, **kwargs: Any) -> Any:
+        if self._document is not None:
+            self._load()
+        for arg in args:
+            # Builtin comparisons read the other operand's storage directly.
+            lazy = isinstance(arg, LazyObject | LazyArray)
+            if lazy and arg._document is not None:  # noqa: SLF001
+                arg._load()  # noqa: SLF001
+        return method(self, *args, **kwargs)
+
+    wrapper.__name__ = name
+    wrapper.__doc__ = method.__doc__
+    return wrapper
+
+
+_DICT_METHODS = (
+    "__contains__", "__delitem__", "__eq__", "__ge__", "__getitem__", "__gt__",
+    "__ior__", "__iter__", "__le__", "__len__", "__lt__", "__ne__", "__or__",
+    "__repr__", "__reversed__", "__ror__", "__setitem__", "clear", "copy", "get",
+    "items", "keys", "pop", "popitem", "setdefault", "update", "values",
+)  # fmt: skip
+
+_LIST_METHODS = (
+    "__add__", "__contains__", "__delitem__", "__eq__", "__ge__", "__getitem__",
+    "__gt__", "__iadd__", "__imul__", "__iter__", "__le__", "__len__", "__lt__",
+    "__mul__", "__ne__", "__repr__", "__reversed__", "__rmul__", "__setitem__",
+    "append", "clear", "copy", "count", "extend", "index", "insert", "pop", "remove",
+    "reverse", "sort",
+)  # fmt: skip
+
+
+class LazyObject(dict):
+    """A JSON object from a :class:`LazyDocument`, decoded on first access."""
+
+    __slots__ = ("_document", "_start")
+
+    def __init__(self, document: LazyDocument, start: int) -> None:
+        """Stand for the object at byte offset ``start`` of ``document``."""
+        super().__init__()
+        self._document: LazyDocument | None = document
+        self._start = start
+
+    def _load(self) -> None:
+        dict.update(self, self._document.load_object(self._start))
+        self._document = None
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return dict, (dict(self.items()),)
+
+
+class LazyArray(list):
+    """A JSON array from a :class:`LazyDocument`, decoded on first access."""
+
+    __slots__ = ("_document", "_start")
+
+    def __init__(self, document: LazyDocument, start: int) -> None:
+        """Stand for the array at byte offset ``start`` of ``document``."""
+        super().__init__()
+        self._document: LazyDocument | None = document
+        self._start = start
+
+    def _load(self) -> None:
+        list.extend(self, self._document.load_array(self._start))
+        self._document = None
+
+    def __reduce__(self) -> tuple[Any, ...]:
+        return list, (list(self),)
+
+
+for _name in _DICT_METHODS:
+    setattr(LazyObject, _name, _loading(dict, _name))
+for _name in _LIST_METHODS:
+    setattr(LazyArray, _name, _loading(list, _name))
+del _name
+
+
+def materialize(value: Any) -> Any:
+    """Return ``value`` with every lazy view replaced by a plain dict or list.
+
+    Use this before handing a lazy subtree to code that reads containers
+    at the C level without calling their methods, such as ``json.dumps``.
+    """
+    if isinstance(value, dict):
+        return {key: materialize(child) for key, child in value.items()}
+    if isinstance(value, list):
+        return [materialize(child) for child in value]
+    return value
@@ -0,0 +1,238 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Iterator
+from itertools import chain, repeat
+from typing import Any
+
+from .formatting import format_name
+from .parsed_dataclasses import (
+    BracketSelector,
+    Field,
+    FieldChain,
+    FilterSelector,
+    Index,
+    IndexList,
+    Name,
+    RecursiveSelector,
+    Slice,
+    WildcardIndex,
+)
+
+
+def normalized_path(keys: Iterable[str | int]) -> str:
+    """Render member names and array indices as an RFC 9535 normalized path."""
+    return "$" + "".join(
+        format_name(key) if isinstance(key, str) else f"[{key}]" for key in keys
+    )
+
+
+Node = tuple[Any, str | int | None, Any]
+"""``(parent, key, value)``: a selected value, its key or index, and the
+node of its parent (None at the root)."""
+
+
+class Location(tuple):
+    """A selected value and where it was found.
+
+    Located evaluation passes plain ``(parent, key, value)`` tuples from
+    step to step, so every match below the same node shares one chain and
+    tracking costs one tuple per step. A Location wraps the node of a
+    match only once it is returned. The path is only rendered when
+    :attr:`path` or :attr:`keys` is read.
+
+    The root location has no parent and no key. Locations compare by
+    identity.
+    """
+
+    __slots__ = ()
+    __eq__ = object.__eq__
+    __ne__ = object.__ne__
+    __hash__ = object.__hash__
+
+    @property
+    def parent(self) -> Location | None:
+        """The location of the parent container, or None at the root."""
+        parent = self[0]
+        return None if parent is None else Location(parent)
+
+    @property
+    def key(self) -> str | int | None:
+        """The member name or array index of the value in its parent."""
+        return self[1]
+
+    @property
+    def value(self) -> Any:
+        """The selected value."""
+        return self[2]
+
+    @property
+    def keys(self) -> tuple[str | int, ...]:
+        """Member names and array indices leading from the root here."""
+        keys = []
+        node = self
+        while node[0] is not None:
+            keys.append(node[1])
+            node = node[0]
+        return tuple(reversed(keys))
+
+    @property
+    def path(self) -> str:
+        """The RFC 9535 normalized path, e.g. ``$['store']['book'][0]``."""
+        return normalized_path(self.keys)
+
+    def __str__(self) -> str:
+        return self.path
+
+    def __repr__(self) -> str:
+        return f"Location({self.path!r})"
+
+
+LocatedStep = Callable[[Node, Any], Iterable[Node]]
+"""A compiled segment that tracks locations: maps one input node and the
+document root to the nodes it selects."""
+
+
+def _items(value: Any) -> Iterable[tuple[Any, Any]]:
+    if isinstance(value, dict):
+        return value.items()
+    if isinstance(value, list):
+        return enumerate(value)
+    return ()
+
+
+def _locate_field(name: str) -> LocatedStep:
+    def step(node: Node, _root: Any) -> Iterable[Node]:
+        value = node[2]
+        if isinstance(value, dict) and name in value:
+            return ((node, name, value[name]),)
+        return ()
+
+    return step
+
+
+def _locate_chain(names: tuple[str, ...]) -> LocatedStep:
+    def step(node: Node, _root: Any) -> Iterable[Node]:
+        for name in names:
+            value = node[2]
+            if not isinstance(value, dict) or name not in value:
+                return ()
+            node = (node, name, value[name])
+        return (node,)
+
+    return step
+
+
+def _locate_all(node: Node, _root: Any) -> Iterable[Node]:
+    return [(node, key, child) for key, child in _items(node[2])]
+
+
+def _locate_indices(indices: tuple[int, ...]) -> LocatedStep:
+    def step(node: Node, _root: Any) -> Iterable[Node]:
+        value = node[2]
+        if not isinstance(value, list):
+            return ()
+        length = len(value)
+        return [
+            (node, idx % length, value[idx])
+            for idx in indices
+            if -length <= idx < length
+        ]
+
+    return step
+
+
+def _locate_slice(slice_obj: Slice) -> LocatedStep:
+    if slice_obj.step == 0:
+        # RFC 9535: a zero step selects nothing.
+        return lambda _node, _root: ()
+    py_slice = slice(slice_obj.start, slice_obj.end, slice_obj.step)
+
+    def step(node: Node, _root: Any) -> Iterable[Node]:
+        value = node[2]
+        if not isinstance(value, list):
+            return ()
+        return [(node, idx, value[idx]) for idx in range(len(value))[py_slice]]
+
+    return step
+
+
+def _locate_filter(segment: FilterSelector) -> LocatedStep:
+    from .filters import compile_filter
+
+    predicate = compile_filter(segment.expression)
+
+    def step(node: Node, root: Any) -> Iterable[Node]:
+        return [
+            (node, key, child)
+            for key, child in _items(node[2])
+            if predicate(child, root)
+        ]
+
+    return step
+
+
+def iter_container_nodes(node: Node) -> Iterator[Node]:
+    """Yield ``node`` and the nodes of the containers below it.
+
+    Objects and arrays come in the order of
+    :func:`~json_path_parser.plan.iter_containers`.
+    """
+    if not isinstance(node[2], dict | list):
+        return
+    yield node
+    stack = [(node, iter(_items(node[2])))]
+    while stack:
+        parent, items = stack[-1]
+        for key, child in items:
+            if isinstance(child, dict | list):
+                container = (parent, key, child)
+                yield container
+                stack.append((container, iter(_items(child))))
+                break
+        else:
+            stack.pop()
+
+
+def _locate_recursive(segment: RecursiveSelector) -> LocatedStep:
+    inner = _locate_all if segment.name is None else compile_located(segment.name)
+
+    def step(node: Node, root: Any) -> Iterable[Node]:
+        return chain.from_iterable(map(inner, iter_container_nodes(node), repeat(root)))
+
+    return step
+
+
+def compile_located(segment: Any) -> LocatedStep:  # noqa: C901, PLR0911
+    """Compile one segment (or bracket content) into a located step.
+
+    The located counterpart of :func:`~json_path_parser.plan.compile_segment`:
+    it selects the same values, in the same order, as :data:`Node` tuples
+    that :class:`Location` wraps. Negative indices are resolved, so every
+    node names the actual array position.
+
+    Raises:
+        TypeError: If the segment type is not recognised.
+
+    """
+    if isinstance(segment, Field):
+        return _locate_all if segment.wildcard else _locate_field(segment.name)
+    if isinstance(segment, FieldChain):
+        return _locate_chain(segment.names)
+    if isinstance(segment, BracketSelector):
+        return compile_located(segment.content)
+    if isinstance(segment, Name):
+        return _locate_field(segment.name)
+    if isinstance(segment, WildcardIndex):
+        return _locate_all
+    if isinstance(segment, Index):
+        return _locate_indices((segment.idx,))
+    if isinstance(segment, IndexList):
+        return _locate_indices(segment.indices)
+    if isinstance(segment, Slice):
+        return _locate_slice(segment)
+    if isinstance(segment, RecursiveSelector):
+        return _locate_recursive(segment)
+    if isinstance(segment, FilterSelector):
+        return _locate_filter(segment)
+    msg = f"Unsupported segment: {segment!r}"
+    raise TypeError(msg)
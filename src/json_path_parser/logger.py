@@ -1,7 +1,6 @@
 import logging
 
-logging.basicConfig(
-    level=logging.DEBUG,
-    format="%(asctime)s - %(name)s - %(levelname)s - %(message)s",
-)
-logger = logging.getLogger(__name__)
+# A library logger: no level and no output unless the application
+# configures logging. The command-line entry point does so in ``main``.
+logger = logging.getLogger(__package__)
+logger.addHandler(logging.NullHandler())
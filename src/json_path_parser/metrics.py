@@ -0,0 +1,457 @@
+from __future__ import annotations
+
+import math
+import threading
+from abc import ABC, abstractmethod
+from bisect import bisect_left
+from collections.abc import Callable, Iterator, Sequence
+from time import perf_counter
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .cache import PathCache
+
+LATENCY_BUCKETS = (
+    1e-6,
+    5e-6,
+    1e-5,
+    5e-5,
+    1e-4,
+    5e-4,
+    1e-3,
+    5e-3,
+    1e-2,
+    5e-2,
+    0.1,
+    0.5,
+    1.0,
+    5.0,
+)
+SIZE_BUCKETS = (0, 1, 10, 100, 1_000, 10_000, 100_000, 1_000_000, 10_000_000)
+DEFAULT_MAX_SERIES = 1000
+OTHER = "__other__"
+
+Labels = tuple[str, ...]
+Sample = tuple[str, dict[str, str], float]
+"""One exported value: sample name, labels and value."""
+
+
+class _Metric(ABC):
+    kind = ""
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str],
+        max_series: int,
+    ) -> None:
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.max_series = max_series
+        self._lock = threading.Lock()
+
+    def _key(self, series: dict[Labels, Any], labels: Labels) -> Labels:
+        # Past max_series, new label sets share one overflow series so that
+        # per-path labels cannot grow without bound.
+        if labels in series or len(series) < self.max_series:
+            return labels
+        return (OTHER,) * len(self.labelnames)
+
+    @abstractmethod
+    def samples(self) -> list[Sample]:
+        """Return the current value of every series, for export."""
+
+
+class Counter(_Metric):
+    """A monotonically increasing count, per label set."""
+
+    kind = "counter"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        max_series: int = DEFAULT_MAX_SERIES,
+    ) -> None:
+        """Create a counter with no series yet."""
+        super().__init__(name, documentation, labelnames, max_series)
+        self._values: dict[Labels, float] = {}
+
+    def inc(self, amount: float = 1, labels: Labels = ()) -> None:
+        """Add ``amount`` to the series of ``labels``."""
+        with self._lock:
+            key = self._key(self._values, labels)
+            self._values[key] = self._values.get(key, 0) + amount
+
+    def value(self, labels: Labels = ()) -> float:
+        """Return the current count of ``labels``."""
+        return self._values.get(labels, 0)
+
+    def samples(self) -> list[Sample]:
+        """Return one sample per label set."""
+        with self._lock:
+            return [
+                (self.name, dict(zip(self.labelnames, labels, strict=True)), value)
+                for labels, value in self._values.items()
+            ]
+
+
+class Histogram(_Metric):
+    """Observations counted into cumulative buckets, per label set."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+        max_series: int = DEFAULT_MAX_SERIES,
+    ) -> None:
+        """Create a histogram with the given bucket upper bounds."""
+        super().__init__(name, documentation, labelnames, max_series)
+        self.buckets = tuple(sorted(buckets))
+        # Per series: observation count of each bucket (plus +Inf), sum.
+        self._series: dict[Labels, tuple[list[int], list[float]]] = {}
+
+    def observe(self, value: float, labels: Labels = ()) -> None:
+        """Record one observation of ``value`` in the series of ``labels``."""
+        bucket = bisect_left(self.buckets, value)
+        with self._lock:
+            key = self._key(self._series, labels)
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = ([0] * (len(self.buckets) + 1), [0.0])
+            series[0][bucket] += 1
+            series[1][0] += value
+
+    def count(self, labels: Labels = ()) -> int:
+        """Return the number of observations of ``labels``."""
+        series = self._series.get(labels)
+        return sum(series[0]) if series is not None else 0
+
+    def sum(self, labels: Labels = ()) -> float:
+        """Return the sum of the observations of ``labels``."""
+        series = self._series.get(labels)
+        return series[1][0] if series is not None else 0.0
+
+    def samples(self) -> list[Sample]:
+        """Return the cumulative ``_bucket``, ``_sum`` and ``_count`` samples."""
+        samples = []
+        with self._lock:
+            for labels, (counts, total) in self._series.items():
+                base = dict(zip(self.labelnames, labels, strict=True))
+                cumulative = 0
+                for bound, count in zip((*self.buckets, math.inf), counts, strict=True):
+                    cumulative += count
+                    le = "+Inf" if bound == math.inf else repr(bound)
+                    samples.append(
+                        (f"{self.name}_bucket", {**base, "le": le}, cumulative)
+                    )
+                samples.append((f"{self.name}_sum", base, total[0]))
+                samples.append((f"{self.name}_count", base, cumulative))
+        return samples
+
+
+class MetricsRegistry:
+    """A set of named metrics plus collectors evaluated at export time.
+
+    The library records into the registry passed to :func:`enable`; its
+    metrics are:
+
+    * ``jsonpath_parse_seconds{parser}``: parse latency, ``parser`` being
+      ``fast`` for the hand-written scanner or ``lark`` for the grammar.
+    * ``jsonpath_transform_seconds``: Lark tree to AST conversion.
+    * ``jsonpath_compile_seconds{backend}``: AST to plan.
+    * ``jsonpath_parse_errors_total``: expressions that failed to parse.
+    * ``jsonpath_evaluate_seconds{path}``, ``jsonpath_result_size{path}``
+      and ``jsonpath_nodes_visited{path}``: per query evaluation latency,
+      number of results and number of values passed through the path's
+      segments (not observed for plans with generated code). Every
+      evaluation of a :class:`~json_path_parser.plan.QueryPlan` is
+      recorded, eager or lazy, with or without locations, so all the
+      ``select``, ``locate``, ``first``, ``exists``, ``count`` and
+      columnar methods are covered. A lazy evaluation is recorded once
+      its iterator is exhausted or closed. A
+      :class:`~json_path_parser.multi.MultiPlan` is recorded as one query
+      labelled with its paths joined by ``", "``.
+    * ``jsonpath_cache_*{cache}``: hits, misses, evictions, size and hit
+      ratio of watched caches, read when the registry is exported.
+    """
+
+    def __init__(self, max_series: int = DEFAULT_MAX_SERIES) -> None:
+        """Create an empty registry.
+
+        Args:
+            max_series: Label sets kept per metric before further ones
+                are merged into a single ``__other__`` series.
+
+        """
+        self.max_series = max_series
+        self._metrics: dict[str, _Metric] = {}
+        self._collectors: list[Callable[[], Iterator[tuple[str, str, Sample]]]] = []
+        self._lock = threading.Lock()
+        self.parse_seconds = self.histogram(
+            "jsonpath_parse_seconds", "Time to parse an expression.", ("parser",)
+        )
+        self.transform_seconds = self.histogram(
+            "jsonpath_transform_seconds", "Time to convert a parse tree to an AST."
+        )
+        self.compile_seconds = self.histogram(
+            "jsonpath_compile_seconds", "Time to compile an AST.", ("backend",)
+        )
+        self.parse_errors = self.counter(
+            "jsonpath_parse_errors_total", "Expressions that failed to parse."
+        )
+        self.evaluate_seconds = self.histogram(
+            "jsonpath_evaluate_seconds", "Time to evaluate a query.", ("path",)
+        )
+        self.result_size = self.histogram(
+            "jsonpath_result_size",
+            "Values selected by a query.",
+            ("path",),
+            SIZE_BUCKETS,
+        )
+        self.nodes_visited = self.histogram(
+            "jsonpath_nodes_visited",
+            "Values passed through the segments of a query.",
+            ("path",),
+            SIZE_BUCKETS,
+        )
+
+    def counter(
+        self, name: str, documentation: str, labelnames: Sequence[str] = ()
+    ) -> Counter:
+        """Return the counter ``name``, creating it on first use.
+
+        Raises:
+            ValueError: If ``name`` is registered as another kind of metric.
+
+        """
+        return self._register(Counter, name, documentation, labelnames)
+
+    def histogram(
+        self,
+        name: str,
+        documentation: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS,
+    ) -> Histogram:
+        """Return the histogram ``name``, creating it on first use.
+
+        Raises:
+            ValueError: If ``name`` is registered as another kind of metric.
+
+        """
+        return self._register(
+            Histogram, name, documentation, labelnames, buckets=buckets
+        )
+
+    def _register(
+        self, kind: type[Any], name: str, documentation: str, labelnames: Any, **kw: Any
+    ) -> Any:
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = kind(
+                    name,
+                    documentation,
+                    labelnames,
+                    max_series=self.max_series,
+                    **kw,
+                )
+            elif not isinstance(metric, kind):
+                msg = f"Metric {name!r} is already registered as a {metric.kind}"
+                raise ValueError(msg)
+            return metric
+
+    def watch_cache(self, cache: PathCache, name: str = "default") -> None:
+        """Export the counters of ``cache`` under the label ``cache=name``.
+
+        The statistics are read from the cache when the registry is
+        exported, so watching adds nothing to lookups.
+        """
+
+        def collect() -> Iterator[tuple[str, str, Sample]]:
+            stats = cache.stats()
+            labels = {"cache": name}
+            for field in ("hits", "misses", "evictions"):
+                metric = f"jsonpath_cache_{field}_total"
+                sample = (metric, labels, getattr(stats, field))
+                yield "counter", f"Path cache {field}.", sample
+            yield (
+                "gauge",
+                "Entries in the path cache.",
+                (
+                    "jsonpath_cache_size",
+                    labels,
+                    stats.size,
+                ),
+            )
+            yield (
+                "gauge",
+                "Fraction of path cache lookups that hit.",
+                (
+                    "jsonpath_cache_hit_ratio",
+                    labels,
+                    stats.hit_rate,
+                ),
+            )
+
+        with self._lock:
+            self._collectors.append(collect)
+
+    def reset(self) -> None:
+        """Drop all recorded values; metrics and watched caches are kept."""
+        with self._lock:
+            for metric in self._metrics.values():
+                with metric._lock:  # noqa: SLF001
+                    if isinstance(metric, Counter):
+                        metric._values.clear()  # noqa: SLF001
+                    else:
+                        metric._series.clear()  # noqa: SLF001
+
+    def _families(self) -> dict[str, tuple[str, str, list[Sample]]]:
+        with self._lock:
+            metrics = list(self._metrics.values())
+            collectors = list(self._collectors)
+        families = {
+            metric.name: (metric.kind, metric.documentation, metric.samples())
+            for metric in metrics
+        }
+        for collect in collectors:
+            for kind, documentation, sample in collect():
+                name = sample[0]
+                family = families.setdefault(name, (kind, documentation, []))
+                family[2].append(sample)
+        return families
+
+    def as_dict(self) -> dict[str, dict[str, Any]]:
+        """Export every metric as plain data.
+
+        Returns:
+            Mapping of metric name to ``{"type", "help", "samples"}``,
+            where each sample is ``{"name", "labels", "value"}``.
+
+        """
+        return {
+            name: {
+                "type": kind,
+                "help": documentation,
+                "samples": [
+                    {"name": sample, "labels": labels, "value": value}
+                    for sample, labels, value in samples
+                ],
+            }
+            for name, (kind, documentation, samples) in self._families().items()
+        }
+
+    def to_prometheus(self) -> str:
+        """Export every metric in the Prometheus text exposition format."""
+        lines = []
+        for name, (kind, documentation, samples) in self._families().items():
+            lines.append(f"# HELP {name} {documentation}")
+            lines.append(f"# TYPE {name} {kind}")
+            for sample, labels, value in samples:
+                if labels:
+                    rendered = ",".join(
+                        f'{key}="{_escape(val)}"' for key, val in labels.items()
+                    )
+                    sample = f"{sample}{{{rendered}}}"  # noqa: PLW2901
+                lines.append(f"{sample} {_format_value(value)}")
+        return "\n".join(lines) + "\n"
+
+    def observe_query(
+        self, source: str | None, seconds: float, size: int, visited: int | None
+    ) -> None:
+        """Record one evaluation of the query ``source``.
+
+        Args:
+            source: The query's expression; None labels it ``<plan>``.
+            seconds: How long the evaluation took.
+            size: Number of values selected.
+            visited: Number of values passed through the query's segments,
+                or None if it was not counted.
+
+        """
+        labels = (source or "<plan>",)
+        self.evaluate_seconds.observe(seconds, labels)
+        self.result_size.observe(size, labels)
+        if visited is not None:
+            self.nodes_visited.observe(visited, labels)
+
+    def observe_iteration(
+        self, source: str | None, values: Iterator[Any], visits: list[int] | None
+    ) -> Iterator[Any]:
+        """Yield ``values``, recording the query once they run out or are closed.
+
+        The time recorded runs from the first value requested to the last,
+        including the time the consumer spends between values.
+
+        Args:
+            source: The query's expression; None labels it ``<plan>``.
+            values: The lazily selected values.
+            visits: Counter of values passed through the segments, as
+                filled by :func:`~json_path_parser.plan.iterate_steps`, or
+                None if they are not counted.
+
+        """
+        size = 0
+        start = perf_counter()
+        try:
+            for value in values:
+                size += 1
+                yield value
+        finally:
+            visited = None if visits is None else visits[0]
+            self.observe_query(source, perf_counter() - start, size, visited)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    if isinstance(value, bool) or float(value).is_integer():
+        return str(int(value))
+    return repr(float(value))
+
+
+active: MetricsRegistry | None = None
+"""The registry being recorded into, or None while metrics are disabled.
+
+Instrumented code reads this once per operation and does nothing else
+when it is None."""
+
+
+def enable(registry: MetricsRegistry | None = None) -> MetricsRegistry:
+    """Start recording metrics.
+
+    Args:
+        registry: Where to record; a new registry watching the default
+            path cache if omitted.
+
+    Returns:
+        The registry now recording.
+
+    """
+    global active  # noqa: PLW0603
+    if registry is None:
+        from .cache import default_cache
+
+        registry = MetricsRegistry()
+        registry.watch_cache(default_cache)
+    active = registry
+    return registry
+
+
+def disable() -> None:
+    """Stop recording metrics. Recorded values stay in the registry."""
+    global active  # noqa: PLW0603
+    active = None
@@ -0,0 +1,140 @@
+from __future__ import annotations
+
+from collections.abc import Iterator, Mapping
+from dataclasses import dataclass
+from time import perf_counter
+from typing import Any
+
+from . import metrics
+from .evaluator import PathLike, as_plan
+from .parsed_dataclasses import Field, FieldChain
+from .plan import QueryPlan, Step, compile_segment
+
+
+class _TrieNode:
+    """One shared prefix of the paths.
+
+    Holds the outgoing edges keyed by segment and the names of the paths
+    that end exactly here.
+    """
+
+    __slots__ = ("children", "names")
+
+    def __init__(self) -> None:
+        self.children: dict[Any, tuple[Step | None, _TrieNode]] = {}
+        self.names: list[str] = []
+
+
+def _edges(plan: QueryPlan) -> Iterator[tuple[Any, Step | None]]:
+    """Yield the segments of ``plan`` with their steps, one field per name.
+
+    Name chains are split so that paths diverging inside a chain still
+    share its prefix; their fields get no step until the trie is built.
+    """
+    for segment, step in zip(plan.segments, plan.steps, strict=True):
+        if isinstance(segment, FieldChain):
+            for name in segment.names:
+                yield Field(name=name), None
+        else:
+            yield segment, step
+
+
+def _is_name(segment: Any) -> bool:
+    return isinstance(segment, Field) and not segment.wildcard
+
+
+def _fuse_chains(node: _TrieNode) -> None:
+    """Fuse each run of names that no path ends in or branches off from."""
+    children = {}
+    for segment, (step, child) in node.children.items():
+        key, end = segment, child
+        names = [segment.name] if _is_name(segment) else []
+        while names and not end.names and len(end.children) == 1:
+            ((following, (_, grandchild)),) = end.children.items()
+            if not _is_name(following):
+                break
+            names.append(following.name)
+            end = grandchild
+        if len(names) > 1:
+            key = FieldChain(names=tuple(names))
+        _fuse_chains(end)
+        children[key] = (
+            step if key is segment and step is not None else compile_segment(key),
+            end,
+        )
+    node.children = children
+
+
+@dataclass(frozen=True, eq=False)
+class MultiPlan:
+    """Several compiled paths merged into a prefix trie.
+
+    Evaluating the plan walks the document once per distinct prefix rather
+    than once per path: ``$.store.book[*].title`` and
+    ``$.store.bicycle.color`` share the lookup of ``store``. Runs of member
+    names that only one branch of the trie follows are looked up in one
+    step, as in a single plan.
+    Build it once with :meth:`from_paths` and reuse it for every document.
+    """
+
+    root: _TrieNode
+    names: tuple[str, ...]
+    source: str | None = None
+
+    @classmethod
+    def from_paths(cls, paths: Mapping[str, PathLike]) -> MultiPlan:
+        """Merge named paths into a trie.
+
+        Args:
+            paths: Mapping of result name to path string, JSONPath or plan.
+
+        Returns:
+            MultiPlan producing one result list per name.
+
+        """
+        root = _TrieNode()
+        sources = []
+        for name, path in paths.items():
+            plan = as_plan(path)
+            sources.append(plan.source or "<plan>")
+            node = root
+            for segment, step in _edges(plan):
+                edge = node.children.get(segment)
+                if edge is None:
+                    edge = node.children[segment] = (step, _TrieNode())
+                node = edge[1]
+            node.names.append(name)
+        _fuse_chains(root)
+        return cls(root=root, names=tuple(paths), source=", ".join(sources))
+
+    def evaluate(self, document: Any) -> dict[str, list[Any]]:
+        """Evaluate every path against ``document`` in a single walk.
+
+        Args:
+            document: Parsed JSON value to query.
+
+        Returns:
+            Dict mapping each name to its selected values, in the order the
+            paths were given. Results equal separate ``select`` calls.
+
+        """
+        recorder = metrics.active
+        start = perf_counter()
+        visited = 0
+        results: dict[str, list[Any]] = {name: [] for name in self.names}
+        stack = [(self.root, [document])]
+        while stack:
+            node, selection = stack.pop()
+            for i, name in enumerate(node.names):
+                results[name] = selection if i == 0 else list(selection)
+            for step, child in node.children.values():
+                visited += len(selection)
+                next_selection = [
+                    match for value in selection for match in step(value, document)
+                ]
+                if next_selection:
+                    stack.append((child, next_selection))
+        if recorder is not None:
+            size = sum(map(len, results.values()))
+            recorder.observe_query(self.source, perf_counter() - start, size, visited)
+        return results
@@ -0,0 +1,172 @@
+from __future__ import annotations
+
+from collections.abc import Callable
+from typing import TYPE_CHECKING, Any
+
+from .evaluator import PathLike, as_plan
+
+if TYPE_CHECKING:
+    from .index import DocumentIndex
+    from .locations import Location
+
+# A refresh that adds or removes containers shifts every position after
+# the subtree, so past a handful of changed containers one full rebuild is
+# cheaper.
+_MAX_REFRESH = 8
+
+
+def _targets(document: Any, path: PathLike) -> list[Location]:
+    # One traversal finds every match. A node selected twice (``$[0,0]``,
+    # or an array shared by two parents) is changed once.
+    seen = set()
+    targets = []
+    for location in as_plan(path).locate(document):
+        parent = location.parent
+        key = None if parent is None else (id(parent.value), location.key)
+        if key not in seen:
+            seen.add(key)
+            targets.append(location)
+    return targets
+
+
+def _reindex(index: DocumentIndex | None, containers: list[Any]) -> None:
+    if index is None or not containers:
+        return
+    positions = [index.position(container) for container in containers]
+    if len(containers) > _MAX_REFRESH or None in positions:
+        index.rebuild()
+        return
+    # Outermost first; a container inside one already refreshed is skipped,
+    # its subtree having been walked again with the ancestor. Subtree ends
+    # are read up front, before refreshing shifts them. A container stored
+    # in several places, as set_values does with one value for several
+    # matches, cannot be refreshed in one of them: refresh declines it and
+    # the whole index is rebuilt.
+    spans = sorted(
+        (pos, index.ends[pos], container)
+        for pos, container in zip(positions, containers, strict=True)
+    )
+    covered = 0
+    for pos, end, container in spans:
+        if pos < covered:
+            continue
+        covered = end
+        if not index.refresh(container):
+            index.rebuild()
+            return
+
+
+def _assign(
+    document: Any,
+    path: PathLike,
+    compute: Callable[[Any], Any],
+    index: DocumentIndex | None,
+) -> Any:
+    containers = {}
+    # Innermost matches first, so when both a node and its descendants are
+    # selected, ``compute`` sees the node with its descendants already done.
+    for location in reversed(_targets(document, path)):
+        parent = location.parent
+        if parent is None:
+            document = compute(location.value)
+        else:
+            parent.value[location.key] = compute(location.value)
+            containers[id(parent.value)] = parent.value
+    _reindex(index, list(containers.values()))
+    return document
+
+
+def set_values(
+    document: Any,
+    path: PathLike,
+    value: Any,
+    *,
+    index: DocumentIndex | None = None,
+) -> Any:
+    """Replace every value ``path`` selects with ``value``, in place.
+
+    Matched members and array items are overwritten in their containers;
+    nothing is copied and no member is created where the path selects
+    nothing. ``value`` itself is stored, so a container assigned to
+    several locations is shared between them.
+
+    Args:
+        document: Parsed JSON value to modify.
+        path: A path string, parsed JSONPath or compiled QueryPlan.
+        value: The replacement.
+        index: Index of ``document`` to bring up to date, if any.
+
+    Returns:
+        The document: ``document`` itself, or ``value`` if the path
+        selects the root.
+
+    """
+    return _assign(document, path, lambda _old: value, index)
+
+
+def update_values(
+    document: Any,
+    path: PathLike,
+    function: Callable[[Any], Any],
+    *,
+    index: DocumentIndex | None = None,
+) -> Any:
+    """Replace every value ``path`` selects with ``function(value)``, in place.
+
+    Each selected node is updated once, even if the path selects it more
+    than once, and nested matches are updated innermost first.
+
+    Args:
+        document: Parsed JSON value to modify.
+        path: A path string, parsed JSONPath or compiled QueryPlan.
+        function: Maps an old value to its replacement.
+        index: Index of ``document`` to bring up to date, if any.
+
+    Returns:
+        The document: ``document`` itself, or the updated root if the
+        path selects it.
+
+    """
+    return _assign(document, path, function, index)
+
+
+def delete_values(
+    document: Any,
+    path: PathLike,
+    *,
+    index: DocumentIndex | None = None,
+) -> Any:
+    """Remove every value ``path`` selects from its object or array, in place.
+
+    Array items are removed from the highest index down, so slices, index
+    lists and filters delete exactly the items they selected.
+
+    Args:
+        document: Parsed JSON value to modify.
+        path: A path string, parsed JSONPath or compiled QueryPlan.
+        index: Index of ``document`` to bring up to date, if any.
+
+    Returns:
+        ``document``.
+
+    Raises:
+        ValueError: If the path selects the root, which has no container
+            to be removed from. Nothing is removed in that case.
+
+    """
+    removals: dict[int, tuple[Any, list[Any]]] = {}
+    for location in _targets(document, path):
+        parent = location.parent
+        if parent is None:
+            msg = "Cannot delete the document root"
+            raise ValueError(msg)
+        removals.setdefault(id(parent.value), (parent.value, []))[1].append(
+            location.key
+        )
+    for container, keys in removals.values():
+        if isinstance(container, list):
+            keys.sort(reverse=True)
+        for key in keys:
+            del container[key]
+    _reindex(index, [container for container, _keys in removals.values()])
+    return document
@@ -0,0 +1,168 @@
+from __future__ import annotations
+
+from collections.abc import Iterable
+from typing import Any
+
+from .parsed_dataclasses import (
+    BracketSelector,
+    Comparison,
+    ExistenceTest,
+    Field,
+    FieldChain,
+    FilterQuery,
+    FilterSelector,
+    Index,
+    IndexList,
+    JSONPath,
+    LogicalAnd,
+    LogicalNot,
+    LogicalOr,
+    Name,
+    RecursiveSelector,
+    Slice,
+    WildcardIndex,
+)
+
+_WILDCARD = Field(name="*", wildcard=True)
+
+
+def _slice(selector: Slice) -> Slice:
+    # ``[0:]``, ``[::1]`` and ``[0::1]`` all mean ``[:]``; the canonical
+    # form lets the compiled step hand back the array without copying it.
+    step = None if selector.step == 1 else selector.step
+    start = selector.start
+    if start == 0 and (step is None or step > 0):
+        start = None
+    if (start, step) == (selector.start, selector.step):
+        return selector
+    return Slice(start=start, end=selector.end, step=step)
+
+
+def _indices(selector: IndexList) -> Index | IndexList:
+    # Only valid where the caller needs to know whether anything matched,
+    # not how often or in which order.
+    indices = tuple(sorted(set(selector.indices)))
+    if len(indices) == 1:
+        return Index(idx=indices[0])
+    return IndexList(indices=indices)
+
+
+def _selector(selector: Any, *, existence: bool = False) -> Any:  # noqa: PLR0911
+    if isinstance(selector, FilterSelector):
+        return FilterSelector(expression=_expression(selector.expression))
+    if not isinstance(selector, BracketSelector):
+        return selector
+    content = selector.content
+    if isinstance(content, Name):
+        return Field(name=content.name)
+    if isinstance(content, WildcardIndex):
+        return _WILDCARD
+    if isinstance(content, Slice):
+        return BracketSelector(content=_slice(content))
+    if isinstance(content, IndexList) and existence:
+        return BracketSelector(content=_indices(content))
+    if isinstance(content, FilterSelector):
+        return BracketSelector(content=_selector(content))
+    return selector
+
+
+def _segment(segment: Any, *, existence: bool = False) -> Any:
+    if isinstance(segment, RecursiveSelector):
+        if segment.name is None:
+            return RecursiveSelector(name=_WILDCARD)
+        return RecursiveSelector(name=_selector(segment.name, existence=existence))
+    return _selector(segment, existence=existence)
+
+
+def _query(query: FilterQuery, *, existence: bool) -> FilterQuery:
+    # Member names inside filters are normalized but never fused: singular
+    # queries are compiled into operands segment by segment.
+    return FilterQuery(
+        segments=tuple(_segment(s, existence=existence) for s in query.segments),
+        absolute=query.absolute,
+    )
+
+
+def _expression(expression: Any) -> Any:
+    if isinstance(expression, LogicalAnd | LogicalOr):
+        return type(expression)(
+            left=_expression(expression.left), right=_expression(expression.right)
+        )
+    if isinstance(expression, LogicalNot):
+        return LogicalNot(expression=_expression(expression.expression))
+    if isinstance(expression, ExistenceTest):
+        return ExistenceTest(query=_query(expression.query, existence=True))
+    if isinstance(expression, Comparison):
+        return Comparison(
+            left=_expression(expression.left),
+            op=expression.op,
+            right=_expression(expression.right),
+        )
+    if isinstance(expression, FilterQuery):
+        return _query(expression, existence=False)
+    return expression
+
+
+def _fuse(segments: Iterable[Any]) -> tuple[Any, ...]:
+    fused: list[Any] = []
+    names: list[str] = []
+
+    def flush() -> None:
+        if len(names) == 1:
+            fused.append(Field(name=names[0]))
+        elif names:
+            fused.append(FieldChain(names=tuple(names)))
+        names.clear()
+
+    for segment in segments:
+        if isinstance(segment, Field) and not segment.wildcard:
+            names.append(segment.name)
+        elif isinstance(segment, FieldChain):
+            names.extend(segment.names)
+        else:
+            flush()
+            fused.append(segment)
+    flush()
+    return tuple(fused)
+
+
+def optimize(path: JSONPath) -> JSONPath:
+    """Rewrite a parsed path into an equivalent one that is cheaper to run.
+
+    * ``['name']`` becomes ``.name`` and ``[*]`` (and a bare ``..``)
+      becomes ``.*``, so equivalent spellings share one compiled form;
+    * runs of member names such as ``.store.book`` are fused into a single
+      :class:`~json_path_parser.parsed_dataclasses.FieldChain` step;
+    * slices that select the whole array (``[0:]``, ``[::1]``) become
+      ``[:]``;
+    * index lists in filter existence tests, where only whether something
+      matched counts, are deduplicated and sorted, down to a single index
+      where possible.
+
+    Index lists elsewhere keep their duplicates and order, which RFC 9535
+    makes part of the result. The optimized path selects the same values
+    in the same order, and optimizing it again returns it unchanged.
+
+    Args:
+        path: The parsed path; it is not modified.
+
+    Returns:
+        The optimized path.
+
+    """
+    return JSONPath(segments=_fuse(map(_segment, path.segments)))
+
+
+def expand(segments: Iterable[Any]) -> tuple[Any, ...]:
+    """Split every :class:`FieldChain` in ``segments`` back into fields.
+
+    For consumers that need one segment per nesting level, such as the
+    streaming matcher and the code generator.
+    """
+    expanded: list[Any] = []
+    for segment in segments:
+        if isinstance(segment, FieldChain):
+            expanded.extend(Field(name=name) for name in segment.names)
+        else:
+            expanded.append(segment)
+    return tuple(expanded)
@@ -1,7 +1,27 @@
+from __future__ import annotations
+
+import sys
 from dataclasses import dataclass
+from typing import Any
+
+# AST nodes are frozen, slotted dataclasses: immutable, hashable and
+# compared by value, so parsed paths can be dict keys, be shared between
+# threads and be held by the hundred thousand. Sequences are stored as
+# tuples (lists given to a constructor are converted) and member names are
+# interned, so every path naming the same member shares one string.
+
+
+def _freeze(node: Any, field: str) -> None:
+    value = getattr(node, field)
+    if not isinstance(value, tuple):
+        object.__setattr__(node, field, tuple(value))
+
+
+def _intern(node: Any) -> None:
+    object.__setattr__(node, "name", sys.intern(node.name))
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class JSONPath:
     """Represents a complete JSONPath expression.
 
@@ -9,10 +29,13 @@ class JSONPath:
     through a JSON structure.
     """
 
-    segments: list[any]
+    segments: tuple[Any, ...]
 
+    def __post_init__(self) -> None:
+        _freeze(self, "segments")
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class Index:
     """Represents an array index selector.
 
@@ -22,7 +45,7 @@ class Index:
     idx: int
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Slice:
     """Represents a slice selector for arrays.
 
@@ -35,7 +58,7 @@ class Slice:
     step: int | None
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class Field:
     """Represents a field selector for objects.
 
@@ -46,8 +69,26 @@ class Field:
     name: str
     wildcard: bool = False
 
+    def __post_init__(self) -> None:
+        _intern(self)
+
+
+@dataclass(frozen=True, slots=True)
+class FieldChain:
+    """Represents consecutive member-name selectors fused into one step.
+
+    Never produced by the parser: the optimizer (see
+    :mod:`json_path_parser.optimizer`) replaces runs of ``.a.b.c`` with a
+    chain so they are looked up in a single step.
+    """
+
+    names: tuple[str, ...]
 
-@dataclass
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "names", tuple(map(sys.intern, self.names)))
+
+
+@dataclass(frozen=True, slots=True)
 class Name:
     """Represents a name token.
 
@@ -56,8 +97,11 @@ class Name:
 
     name: str
 
+    def __post_init__(self) -> None:
+        _intern(self)
+
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class WildcardIndex:
     """Represents a wildcard index selector.
 
@@ -65,7 +109,7 @@ class WildcardIndex:
     """
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class IndexList:
     """Represents a list of specific indices.
 
@@ -73,10 +117,13 @@ class IndexList:
     numeric indices.
     """
 
-    indices: list[int]
+    indices: tuple[int, ...]
 
+    def __post_init__(self) -> None:
+        _freeze(self, "indices")
 
-@dataclass
+
+@dataclass(frozen=True, slots=True)
 class BracketSelector:
     """Represents a bracket notation selector.
 
@@ -84,10 +131,10 @@ class BracketSelector:
     square brackets in JSONPath expressions.
     """
 
-    content: Index | Slice | WildcardIndex | IndexList | Name
+    content: Index | Slice | WildcardIndex | IndexList | Name | FilterSelector
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class RecursiveSelector:
     """Represents a recursive descent selector.
 
@@ -98,6 +145,108 @@ class RecursiveSelector:
     name: Field | BracketSelector | None  # Can be None for cases like '..'
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
+class FilterQuery:
+    """Represents a query embedded in a filter expression.
+
+    Relative queries start at the current node (``@``), absolute queries
+    at the document root (``$``).
+    """
+
+    segments: tuple[Any, ...]
+    absolute: bool = False
+
+    def __post_init__(self) -> None:
+        _freeze(self, "segments")
+
+    @property
+    def singular(self) -> bool:
+        """Whether the query can select at most one node.
+
+        Singular queries use only name and index selectors; RFC 9535 only
+        allows them as comparison operands.
+        """
+        for segment in self.segments:
+            selector = (
+                segment.content if isinstance(segment, BracketSelector) else segment
+            )
+            if isinstance(selector, Field) and not selector.wildcard:
+                continue
+            if isinstance(selector, Name | Index):
+                continue
+            return False
+        return True
+
+
+@dataclass(frozen=True, slots=True, eq=False)
+class Literal:
+    """Represents a JSON literal (number, string, true, false or null).
+
+    Literals of different types are never equal, so ``true`` and ``1``
+    (equal in Python) remain distinct cache keys.
+    """
+
+    value: Any
+
+    def __eq__(self, other: object) -> bool:
+        return (
+            isinstance(other, Literal)
+            and type(self.value) is type(other.value)
+            and self.value == other.value
+        )
+
+    def __hash__(self) -> int:
+        return hash((type(self.value), self.value))
+
+
+@dataclass(frozen=True, slots=True)
+class Comparison:
+    """Represents a comparison between two literals or singular queries."""
+
+    left: FilterQuery | Literal
+    op: str
+    right: FilterQuery | Literal
+
+
+@dataclass(frozen=True, slots=True)
+class ExistenceTest:
+    """Represents a test that a filter query selects at least one node."""
+
+    query: FilterQuery
+
+
+@dataclass(frozen=True, slots=True)
+class LogicalAnd:
+    """Represents the conjunction ``left && right``."""
+
+    left: Any
+    right: Any
+
+
+@dataclass(frozen=True, slots=True)
+class LogicalOr:
+    """Represents the disjunction ``left || right``."""
+
+    left: Any
+    right: Any
+
+
+@dataclass(frozen=True, slots=True)
+class LogicalNot:
+    """Represents the negation ``!expression``."""
+
+    expression: Any
+
+
+FilterExpression = Comparison | ExistenceTest | LogicalAnd | LogicalOr | LogicalNot
+
+
+@dataclass(frozen=True, slots=True)
 class FilterSelector:
-    expression: str  # Placeholder for filter expression representation
+    """Represents a filter selector.
+
+    Selects the children of an object or array for which the filter
+    expression, written ``[?expression]``, evaluates to true.
+    """
+
+    expression: FilterExpression
@@ -1,51 +1,173 @@
+from __future__ import annotations
+
+import hashlib
+from pathlib import Path
+
+import lark
 from lark import Lark
 
+from .logger import logger
+
+JSONPATH_GRAMMAR = r"""
+    ?start: root
+
+    root : "$" segment*
+
+    ?segment: dot_selector
+            | bracket_selector
+            | recursive_selector
+
+    dot_selector: "." (CNAME | WILDCARD)          -> field
+
+    bracket_selector: "[" bracketed_content "]"
+
+    ?bracketed_content: integer                   -> index
+                    | slice
+                    | WILDCARD                    -> wildcard_index
+                    | integer ("," integer)+      -> index_list
+                    | string                      -> name
+                    | "?" logical_expr            -> filter
+
+    recursive_selector: ".." (CNAME | WILDCARD | bracket_selector)?
+
+    slice: [integer] ":" [integer] [":" [integer]]
+
+    ?logical_expr: logical_and
+                 | logical_expr "||" logical_and  -> or_expr
+
+    ?logical_and: basic_expr
+                | logical_and "&&" basic_expr    -> and_expr
+
+    ?basic_expr: paren_expr
+               | "!" paren_expr                  -> not_expr
+               | test_expr
+               | "!" test_expr                   -> not_expr
+               | comparison
+
+    ?paren_expr: "(" logical_expr ")"
+    test_expr: filter_query
+    comparison: comparable COMP_OP comparable
+
+    ?comparable: literal
+               | filter_query
+
+    ?filter_query: "@" segment*                  -> relative_query
+                 | "$" segment*                  -> absolute_query
+
+    ?literal: SIGNED_NUMBER                      -> number
+            | string                             -> string_literal
+            | "true"                             -> true
+            | "false"                            -> false
+            | "null"                             -> null
+
+    ?string : ESCAPED_STRING | SINGLE_QUOTED_STRING
+    ?integer : SIGNED_INT
 
-def create_parser() -> Lark:
+    WILDCARD : "*"
+    COMP_OP : "==" | "!=" | "<=" | ">=" | "<" | ">"
+    // Only JSON escapes and no raw control characters, so every string
+    // the lexer accepts can be decoded; single quotes may also escape '.
+    ESCAPED_STRING : /"([^"\\\x00-\x1f]|\\(["\\\/bfnrt]|u[0-9a-fA-F]{4}))*"/
+    SINGLE_QUOTED_STRING : /'([^'\\\x00-\x1f]|\\(['"\\\/bfnrt]|u[0-9a-fA-F]{4}))*'/
+
+    %import common.SIGNED_INT
+    %import common.SIGNED_NUMBER
+    %import common.CNAME
+    %import common.WS
+    %ignore WS
+"""
+
+PARSER_BACKENDS = ("lalr", "earley")
+
+
+def create_parser(parser: str = "lalr", *, cache: bool | str = False) -> Lark:
     """Create and return a JSON parser using Lark.
 
-    This parser is designed to parse JSONPath expressions.
+    This parser is designed to parse JSONPath expressions. The grammar is
+    unambiguous, so the deterministic LALR(1) backend is used by default;
+    Earley is kept as a fallback and produces identical trees.
+
+    Args:
+        parser: Lark parsing algorithm, either ``"lalr"`` or ``"earley"``.
+        cache: Forwarded to Lark (LALR only). ``True`` caches the built
+            parser table in the temp directory, a string names the cache
+            file, so later constructions skip grammar compilation.
 
     Returns:
         Lark: A Lark parser instance configured for JSONPath.
 
+    Raises:
+        ValueError: If ``parser`` is not a supported backend.
+
     """
-    grammar = r"""
-        ?start: root
+    if parser not in PARSER_BACKENDS:
+        msg = f"Unknown parser backend {parser!r}, expected one of {PARSER_BACKENDS}"
+        raise ValueError(msg)
+    if parser == "earley":
+        return Lark(JSONPATH_GRAMMAR, start="root", parser="earley")
+    return Lark(JSONPATH_GRAMMAR, start="root", parser="lalr", cache=cache)
+
 
-        root : "$" segment*
+def _fingerprint() -> bytes:
+    """Identify the grammar and Lark version a parser table was built from."""
+    text = f"{lark.__version__}\n{JSONPATH_GRAMMAR}"
+    return hashlib.sha256(text.encode()).hexdigest().encode() + b"\n"
 
-        ?segment: dot_selector
-                | bracket_selector
-                | recursive_selector
 
-        dot_selector: "." (CNAME | "*")          -> field
+def save_parser(parser: Lark, path: str | Path) -> None:
+    """Serialize a prebuilt LALR parser table to ``path``.
 
-        bracket_selector: "[" bracketed_content "]"
+    The file can be shipped alongside an application and loaded with
+    :func:`load_parser`, which avoids compiling the grammar at startup.
 
-        ?bracketed_content: integer                   -> index
-                        | slice
-                        | "*"                         -> wildcard_index
-                        | int_index_list              -> index_list
-                        | string                      -> name
+    Args:
+        parser: A parser returned by ``create_parser(parser="lalr")``.
+        path: Destination file.
+
+    """
+    with Path(path).open("wb") as f:
+        f.write(_fingerprint())
+        parser.save(f)
 
-        recursive_selector: ".." (CNAME | "*" | bracket_selector)?
 
-        ?slice: integer? ":" integer? (":" integer?)?
-        int_index_list: integer ("," integer)*
+def load_parser(path: str | Path) -> Lark:
+    """Load a parser previously written by :func:`save_parser`.
 
-        string : ESCAPED_STRING | SINGLE_QUOTED_STRING
-        ?integer : SIGNED_INT
+    Args:
+        path: File produced by :func:`save_parser`.
 
+    Returns:
+        Lark: The deserialized LALR parser.
 
-        SINGLE_QUOTED_STRING : /'([^'\\]*(\\.[^'\\]*)*)'/
+    Raises:
+        ValueError: If the table was built from another grammar or Lark
+            version.
 
-        %import common.SIGNED_INT
-        %import common.ESCAPED_STRING
-        %import common.CNAME
-        %import common.SIGNED_NUMBER
-        %import common.WS
-        %ignore WS
     """
+    with Path(path).open("rb") as f:
+        if f.readline() != _fingerprint():
+            msg = f"{path} was built for another grammar or Lark version"
+            raise ValueError(msg)
+        return Lark.load(f)
+
+
+# Regenerate after changing the grammar or upgrading Lark with
+# ``save_parser(create_parser(), PARSER_TABLE)``.
+PARSER_TABLE = Path(__file__).with_name("jsonpath.lalr")
+
+
+def default_parser() -> Lark:
+    """Return the LALR parser from the table shipped with the package.
 
-    return Lark(grammar, start="root", parser="earley")
+    Falls back to building the grammar if the table is missing, stale or
+    unreadable.
+
+    Returns:
+        Lark: A parser equivalent to ``create_parser()``.
+
+    """
+    try:
+        return load_parser(PARSER_TABLE)
+    except Exception:  # noqa: BLE001
+        logger.debug("Cannot load %s, building the parser", PARSER_TABLE, exc_info=True)
+        return create_parser()
@@ -0,0 +1,243 @@
+from __future__ import annotations
+
+import copy
+from collections.abc import Callable, Iterable, Mapping
+from typing import Any
+
+from .filters import json_equal
+
+Keys = tuple[str | int, ...]
+"""Member names and array indices leading from the root to a node."""
+
+_APPEND = "-"
+"""The array index token that adds after the last element."""
+
+_MEMBERS = {
+    "add": ("value",),
+    "remove": (),
+    "replace": ("value",),
+    "move": ("from",),
+    "copy": ("from",),
+    "test": ("value",),
+}
+"""Members each operation requires besides ``op`` and ``path``."""
+
+
+def parse_pointer(pointer: str) -> tuple[str, ...]:
+    """Split an RFC 6901 JSON Pointer into unescaped reference tokens.
+
+    Raises:
+        ValueError: If the pointer is neither empty nor starts with ``/``.
+
+    """
+    if not pointer:
+        return ()
+    if not pointer.startswith("/"):
+        msg = f"Invalid JSON Pointer {pointer!r}: must start with '/'"
+        raise ValueError(msg)
+    return tuple(
+        token.replace("~1", "/").replace("~0", "~") for token in pointer[1:].split("/")
+    )
+
+
+def _child_key(container: Any, token: str, *, insert: bool = False) -> str | int:
+    if isinstance(container, dict):
+        if not insert and token not in container:
+            msg = f"Member {token!r} not found"
+            raise ValueError(msg)
+        return token
+    if not isinstance(container, list):
+        msg = f"Cannot address {token!r} inside a {type(container).__name__}"
+        raise TypeError(msg)
+    if insert and token == _APPEND:
+        return len(container)
+    if not (token.isascii() and token.isdigit()) or (
+        len(token) > 1 and token[0] == "0"
+    ):
+        msg = f"Invalid array index {token!r}"
+        raise ValueError(msg)
+    idx = int(token)
+    if idx > len(container) or (idx == len(container) and not insert):
+        msg = f"Array index {idx} out of range"
+        raise ValueError(msg)
+    return idx
+
+
+def _check(operation: Mapping[str, Any]) -> str:
+    """Return the name of ``operation`` once it has every member it needs."""
+    op = operation.get("op")
+    if "path" not in operation:
+        msg = f"JSON Patch operation {op!r} has no 'path'"
+        raise ValueError(msg)
+    if op not in _MEMBERS:
+        msg = f"Unknown JSON Patch operation {op!r}"
+        raise ValueError(msg)
+    for member in _MEMBERS[op]:
+        if member not in operation:
+            msg = f"JSON Patch operation {op!r} has no {member!r}"
+            raise ValueError(msg)
+    return op
+
+
+class Patcher:
+    """Applies operations, logging how to undo each change and what it touched.
+
+    An insertion or removal in an array changes its length, and with it
+    what negative indices and slices select, so it touches the whole array.
+
+    Attributes:
+        document: The patched document, which is a new object if an
+            operation replaced the root.
+        touched: The locations each applied operation changed, in order.
+
+    """
+
+    def __init__(self, document: Any) -> None:
+        """Prepare to patch ``document`` in place."""
+        self.document = document
+        self.touched: list[Keys] = []
+        self._undo: list[Callable[[], None]] = []
+
+    def apply(self, operations: Iterable[Mapping[str, Any]]) -> None:
+        """Apply ``operations`` in order, undoing them all if one fails.
+
+        Raises:
+            ValueError: If an operation is malformed, addresses a missing
+                location or an invalid array index, or a ``test`` fails.
+            TypeError: If an operation addresses a child of a scalar.
+
+        """
+        try:
+            for operation in operations:
+                self._apply(operation)
+        except Exception:
+            for undo in reversed(self._undo):
+                undo()
+            raise
+
+    def _apply(self, operation: Mapping[str, Any]) -> None:
+        op = _check(operation)
+        path = parse_pointer(operation["path"])
+        if op == "add":
+            self._add(path, operation["value"])
+        elif op == "remove":
+            self._remove(path)
+        elif op == "replace":
+            self._replace(path, operation["value"])
+        elif op == "copy":
+            source = parse_pointer(operation["from"])
+            self._add(path, copy.deepcopy(self._get(source)))
+        elif op == "move":
+            self._move(parse_pointer(operation["from"]), path)
+        elif not json_equal(self._get(path), operation["value"]):
+            msg = f"Test failed at {operation['path']!r}"
+            raise ValueError(msg)
+
+    def _resolve(self, tokens: tuple[str, ...]) -> tuple[Any, Keys]:
+        value = self.document
+        keys = []
+        for token in tokens:
+            key = _child_key(value, token)
+            value = value[key]
+            keys.append(key)
+        return value, tuple(keys)
+
+    def _get(self, tokens: tuple[str, ...]) -> Any:
+        return self._resolve(tokens)[0]
+
+    def _move(self, source: tuple[str, ...], tokens: tuple[str, ...]) -> None:
+        if source == tokens:
+            return
+        if tokens[: len(source)] == source:
+            msg = "Cannot move a value into one of its own children"
+            raise ValueError(msg)
+        value = self._get(source)
+        self._remove(source)
+        self._add(tokens, value)
+
+    def _set_root(self, value: Any) -> None:
+        old = self.document
+        self.document = value
+        self._undo.append(lambda: setattr(self, "document", old))
+        self.touched.append(())
+
+    def _add(self, tokens: tuple[str, ...], value: Any) -> None:
+        if not tokens:
+            self._set_root(value)
+            return
+        parent, keys = self._resolve(tokens[:-1])
+        key = _child_key(parent, tokens[-1], insert=True)
+        if isinstance(parent, list):
+            parent.insert(key, value)
+            self._undo.append(lambda: parent.pop(key))
+            self.touched.append(keys)
+            return
+        if key in parent:
+            old = parent[key]
+            self._undo.append(lambda: parent.__setitem__(key, old))
+        else:
+            self._undo.append(lambda: parent.pop(key))
+        parent[key] = value
+        self.touched.append((*keys, key))
+
+    def _remove(self, tokens: tuple[str, ...]) -> None:
+        if not tokens:
+            msg = "Cannot remove the document root"
+            raise ValueError(msg)
+        parent, keys = self._resolve(tokens[:-1])
+        key = _child_key(parent, tokens[-1])
+        if isinstance(parent, list):
+            value = parent.pop(key)
+            self._undo.append(lambda: parent.insert(key, value))
+            self.touched.append(keys)
+            return
+        order = list(parent)
+        value = parent.pop(key)
+
+        def undo() -> None:
+            # Put the member back in its place, not at the end.
+            parent[key] = value
+            for later in order[order.index(key) + 1 :]:
+                parent[later] = parent.pop(later)
+
+        self._undo.append(undo)
+        self.touched.append((*keys, key))
+
+    def _replace(self, tokens: tuple[str, ...], value: Any) -> None:
+        if not tokens:
+            self._set_root(value)
+            return
+        parent, keys = self._resolve(tokens[:-1])
+        key = _child_key(parent, tokens[-1])
+        old = parent[key]
+        parent[key] = value
+        self._undo.append(lambda: parent.__setitem__(key, old))
+        self.touched.append((*keys, key))
+
+
+def apply_patch(document: Any, operations: Iterable[Mapping[str, Any]]) -> Any:
+    """Apply an RFC 6902 JSON Patch to ``document`` in place.
+
+    Supports ``add``, ``remove``, ``replace``, ``move``, ``copy`` and
+    ``test``. Values are stored as given, except that ``copy`` copies.
+    The patch is atomic: if any operation fails, the changes already
+    made are undone before the error is raised.
+
+    Args:
+        document: Parsed JSON value to modify.
+        operations: Operation objects, e.g.
+            ``{"op": "replace", "path": "/a/0", "value": 1}``.
+
+    Returns:
+        The patched document: ``document`` itself unless an operation
+        replaced the root.
+
+    Raises:
+        ValueError: If an operation is malformed, addresses a missing
+            location or an invalid array index, or a ``test`` fails.
+        TypeError: If an operation addresses a child of a scalar.
+
+    """
+    patcher = Patcher(document)
+    patcher.apply(operations)
+    return patcher.document
@@ -0,0 +1,429 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Iterator
+from dataclasses import dataclass
+from functools import cached_property
+from itertools import chain, repeat
+from time import perf_counter
+from typing import TYPE_CHECKING, Any
+
+from . import metrics, optimizer
+from .parsed_dataclasses import (
+    BracketSelector,
+    Field,
+    FieldChain,
+    FilterSelector,
+    Index,
+    IndexList,
+    JSONPath,
+    Name,
+    RecursiveSelector,
+    Slice,
+    WildcardIndex,
+)
+
+if TYPE_CHECKING:
+    from .locations import LocatedStep, Location
+
+Step = Callable[[Any, Any], Iterable[Any]]
+"""A compiled segment: maps one input value and the document root to the
+values it selects. The root is only consulted by filters with ``$`` queries."""
+
+
+def _select_field(name: str) -> Step:
+    def step(value: Any, _root: Any) -> Iterable[Any]:
+        if isinstance(value, dict) and name in value:
+            return [value[name]]
+        return []
+
+    return step
+
+
+def _select_chain(names: tuple[str, ...]) -> Step:
+    def step(value: Any, _root: Any) -> Iterable[Any]:
+        for name in names:
+            if not isinstance(value, dict) or name not in value:
+                return []
+            value = value[name]
+        return [value]
+
+    return step
+
+
+def _select_all(value: Any, _root: Any) -> Iterable[Any]:
+    if isinstance(value, list):
+        return value
+    if isinstance(value, dict):
+        return value.values()
+    return ()
+
+
+def _select_index(idx: int) -> Step:
+    def step(value: Any, _root: Any) -> Iterable[Any]:
+        if isinstance(value, list) and -len(value) <= idx < len(value):
+            return [value[idx]]
+        return []
+
+    return step
+
+
+def _select_indices(indices: tuple[int, ...]) -> Step:
+    def step(value: Any, _root: Any) -> Iterable[Any]:
+        if not isinstance(value, list):
+            return []
+        length = len(value)
+        return [value[idx] for idx in indices if -length <= idx < length]
+
+    return step
+
+
+_FULL_SLICE = Slice(start=None, end=None, step=None)
+
+
+def _select_items(value: Any, _root: Any) -> Iterable[Any]:
+    return value if isinstance(value, list) else ()
+
+
+def _select_slice(slice_obj: Slice) -> Step:
+    if slice_obj.step == 0:
+        # RFC 9535: a zero step selects nothing (Python would raise).
+        return lambda _value, _root: []
+    if slice_obj == _FULL_SLICE:
+        return _select_items
+    py_slice = slice(slice_obj.start, slice_obj.end, slice_obj.step)
+
+    def step(value: Any, _root: Any) -> Iterable[Any]:
+        if isinstance(value, list):
+            return value[py_slice]
+        return []
+
+    return step
+
+
+def iter_containers(value: Any) -> Iterator[Any]:
+    """Yield ``value`` and every object or array nested in it, in document order.
+
+    The walk keeps an explicit stack of child iterators instead of
+    recursing, so arbitrarily deep documents never hit the interpreter's
+    recursion limit, and each node is visited exactly once.
+    """
+    if isinstance(value, dict):
+        stack = [iter(value.values())]
+    elif isinstance(value, list):
+        stack = [iter(value)]
+    else:
+        return
+    yield value
+    while stack:
+        for child in stack[-1]:
+            if isinstance(child, dict):
+                yield child
+                stack.append(iter(child.values()))
+                break
+            if isinstance(child, list):
+                yield child
+                stack.append(iter(child))
+                break
+        else:
+            stack.pop()
+
+
+def _select_recursive(segment: RecursiveSelector) -> Step:
+    # ``..name`` applies the child selector to every descendant-or-self
+    # container; a bare ``..`` behaves like ``..*``.
+    inner = _select_all if segment.name is None else compile_segment(segment.name)
+
+    def step(value: Any, root: Any) -> Iterable[Any]:
+        return chain.from_iterable(map(inner, iter_containers(value), repeat(root)))
+
+    return step
+
+
+def _select_filter(segment: FilterSelector) -> Step:
+    from .filters import compile_filter
+
+    predicate = compile_filter(segment.expression)
+
+    def step(value: Any, root: Any) -> Iterable[Any]:
+        if isinstance(value, list):
+            children = value
+        elif isinstance(value, dict):
+            children = value.values()
+        else:
+            return ()
+        return (child for child in children if predicate(child, root))
+
+    return step
+
+
+def evaluate_steps(
+    steps: tuple[Step, ...], value: Any, root: Any, visits: list[int] | None = None
+) -> list[Any]:
+    """Apply ``steps`` in sequence starting from ``value``.
+
+    Args:
+        steps: The steps to apply.
+        value: The value the first step is applied to.
+        root: The document root, for filters with ``$`` queries.
+        visits: If given, ``visits[0]`` is increased by the number of
+            values passed to each step.
+
+    Returns:
+        The values the last step selected.
+
+    """
+    selection = [value]
+    for step in steps:
+        if visits is not None:
+            visits[0] += len(selection)
+        next_selection = []
+        for item in selection:
+            next_selection.extend(step(item, root))
+        selection = next_selection
+    return selection
+
+
+def _counted(values: Iterable[Any], visits: list[int]) -> Iterator[Any]:
+    for value in values:
+        visits[0] += 1
+        yield value
+
+
+def iterate_steps(
+    steps: tuple[Step, ...], value: Any, root: Any, visits: list[int] | None = None
+) -> Iterator[Any]:
+    """Lazily apply ``steps`` in sequence starting from ``value``.
+
+    ``visits`` is counted as in :func:`evaluate_steps`, as the values are
+    consumed.
+    """
+    values: Iterable[Any] = (value,)
+    for step in steps:
+        if visits is not None:
+            values = _counted(values, visits)
+        values = chain.from_iterable(map(step, values, repeat(root)))
+    return iter(values)
+
+
+def compile_selector(content: Any) -> Step:
+    """Compile the content of a bracket selector into a step."""
+    if isinstance(content, Index):
+        return _select_index(content.idx)
+    if isinstance(content, Slice):
+        return _select_slice(content)
+    if isinstance(content, WildcardIndex):
+        return _select_all
+    if isinstance(content, IndexList):
+        return _select_indices(content.indices)
+    if isinstance(content, Name):
+        return _select_field(content.name)
+    if isinstance(content, FilterSelector):
+        return _select_filter(content)
+    msg = f"Unsupported bracket selector: {content!r}"
+    raise TypeError(msg)
+
+
+def compile_segment(segment: Any) -> Step:
+    """Compile one JSONPath segment into a step function.
+
+    Dispatch on the segment type happens here, once per segment, rather
+    than once per selected value during evaluation.
+
+    Raises:
+        TypeError: If the segment type is not recognised.
+
+    """
+    if isinstance(segment, Field):
+        return _select_all if segment.wildcard else _select_field(segment.name)
+    if isinstance(segment, FieldChain):
+        return _select_chain(segment.names)
+    if isinstance(segment, BracketSelector):
+        return compile_selector(segment.content)
+    if isinstance(segment, RecursiveSelector):
+        return _select_recursive(segment)
+    if isinstance(segment, FilterSelector):
+        return _select_filter(segment)
+    msg = f"Unsupported segment: {segment!r}"
+    raise TypeError(msg)
+
+
+BACKENDS = ("interpreter", "codegen")
+
+
+@dataclass(frozen=True, eq=False)
+class QueryPlan:
+    """An immutable, reusable evaluation plan for a JSONPath.
+
+    The plan snapshots the segments of the path it was built from and
+    never modifies them, so one plan can be evaluated against any number
+    of documents, from any number of threads.
+
+    With the ``"codegen"`` backend the plan also holds Python functions
+    generated for the path (see :mod:`json_path_parser.codegen`), which
+    :meth:`evaluate` and :meth:`iterate` call instead of interpreting the
+    steps.
+    """
+
+    segments: tuple[Any, ...]
+    steps: tuple[Step, ...]
+    function: Callable[[Any], list[Any]] | None = None
+    iter_function: Callable[[Any], Iterator[Any]] | None = None
+    source: str | None = None
+
+    @classmethod
+    def from_path(
+        cls,
+        path: JSONPath,
+        backend: str = "interpreter",
+        source: str | None = None,
+        *,
+        optimize: bool = True,
+    ) -> QueryPlan:
+        """Build a plan from a parsed JSONPath.
+
+        Args:
+            path: The parsed path; it is not modified.
+            backend: ``"interpreter"`` or ``"codegen"``. Paths nested too
+                deeply for CPython to compile fall back to the interpreter.
+            source: The expression the path was parsed from, used to label
+                the plan's metrics.
+            optimize: Rewrite the path with
+                :func:`~json_path_parser.optimizer.optimize` first. The
+                plan's segments are then the optimized ones.
+
+        Returns:
+            QueryPlan with one compiled step per segment.
+
+        Raises:
+            ValueError: If ``backend`` is not supported.
+
+        """
+        if backend not in BACKENDS:
+            msg = f"Unknown backend {backend!r}, expected one of {BACKENDS}"
+            raise ValueError(msg)
+        if optimize:
+            path = optimizer.optimize(path)
+        segments = tuple(path.segments)
+        steps = tuple(compile_segment(s) for s in segments)
+        function = iter_function = None
+        if backend == "codegen":
+            from .codegen import compile_function
+
+            try:
+                function = compile_function(segments)
+                iter_function = compile_function(segments, generator=True)
+            except (SyntaxError, RecursionError):
+                function = iter_function = None
+        return cls(
+            segments=segments,
+            steps=steps,
+            function=function,
+            iter_function=iter_function,
+            source=source,
+        )
+
+    def evaluate(self, document: Any) -> list[Any]:
+        """Evaluate the plan against ``document``.
+
+        Args:
+            document: Parsed JSON value to query.
+
+        Returns:
+            The selected values, in document order.
+
+        """
+        recorder = metrics.active
+        if recorder is None:
+            if self.function is not None:
+                return self.function(document)
+            return evaluate_steps(self.steps, document, document)
+        start = perf_counter()
+        visits = None
+        if self.function is not None:
+            selection = self.function(document)
+        else:
+            visits = [0]
+            selection = evaluate_steps(self.steps, document, document, visits)
+        recorder.observe_query(
+            self.source,
+            perf_counter() - start,
+            len(selection),
+            None if visits is None else visits[0],
+        )
+        return selection
+
+    def iterate(self, document: Any) -> Iterator[Any]:
+        """Lazily evaluate the plan against ``document``.
+
+        Steps are chained as generators, so each value flows through the
+        whole path before the next one is selected and nothing is
+        computed beyond what the caller consumes.
+
+        Args:
+            document: Parsed JSON value to query.
+
+        Returns:
+            Iterator over the selected values, in document order.
+
+        """
+        recorder = metrics.active
+        if recorder is None:
+            if self.iter_function is not None:
+                return self.iter_function(document)
+            return iterate_steps(self.steps, document, document)
+        visits = None
+        if self.iter_function is not None:
+            values = self.iter_function(document)
+        else:
+            visits = [0]
+            values = iterate_steps(self.steps, document, document, visits)
+        return recorder.observe_iteration(self.source, values, visits)
+
+    @cached_property
+    def located_steps(self) -> tuple[LocatedStep, ...]:
+        """The steps compiled to track locations, built on first use."""
+        from .locations import compile_located
+
+        return tuple(compile_located(segment) for segment in self.segments)
+
+    def locate(self, document: Any) -> list[Location]:
+        """Evaluate the plan and return where each match was found.
+
+        Slower than :meth:`evaluate` by one tuple per selected value and
+        step plus one :class:`~json_path_parser.locations.Location` per
+        match, and never answered from a document index or generated code.
+
+        Args:
+            document: Parsed JSON value to query.
+
+        Returns:
+            One :class:`~json_path_parser.locations.Location` per selected
+            value, in the order :meth:`evaluate` returns the values.
+
+        """
+        from .locations import Location
+
+        recorder = metrics.active
+        start = perf_counter()
+        visits = None if recorder is None else [0]
+        selection = evaluate_steps(
+            self.located_steps, (None, None, document), document, visits
+        )
+        if recorder is not None:
+            recorder.observe_query(
+                self.source, perf_counter() - start, len(selection), visits[0]
+            )
+        return list(map(Location, selection))
+
+    def iter_locate(self, document: Any) -> Iterator[Location]:
+        """Lazily yield the locations :meth:`locate` returns."""
+        from .locations import Location
+
+        recorder = metrics.active
+        visits = None if recorder is None else [0]
+        nodes = iterate_steps(
+            self.located_steps, (None, None, document), document, visits
+        )
+        if recorder is not None:
+            nodes = recorder.observe_iteration(self.source, nodes, visits)
+        return map(Location, nodes)
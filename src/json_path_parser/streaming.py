@@ -0,0 +1,622 @@
+from __future__ import annotations
+
+import codecs
+import json
+import os
+import re
+from collections.abc import Callable, Iterator
+from itertools import pairwise
+from typing import IO, Any, ClassVar, NoReturn
+
+from .evaluator import PathLike, as_plan
+from .optimizer import expand
+from .parsed_dataclasses import (
+    BracketSelector,
+    Comparison,
+    ExistenceTest,
+    Field,
+    FieldChain,
+    FilterQuery,
+    FilterSelector,
+    Index,
+    IndexList,
+    JSONPath,
+    LogicalAnd,
+    LogicalNot,
+    LogicalOr,
+    Name,
+    RecursiveSelector,
+    Slice,
+    WildcardIndex,
+)
+from .plan import QueryPlan, iterate_steps
+
+DEFAULT_CHUNK_SIZE = 1 << 16
+
+_WHITESPACE = re.compile(r"[ \t\n\r]*")
+_STRING = re.compile(r'"([^"\\]*(?:\\.[^"\\]*)*)"', re.DOTALL)
+_NUMBER = re.compile(r"-?(?:0|[1-9][0-9]*)(?:\.[0-9]+)?(?:[eE][+-]?[0-9]+)?")
+_NUMBER_CHARS = re.compile(r"[-+.eE0-9]*")
+_SKIPPABLE = re.compile(r'[^"\[\]{}]+')
+_LITERALS = {"t": ("true", True), "f": ("false", False), "n": ("null", None)}
+
+# Parser expectations.
+_VALUE, _VALUE_OR_END, _KEY, _KEY_OR_END, _COLON, _COMMA_OR_END, _DONE = range(7)
+
+# How a path state treats the children of the node it is at.
+_EXACT, _FILTER, _FALLBACK = range(3)
+
+Pending = Callable[[Any], Any]
+
+
+def _match_any(_key: Any, _is_index: bool) -> bool:  # noqa: FBT001
+    return True
+
+
+def _exact_matcher(  # noqa: PLR0911
+    selector: Any,
+) -> Callable[[Any, bool], bool] | None:
+    """Return a ``(key, is_index) -> bool`` test for ``selector``.
+
+    Returns None if the selector cannot be decided from the key alone in
+    document order.
+    """
+    if isinstance(selector, Field) and selector.wildcard:
+        return _match_any
+    if isinstance(selector, Field | Name):
+        name = selector.name
+        return lambda key, is_index: not is_index and key == name
+    if isinstance(selector, WildcardIndex):
+        return _match_any
+    if isinstance(selector, Index) and selector.idx >= 0:
+        idx = selector.idx
+        return lambda key, is_index: is_index and key == idx
+    if isinstance(selector, IndexList):
+        indices = selector.indices
+        ascending = all(a < b for a, b in pairwise(indices))
+        if indices[0] >= 0 and ascending:
+            wanted = frozenset(indices)
+            return lambda key, is_index: is_index and key in wanted
+        return None
+    if isinstance(selector, Slice):
+        start, end, step = selector.start or 0, selector.end, selector.step or 1
+        if start < 0 or (end is not None and end < 0) or step < 0:
+            return None
+        if step == 0:
+            return lambda _key, _is_index: False
+        return lambda key, is_index: (
+            is_index
+            and key >= start
+            and (end is None or key < end)
+            and (key - start) % step == 0
+        )
+    return None
+
+
+def _expression_uses_root(expression: Any) -> bool:
+    if isinstance(expression, FilterQuery):
+        return expression.absolute or segments_use_root(expression.segments)
+    if isinstance(expression, Comparison):
+        return _expression_uses_root(expression.left) or _expression_uses_root(
+            expression.right
+        )
+    if isinstance(expression, ExistenceTest):
+        return _expression_uses_root(expression.query)
+    if isinstance(expression, LogicalAnd | LogicalOr):
+        return _expression_uses_root(expression.left) or _expression_uses_root(
+            expression.right
+        )
+    if isinstance(expression, LogicalNot):
+        return _expression_uses_root(expression.expression)
+    return False
+
+
+def segments_use_root(segments: Any) -> bool:
+    """Whether a filter in ``segments`` queries the document root ``$``.
+
+    Such a filter may decide differently after any change to the
+    document, not just changes below the node it tests.
+    """
+    for segment in segments:
+        selector = segment
+        if isinstance(selector, RecursiveSelector):
+            selector = selector.name
+        if isinstance(selector, BracketSelector):
+            selector = selector.content
+        if isinstance(selector, FilterSelector) and _expression_uses_root(
+            selector.expression
+        ):
+            return True
+    return False
+
+
+class _Frame:
+    """An open object or array on the parser stack."""
+
+    __slots__ = ("container", "index", "is_object", "key", "pending", "slot", "states")
+
+    def __init__(
+        self,
+        is_object: bool,  # noqa: FBT001
+        states: tuple[int, ...],
+        container: dict[str, Any] | list[Any] | None,
+        pending: list[tuple[int, Pending]],
+        slot: Any,
+    ) -> None:
+        self.is_object = is_object
+        self.states = states
+        self.container = container
+        self.pending = pending
+        self.slot = slot
+        self.key: str | None = None
+        self.index = 0
+
+
+class StreamingQuery:
+    """Incrementally evaluate a JSONPath over a JSON text fed in chunks.
+
+    The input is tokenized as it arrives and the path is matched against
+    the location of each value while scanning. Python objects are built
+    only for matched values (or for the candidates a filter has to look
+    at); every other subtree is skipped without decoding its strings or
+    numbers, so memory use follows the size of the matches rather than the
+    size of the document.
+
+    Name, wildcard, non-negative index, ascending index-list and forward
+    slice selectors, recursive descent and filters are matched while
+    streaming. Selectors that depend on an array's length or on reverse
+    order (negative indices, negative steps) make the parser materialize
+    only the node they apply to and finish the path in memory.
+
+    Matches are produced in document order, and each node is produced at
+    most once, which can differ from the in-memory evaluator's ordering
+    for recursive paths whose matches nest. Filters referring to the
+    document root (``$``) are not supported.
+    """
+
+    def __init__(self, path: PathLike) -> None:
+        """Prepare a streaming evaluation of ``path``.
+
+        Raises:
+            ValueError: If a filter in the path refers to the root ``$``.
+
+        """
+        plan = as_plan(path)
+        if any(isinstance(segment, FieldChain) for segment in plan.segments):
+            # States advance one nesting level at a time.
+            plan = QueryPlan.from_path(
+                JSONPath(segments=expand(plan.segments)), optimize=False
+            )
+        if segments_use_root(plan.segments):
+            msg = "Streaming evaluation does not support '$' queries inside filters"
+            raise ValueError(msg)
+        self._final = len(plan.segments)
+        self._transitions = tuple(
+            self._transition(plan, i) for i in range(len(plan.segments))
+        )
+        self._decoder = codecs.getincrementaldecoder("utf-8")()
+        self._buffer = ""
+        self._offset = 0
+        self._stack: list[_Frame] = []
+        self._expect = _VALUE
+        self._skip_depth = 0
+        self._next_seq = 0
+        self._emit_seq = 0
+        self._completed: dict[int, Any] = {}
+        self._output: list[Any] = []
+
+    @staticmethod
+    def _transition(plan: Any, i: int) -> tuple[bool, int, Any]:
+        """Describe how state ``i`` (``i`` segments matched) advances."""
+        from .filters import compile_filter
+
+        segment = plan.segments[i]
+        recursive = isinstance(segment, RecursiveSelector)
+        selector = segment
+        if recursive:
+            selector = (
+                segment.name
+                if segment.name is not None
+                else Field(name="*", wildcard=True)
+            )
+        if isinstance(selector, BracketSelector):
+            selector = selector.content
+
+        if isinstance(selector, FilterSelector):
+            predicate = compile_filter(selector.expression)
+            rest = plan.steps[i + 1 :]
+
+            def filter_then(value: Any) -> Any:
+                if predicate(value, None):
+                    return list(iterate_steps(rest, value, None))
+                return ()
+
+            return recursive, _FILTER, filter_then
+
+        matcher = _exact_matcher(selector)
+        if matcher is not None:
+            return recursive, _EXACT, matcher
+
+        remaining = plan.steps[i:]
+        return (
+            False,
+            _FALLBACK,
+            lambda value: list(iterate_steps(remaining, value, None)),
+        )
+
+    def feed(self, data: bytes | str) -> list[Any]:
+        """Consume the next chunk of input.
+
+        Args:
+            data: UTF-8 bytes or text. Chunks may split tokens and
+                multi-byte characters anywhere.
+
+        Returns:
+            Matches completed by this chunk, in document order.
+
+        Raises:
+            ValueError: If the input is not valid JSON.
+
+        """
+        self._buffer += data if isinstance(data, str) else self._decoder.decode(data)
+        self._process(final=False)
+        return self._drain()
+
+    def close(self) -> list[Any]:
+        """Signal the end of input and return any remaining matches.
+
+        Raises:
+            ValueError: If the input ended before the JSON value did.
+
+        """
+        self._buffer += self._decoder.decode(b"", final=True)
+        self._process(final=True)
+        if self._expect != _DONE or self._skip_depth:
+            self._error("Unexpected end of JSON input", len(self._buffer))
+        return self._drain()
+
+    def _drain(self) -> list[Any]:
+        output, self._output = self._output, []
+        return output
+
+    def _error(self, message: str, pos: int) -> NoReturn:
+        msg = f"{message} at offset {self._offset + pos}"
+        raise ValueError(msg)
+
+    def _reserve(self) -> int:
+        seq = self._next_seq
+        self._next_seq += 1
+        return seq
+
+    def _complete(self, seq: int, results: Any) -> None:
+        # Results are released strictly in the order their values started,
+        # so an outer match waits for the nested matches built inside it.
+        if seq != self._emit_seq:
+            self._completed[seq] = results
+            return
+        self._output.extend(results)
+        self._emit_seq += 1
+        while self._emit_seq in self._completed:
+            self._output.extend(self._completed.pop(self._emit_seq))
+            self._emit_seq += 1
+
+    def _enter_value(
+        self,
+    ) -> tuple[tuple[int, ...], list[tuple[int, Pending]], bool, Any]:
+        """Match the value starting now against the path.
+
+        Returns:
+            Live states to keep matching inside it, pending evaluations to
+            run once it is built, whether it must be built, and its key or
+            index in the parent.
+
+        """
+        if self._stack:
+            parent = self._stack[-1]
+            states, candidates, slot = self._child_states(parent)
+            parent_building = parent.container is not None
+        else:
+            states, candidates, slot = {0}, [], None
+            parent_building = False
+
+        pending: list[tuple[int, Pending]] = []
+        live = []
+        if self._final in states:
+            pending.append((self._reserve(), _as_match))
+        for i in sorted(states):
+            if i == self._final:
+                continue
+            kind, fn = self._transitions[i][1:]
+            if kind == _FALLBACK:
+                pending.append((self._reserve(), fn))
+            else:
+                live.append(i)
+        pending.extend((self._reserve(), self._transitions[i][2]) for i in candidates)
+        return tuple(live), pending, parent_building or bool(pending), slot
+
+    def _child_states(self, parent: _Frame) -> tuple[set[int], list[int], Any]:
+        """Advance the parent's states over the child starting now.
+
+        Returns:
+            The states matched by the child's key or index, the states
+            whose filter has to look at the built child, and the key or
+            index.
+
+        """
+        if parent.is_object:
+            slot, is_index = parent.key, False
+        else:
+            slot, is_index = parent.index, True
+            parent.index += 1
+        states = set()
+        candidates = []
+        for i in parent.states:
+            recursive, kind, test = self._transitions[i]
+            if recursive:
+                states.add(i)
+            if kind != _EXACT:
+                candidates.append(i)
+            elif test(slot, is_index):
+                states.add(i + 1)
+        return states, candidates, slot
+
+    def _attach(self, value: Any, slot: Any) -> None:
+        container = self._stack[-1].container
+        if isinstance(container, dict):
+            container[slot] = value
+        else:
+            container.append(value)
+
+    def _value_done(self) -> None:
+        self._expect = _COMMA_OR_END if self._stack else _DONE
+
+    def _scalar(self, value_factory: Callable[[], Any]) -> None:
+        _live, pending, building, slot = self._enter_value()
+        if building:
+            value = value_factory()
+            if self._stack and self._stack[-1].container is not None:
+                self._attach(value, slot)
+            for seq, fn in pending:
+                self._complete(seq, fn(value))
+        self._value_done()
+
+    def _start_container(self, is_object: bool) -> None:  # noqa: FBT001
+        live, pending, building, slot = self._enter_value()
+        if not live and not building:
+            self._skip_depth = 1
+            return
+        container = ({} if is_object else []) if building else None
+        self._stack.append(_Frame(is_object, live, container, pending, slot))
+        self._expect = _KEY_OR_END if is_object else _VALUE_OR_END
+
+    def _end_container(self) -> None:
+        frame = self._stack.pop()
+        value = frame.container
+        if value is not None:
+            if self._stack and self._stack[-1].container is not None:
+                self._attach(value, frame.slot)
+            for seq, fn in frame.pending:
+                self._complete(seq, fn(value))
+        self._value_done()
+
+    def _skip(self, buf: str, pos: int, final: bool) -> int:  # noqa: FBT001
+        """Advance past an unmatched subtree, tracking only nesting depth."""
+        depth = self._skip_depth
+        end = len(buf)
+        while pos < end:
+            match = _SKIPPABLE.match(buf, pos)
+            if match is not None:
+                pos = match.end()
+                if pos >= end:
+                    break
+            char = buf[pos]
+            if char == '"':
+                match = _STRING.match(buf, pos)
+                if match is None:
+                    if final:
+                        self._error("Unterminated string", pos)
+                    break
+                pos = match.end()
+            elif char in "[{":
+                depth += 1
+                pos += 1
+            else:
+                depth -= 1
+                pos += 1
+                if depth == 0:
+                    break
+        self._skip_depth = depth
+        return pos
+
+    def _process(self, final: bool) -> None:  # noqa: FBT001
+        buf = self._buffer
+        end = len(buf)
+        pos = 0
+        tokens = self._TOKENS
+        while True:
+            if self._skip_depth:
+                pos = self._skip(buf, pos, final)
+                if self._skip_depth:
+                    break
+                self._value_done()
+                continue
+            pos = _WHITESPACE.match(buf, pos).end()
+            if pos >= end:
+                break
+            if self._expect == _DONE:
+                self._error("Extra data after JSON value", pos)
+            char = buf[pos]
+            read = tokens.get(char)
+            if read is None:
+                self._error(f"Unexpected character {char!r}", pos)
+            following = read(self, buf, pos, final)
+            if following is None:
+                break  # the token may continue in the next chunk
+            pos = following
+        self._offset += pos
+        self._buffer = buf[pos:]
+
+    # Each reader consumes the token starting at ``pos`` and returns the
+    # position after it, or None if the chunk ends inside the token.
+
+    def _read_string(
+        self,
+        buf: str,
+        pos: int,
+        final: bool,  # noqa: FBT001
+    ) -> int | None:
+        match = _STRING.match(buf, pos)
+        if match is None:
+            if final:
+                self._error("Unterminated string", pos)
+            return None
+        raw = match.group(1)
+        expect = self._expect
+        if expect in (_KEY, _KEY_OR_END):
+            self._stack[-1].key = _decode_string(raw)
+            # Keys are nearly always followed by the colon; take it here
+            # rather than dispatching it as a token of its own.
+            colon = _WHITESPACE.match(buf, match.end()).end()
+            if buf.startswith(":", colon):
+                self._expect = _VALUE
+                return colon + 1
+            self._expect = _COLON
+        elif expect in (_VALUE, _VALUE_OR_END):
+            self._scalar(lambda: _decode_string(raw))
+        else:
+            self._error("Unexpected string", pos)
+        return match.end()
+
+    def _read_colon(self, _buf: str, pos: int, _final: bool) -> int:  # noqa: FBT001
+        if self._expect != _COLON:
+            self._error("Unexpected ':'", pos)
+        self._expect = _VALUE
+        return pos + 1
+
+    def _read_comma(self, _buf: str, pos: int, _final: bool) -> int:  # noqa: FBT001
+        if self._expect != _COMMA_OR_END:
+            self._error("Unexpected ','", pos)
+        self._expect = _KEY if self._stack[-1].is_object else _VALUE
+        return pos + 1
+
+    def _read_open(self, buf: str, pos: int, _final: bool) -> int:  # noqa: FBT001
+        char = buf[pos]
+        if self._expect not in (_VALUE, _VALUE_OR_END):
+            self._error(f"Unexpected {char!r}", pos)
+        self._start_container(char == "{")
+        return pos + 1
+
+    def _read_close(self, buf: str, pos: int, _final: bool) -> int:  # noqa: FBT001
+        char = buf[pos]
+        is_object = char == "}"
+        top = self._stack[-1] if self._stack else None
+        closes = self._expect in (
+            _COMMA_OR_END,
+            _KEY_OR_END if is_object else _VALUE_OR_END,
+        )
+        if top is None or top.is_object != is_object or not closes:
+            self._error(f"Unexpected {char!r}", pos)
+        self._end_container()
+        return pos + 1
+
+    def _read_number(
+        self,
+        buf: str,
+        pos: int,
+        final: bool,  # noqa: FBT001
+    ) -> int | None:
+        if not final and _NUMBER_CHARS.match(buf, pos).end() == len(buf):
+            return None
+        match = _NUMBER.match(buf, pos)
+        if match is None:
+            self._error("Invalid number", pos)
+        if self._expect not in (_VALUE, _VALUE_OR_END):
+            self._error("Unexpected number", pos)
+        text = match.group()
+        self._scalar(lambda: _decode_number(text))
+        return match.end()
+
+    def _read_literal(
+        self,
+        buf: str,
+        pos: int,
+        final: bool,  # noqa: FBT001
+    ) -> int | None:
+        word, value = _LITERALS[buf[pos]]
+        if not buf.startswith(word, pos):
+            if not final and word.startswith(buf[pos:]):
+                return None
+            self._error("Invalid literal", pos)
+        if self._expect not in (_VALUE, _VALUE_OR_END):
+            self._error(f"Unexpected {word}", pos)
+        self._scalar(lambda: value)
+        return pos + len(word)
+
+    _TOKENS: ClassVar[dict[str, Callable[..., int | None]]] = {
+        '"': _read_string,
+        ":": _read_colon,
+        ",": _read_comma,
+        "{": _read_open,
+        "[": _read_open,
+        "}": _read_close,
+        "]": _read_close,
+        "-": _read_number,
+        **dict.fromkeys("0123456789", _read_number),
+        **dict.fromkeys(_LITERALS, _read_literal),
+    }
+
+
+def _as_match(value: Any) -> tuple[Any]:
+    return (value,)
+
+
+def _decode_string(raw: str) -> str:
+    return json.loads(f'"{raw}"') if "\\" in raw else raw
+
+
+def _decode_number(text: str) -> int | float:
+    if "." in text or "e" in text or "E" in text:
+        return float(text)
+    return int(text)
+
+
+def iter_stream(
+    path: PathLike,
+    source: IO[bytes] | IO[str] | str | os.PathLike[str],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> Iterator[Any]:
+    """Lazily yield the values ``path`` selects from a JSON file or stream.
+
+    The input is read ``chunk_size`` bytes at a time and never loaded
+    whole; see :class:`StreamingQuery` for what is supported.
+
+    Args:
+        path: A path string, parsed JSONPath or compiled QueryPlan.
+        source: Binary (or text) file object, or a filesystem path.
+        chunk_size: Number of bytes read per chunk.
+
+    Yields:
+        Matched values, in document order.
+
+    """
+    query = StreamingQuery(path)
+    if isinstance(source, str | os.PathLike):
+        with open(source, "rb") as stream:  # noqa: PTH123
+            yield from _run(query, stream, chunk_size)
+    else:
+        yield from _run(query, source, chunk_size)
+
+
+def _run(query: StreamingQuery, stream: IO[Any], chunk_size: int) -> Iterator[Any]:
+    while chunk := stream.read(chunk_size):
+        yield from query.feed(chunk)
+    yield from query.close()
+
+
+def stream_select(
+    path: PathLike,
+    source: IO[bytes] | IO[str] | str | os.PathLike[str],
+    chunk_size: int = DEFAULT_CHUNK_SIZE,
+) -> list[Any]:
+    """Return every value ``path`` selects from a JSON file or stream."""
+    return list(iter_stream(path, source, chunk_size))
@@ -0,0 +1,425 @@
+from __future__ import annotations
+
+from collections.abc import Callable, Iterable, Iterator, Mapping
+from dataclasses import dataclass
+from typing import Any
+
+from .evaluator import PathLike, as_plan
+from .locations import LocatedStep, Location, compile_located, normalized_path
+from .optimizer import expand
+from .parsed_dataclasses import (
+    BracketSelector,
+    Field,
+    FilterSelector,
+    Index,
+    IndexList,
+    Name,
+    RecursiveSelector,
+    Slice,
+    WildcardIndex,
+)
+from .patch import Keys, Patcher
+from .streaming import segments_use_root
+
+_MISSING = object()
+_VALUE = object()
+
+Test = Callable[[Any, Any, Any, Any], bool]
+"""``test(parent, key, child, root)``: whether a selector selects the child
+at ``key`` of ``parent``."""
+
+
+@dataclass(frozen=True)
+class Delta:
+    """How the matches of one subscription changed in one patch.
+
+    Both mappings are keyed by RFC 9535 normalized path. A match whose
+    value was replaced, or changed in place, is in both: ``removed`` with
+    the old value and ``added`` with the new one. Values are not copied,
+    so a container changed in place is the same object in both. A delta
+    is false when nothing changed.
+    """
+
+    added: dict[str, Any]
+    removed: dict[str, Any]
+
+    def __bool__(self) -> bool:
+        return bool(self.added or self.removed)
+
+
+def _select_any(_parent: Any, _key: Any, _child: Any, _root: Any) -> bool:
+    return True
+
+
+def _test(selector: Any) -> tuple[Test, bool]:  # noqa: C901
+    """Return the child test for ``selector`` and whether it is a filter."""
+    if isinstance(selector, BracketSelector):
+        selector = selector.content
+    if isinstance(selector, Field | WildcardIndex) and getattr(
+        selector, "wildcard", True
+    ):
+        return _select_any, False
+    if isinstance(selector, Field | Name):
+        name = selector.name
+
+        def select_name(parent: Any, key: Any, _child: Any, _root: Any) -> bool:
+            return isinstance(parent, dict) and key == name
+
+        return select_name, False
+    if isinstance(selector, Index | IndexList):
+        indices = (selector.idx,) if isinstance(selector, Index) else selector.indices
+
+        def select_index(parent: Any, key: Any, _child: Any, _root: Any) -> bool:
+            if not isinstance(parent, list):
+                return False
+            length = len(parent)
+            return any(
+                -length <= idx < length and key == idx % length for idx in indices
+            )
+
+        return select_index, False
+    if isinstance(selector, Slice):
+        # A zero step selects nothing, like the empty range.
+        py_slice = slice(selector.start, selector.end, selector.step or None)
+        empty = selector.step == 0
+
+        def select_slice(parent: Any, key: Any, _child: Any, _root: Any) -> bool:
+            return (
+                not empty
+                and isinstance(parent, list)
+                and key in range(len(parent))[py_slice]
+            )
+
+        return select_slice, False
+    if isinstance(selector, FilterSelector):
+        from .filters import compile_filter
+
+        predicate = compile_filter(selector.expression)
+
+        def select_filtered(_parent: Any, _key: Any, child: Any, root: Any) -> bool:
+            return predicate(child, root)
+
+        return select_filtered, True
+    msg = f"Unsupported selector: {selector!r}"
+    raise TypeError(msg)
+
+
+def _child(parent: Any, key: str | int) -> Any:
+    """Return the child at ``key`` of ``parent``, or ``_MISSING``."""
+    if isinstance(parent, dict):
+        return parent.get(key, _MISSING)
+    if isinstance(parent, list) and isinstance(key, int) and 0 <= key < len(parent):
+        return parent[key]
+    return _MISSING
+
+
+class _Matches:
+    """Match values in a trie keyed by the keys of their locations.
+
+    Each trie node is a dict from key to child node, holding the value of
+    the match at its location, if any, under ``_VALUE``. The matches at,
+    above and below one location are found without visiting the others.
+    """
+
+    __slots__ = ("_root",)
+
+    def __init__(self, items: Iterable[tuple[Keys, Any]] = ()) -> None:
+        self._root: dict[Any, Any] = {}
+        for keys, value in items:
+            self[keys] = value
+
+    def __setitem__(self, keys: Keys, value: Any) -> None:
+        node = self._root
+        for key in keys:
+            node = node.setdefault(key, {})
+        node[_VALUE] = value
+
+    def get(self, keys: Keys, default: Any = None) -> Any:
+        node = self._root
+        for key in keys:
+            node = node.get(key)
+            if node is None:
+                return default
+        return node.get(_VALUE, default)
+
+    def items(self) -> Iterator[tuple[Keys, Any]]:
+        return _walk(self._root, ())
+
+    def pop_related(self, keys: Keys) -> list[tuple[Keys, Any]]:
+        """Remove and return the matches at, above and below ``keys``."""
+        nodes = [self._root]
+        removed = []
+        for depth, key in enumerate(keys):
+            node = nodes[-1]
+            if _VALUE in node:
+                removed.append((keys[:depth], node.pop(_VALUE)))
+            if key not in node:
+                break
+            nodes.append(node[key])
+        else:
+            removed.extend(_walk(nodes[-1], keys))
+            nodes[-1].clear()
+        # Drop the nodes on the way that no longer lead to a match.
+        for depth in range(len(nodes) - 1, 0, -1):
+            if nodes[depth]:
+                break
+            del nodes[depth - 1][keys[depth - 1]]
+        return removed
+
+
+def _walk(node: dict[Any, Any], keys: Keys) -> Iterator[tuple[Keys, Any]]:
+    stack = [(node, keys)]
+    while stack:
+        node, keys = stack.pop()
+        for key, child in node.items():
+            if key is _VALUE:
+                yield keys, child
+            else:
+                stack.append((child, (*keys, key)))
+
+
+class Subscription:
+    """A path registered on a :class:`LiveDocument` and its current matches.
+
+    Matches are kept as a set of locations: a node the path selects more
+    than once is one match.
+    """
+
+    def __init__(
+        self, path: PathLike, callback: Callable[[Delta], Any], document: Any
+    ) -> None:
+        """Compile ``path`` and find its current matches in ``document``.
+
+        Subscriptions are made by :meth:`LiveDocument.subscribe`.
+
+        Args:
+            path: A path string, parsed JSONPath or compiled QueryPlan.
+            callback: Called with a :class:`Delta` after each patch that
+                changed the matches.
+            document: The document the matches are kept for.
+
+        """
+        self.plan = as_plan(path)
+        self.callback = callback
+        segments = expand(self.plan.segments)
+        # Filters on ``$`` read the whole document, so any change may
+        # affect them; such paths are re-evaluated in full.
+        self._incremental = not segments_use_root(segments)
+        self._steps: tuple[LocatedStep, ...] = tuple(map(compile_located, segments))
+        self._transitions = tuple(
+            (True, *_test(s.name if s.name is not None else WildcardIndex()))
+            if isinstance(s, RecursiveSelector)
+            else (False, *_test(s))
+            for s in segments
+        )
+        self._matches = _Matches(self._evaluate(document).items())
+
+    @property
+    def matches(self) -> dict[str, Any]:
+        """The current matches, keyed by normalized path, in no set order."""
+        return {normalized_path(keys): value for keys, value in self._matches.items()}
+
+    def _evaluate(self, document: Any) -> dict[Keys, Any]:
+        return {loc.keys: loc.value for loc in self.plan.locate(document)}
+
+    def _evaluate_from(self, node: Any, start: int, document: Any) -> Iterator[Any]:
+        selection = [node]
+        for step in self._steps[start:]:
+            selection = [
+                match for value in selection for match in step(value, document)
+            ]
+        return (Location(match) for match in selection)
+
+    def _advance(
+        self, states: set[int], parent: Any, key: str | int, child: Any, root: Any
+    ) -> tuple[set[int], bool]:
+        """Step ``states`` from ``parent`` to its child at ``key``.
+
+        Returns:
+            The states at the child and whether a filter tested it.
+
+        """
+        final = len(self._transitions)
+        following = set()
+        filtered = False
+        for i in states:
+            if i == final:
+                continue
+            recursive, test, is_filter = self._transitions[i]
+            if recursive:
+                following.add(i)
+            if test(parent, key, child, root):
+                following.add(i + 1)
+            filtered = filtered or is_filter
+        return following, filtered
+
+    def _region(self, document: Any, pointer: Keys) -> tuple[Keys, dict[Keys, Any]]:
+        """Find the matches related to ``pointer``, leaving the rest alone.
+
+        The path is followed along the pointer, one key at a time, keeping
+        the set of segments that could have been matched so far. Matches
+        on the way are ancestors of the changed node; the segments still
+        to be matched at its end are evaluated on its subtree only.
+
+        A filter that tests an ancestor of the change may now decide the
+        other way, which affects every match below that ancestor, so the
+        region is widened to it.
+
+        Returns:
+            The root of the affected region and the matches in it.
+
+        """
+        final = len(self._transitions)
+        node = (None, None, document)
+        states = {0}
+        found: dict[Keys, Any] = {}
+        end = len(pointer)
+        depth = 0
+        while depth < end:
+            if final in states:
+                found[pointer[:depth]] = node[2]
+            parent = node[2]
+            key = pointer[depth]
+            child = _child(parent, key)
+            if child is _MISSING:
+                return pointer[:end], found
+            states, filtered = self._advance(states, parent, key, child, document)
+            if filtered:
+                end = depth + 1
+            node = (node, key, child)
+            depth += 1
+            if not states:
+                return pointer[:end], found
+        for i in states:
+            found.update(
+                (match.keys, match.value)
+                for match in self._evaluate_from(node, i, document)
+            )
+        return pointer[:end], found
+
+    def refresh(self, document: Any, touched: list[Keys]) -> Delta:
+        """Update the matches after the locations in ``touched`` changed.
+
+        Called by :meth:`LiveDocument.patch`.
+
+        Returns:
+            How the matches changed.
+
+        """
+        before: dict[Keys, Any] = {}
+        if self._incremental:
+            for pointer in _outermost(touched):
+                region, found = self._region(document, pointer)
+                for keys, value in self._matches.pop_related(region):
+                    before.setdefault(keys, value)
+                for keys, value in found.items():
+                    before.setdefault(keys, _MISSING)
+                    self._matches[keys] = value
+        else:
+            matches = self._evaluate(document)
+            before = dict.fromkeys(matches, _MISSING) | dict(self._matches.items())
+            self._matches = _Matches(matches.items())
+        added = {}
+        removed = {}
+        for keys, old in before.items():
+            new = self._matches.get(keys, _MISSING)
+            if old is new and not any(
+                pointer[: len(keys)] == keys for pointer in touched
+            ):
+                continue
+            path = normalized_path(keys)
+            if old is not _MISSING:
+                removed[path] = old
+            if new is not _MISSING:
+                added[path] = new
+        return Delta(added=added, removed=removed)
+
+
+def _outermost(pointers: list[Keys]) -> list[Keys]:
+    unique = set(pointers)
+    return [
+        pointer
+        for pointer in unique
+        if not any(pointer[:depth] in unique for depth in range(len(pointer)))
+    ]
+
+
+class LiveDocument:
+    """A long-lived document that notifies subscribed paths of changes.
+
+    Changes arrive as RFC 6902 JSON Patch operations (see
+    :func:`~json_path_parser.patch.apply_patch`). After each patch, only
+    subscriptions whose path can reach a changed location are looked at,
+    and those are brought up to date by evaluating their path along the
+    changed locations and inside the changed subtrees, not over the whole
+    document. Paths with filters on ``$`` are the exception and are
+    re-evaluated in full when they may be affected.
+
+    A LiveDocument holds the state of its subscriptions and belongs to one
+    thread, like :class:`~json_path_parser.streaming.StreamingQuery`.
+    """
+
+    def __init__(self, document: Any) -> None:
+        """Wrap a parsed JSON document; it is modified in place by patches."""
+        self._document = document
+        self._subscriptions: list[Subscription] = []
+
+    @property
+    def document(self) -> Any:
+        """The current document."""
+        return self._document
+
+    def subscribe(
+        self, path: PathLike, callback: Callable[[Delta], Any]
+    ) -> Subscription:
+        """Register ``path`` and call ``callback`` whenever its matches change.
+
+        Args:
+            path: A path string, parsed JSONPath or compiled QueryPlan.
+            callback: Called with a :class:`Delta` after each patch that
+                changed the matches.
+
+        Returns:
+            The subscription, holding the current matches.
+
+        """
+        subscription = Subscription(path, callback, self._document)
+        self._subscriptions.append(subscription)
+        return subscription
+
+    def unsubscribe(self, subscription: Subscription) -> None:
+        """Stop notifying ``subscription``.
+
+        Raises:
+            ValueError: If it is not subscribed to this document.
+
+        """
+        self._subscriptions.remove(subscription)
+
+    def patch(self, operations: Iterable[Mapping[str, Any]]) -> None:
+        """Apply a JSON Patch and notify the subscriptions it affected.
+
+        Every subscription is brought up to date before any callback runs,
+        and callbacks run in subscription order. If the patch fails, the
+        document is unchanged and nobody is notified.
+
+        Args:
+            operations: RFC 6902 operation objects.
+
+        Raises:
+            ValueError: If the patch is invalid or a ``test`` fails.
+            TypeError: If an operation addresses a child of a scalar.
+
+        """
+        patcher = Patcher(self._document)
+        patcher.apply(operations)
+        self._document = patcher.document
+        if not patcher.touched:
+            return
+        deltas = [
+            (subscription, subscription.refresh(self._document, patcher.touched))
+            for subscription in self._subscriptions
+        ]
+        for subscription, delta in deltas:
+            if delta:
+                subscription.callback(delta)
@@ -0,0 +1,130 @@
+from __future__ import annotations
+
+import os
+import sys
+from collections.abc import Callable, Iterable, Sequence
+from concurrent.futures import Executor, ThreadPoolExecutor
+from typing import Any
+
+from .evaluator import PathLike, as_plan
+
+# Thread safety
+# -------------
+# Evaluation never writes to shared state: parsed paths are frozen, compiled
+# QueryPlans are immutable, steps keep their state in local variables, and
+# the documents being queried are only read. The compiled-path cache,
+# metrics registry, shared Lark parser and DocumentIndex plan bindings are
+# guarded by locks or only ever written idempotently. Any number of threads
+# may therefore query one shared document at the same time, and on a
+# free-threaded build (python3.13t with the GIL disabled) they run in
+# parallel.
+#
+# Not covered: modifying a document (or rebuilding its DocumentIndex) while
+# other threads query it, LazyDocument values (which load themselves on
+# first access) and StreamingQuery objects, which hold the state of one
+# stream and belong to one thread.
+
+
+def gil_enabled() -> bool:
+    """Whether the running interpreter has the global interpreter lock.
+
+    Threads only evaluate in parallel when this is False.
+    """
+    return sys._is_gil_enabled()  # noqa: SLF001
+
+
+def default_workers() -> int:
+    """Return the thread count used when none is given: one per usable CPU."""
+    return os.process_cpu_count() or 1
+
+
+def _batches(items: Sequence[Any], workers: int) -> list[Sequence[Any]]:
+    # A few batches per thread amortize the cost of a task while still
+    # evening out the load when some items take longer than others.
+    count = min(len(items), workers * 4)
+    size, extra = divmod(len(items), count) if count else (0, 0)
+    batches = []
+    start = 0
+    for i in range(count):
+        end = start + size + (i < extra)
+        batches.append(items[start:end])
+        start = end
+    return batches
+
+
+def _run(
+    function: Callable[[Sequence[Any]], list[Any]],
+    items: Sequence[Any],
+    max_workers: int | None,
+    executor: Executor | None,
+) -> list[Any]:
+    if not items:
+        return []
+    if executor is not None:
+        batches = _batches(items, max_workers or default_workers())
+        return [r for results in executor.map(function, batches) for r in results]
+    workers = max_workers or default_workers()
+    if workers == 1:
+        return function(items)
+    with ThreadPoolExecutor(workers, thread_name_prefix="jsonpath") as pool:
+        return _run(function, items, workers, pool)
+
+
+def select_batch(
+    document: Any,
+    paths: Iterable[PathLike],
+    *,
+    max_workers: int | None = None,
+    executor: Executor | None = None,
+) -> list[list[Any]]:
+    """Evaluate many paths against one shared document on a thread pool.
+
+    Args:
+        document: Parsed JSON value to query; it is shared, not copied.
+        paths: Path strings, parsed JSONPaths or compiled QueryPlans.
+        max_workers: Threads to use; one per CPU by default. ``1`` runs
+            everything in the calling thread.
+        executor: Existing executor to submit to instead of starting a
+            pool for this call.
+
+    Returns:
+        One list of selected values per path, in the order of ``paths``.
+
+    """
+    plans = [as_plan(path) for path in paths]
+
+    def evaluate(batch: Sequence[Any]) -> list[list[Any]]:
+        return [plan.evaluate(document) for plan in batch]
+
+    return _run(evaluate, plans, max_workers, executor)
+
+
+def select_each(
+    path: PathLike,
+    documents: Iterable[Any],
+    *,
+    max_workers: int | None = None,
+    executor: Executor | None = None,
+) -> list[list[Any]]:
+    """Evaluate one path against many documents on a thread pool.
+
+    The in-memory, shared-nothing alternative to
+    :func:`~json_path_parser.bulk.iter_bulk`'s process pool: documents are
+    not serialized or copied to workers.
+
+    Args:
+        path: A path string, parsed JSONPath or compiled QueryPlan.
+        documents: Parsed JSON values.
+        max_workers: As for :func:`select_batch`.
+        executor: As for :func:`select_batch`.
+
+    Returns:
+        One list of selected values per document, in the order given.
+
+    """
+    plan = as_plan(path)
+
+    def evaluate(batch: Sequence[Any]) -> list[list[Any]]:
+        return [plan.evaluate(document) for document in batch]
+
+    return _run(evaluate, list(documents), max_workers, executor)
@@ -1,20 +1,56 @@
 from __future__ import annotations
 
+import json
+import re
 from typing import Any
 
 from lark import Token, Transformer
 
 from .parsed_dataclasses import (
     BracketSelector,
+    Comparison,
+    ExistenceTest,
     Field,
+    FilterExpression,
+    FilterQuery,
+    FilterSelector,
     Index,
     IndexList,
     JSONPath,
+    Literal,
+    LogicalAnd,
+    LogicalNot,
+    LogicalOr,
     Name,
+    RecursiveSelector,
     Slice,
     WildcardIndex,
 )
 
+_SINGLE_QUOTE_ESCAPES = re.compile(r"\\.|\"")
+
+
+def _unquote(token: Token) -> str:
+    r"""Decode a quoted name token into the string it denotes.
+
+    Double-quoted names use JSON escapes. Single-quoted names additionally
+    allow ``\'`` and a bare ``"``, so they are rewritten to the
+    double-quoted form before decoding.
+    """
+    if token.type == "ESCAPED_STRING":
+        return json.loads(token)
+
+    def _requote(match: re.Match[str]) -> str:
+        text = match.group()
+        if text == "\\'":
+            return "'"
+        if text == '"':
+            return '\\"'
+        return text
+
+    body = _SINGLE_QUOTE_ESCAPES.sub(_requote, token[1:-1])
+    return json.loads(f'"{body}"')
+
 
 class JSONPathTransformer(Transformer):
     """Transformer for converting parsed JSONPath tokens into structured objects."""
@@ -29,7 +65,7 @@ class JSONPathTransformer(Transformer):
             JSONPath object containing all segments.
 
         """
-        return JSONPath(segments=items)
+        return JSONPath(segments=tuple(items))
 
     def field(self, items: list[Token]) -> Field:
         """Transform field selector.
@@ -88,20 +124,19 @@ class JSONPathTransformer(Transformer):
         Returns:
             IndexList object containing parsed integer indices.
         """
-        indices = [int(i) for i in items]
-        return IndexList(indices=indices)
+        return IndexList(indices=tuple(int(i) for i in items))
 
     def name(self, items: list[Token]) -> Name:
         """Transform name token.
 
         Args:
-            items: List containing a single name token.
+            items: List containing a single quoted name token.
 
         Returns:
-            Name object with the token value.
+            Name object with the unquoted token value.
         """
         (name_token,) = items
-        return Name(name=name_token)
+        return Name(name=_unquote(name_token))
 
     def bracket_selector(self, items: list[Token]) -> BracketSelector:
         """Transform bracket selector.
@@ -114,3 +149,106 @@ class JSONPathTransformer(Transformer):
         """
         (content,) = items
         return BracketSelector(content=content)
+
+    def recursive_selector(
+        self, items: list[Token | BracketSelector]
+    ) -> RecursiveSelector:
+        """Transform recursive descent selector.
+
+        Args:
+            items: Empty for a bare ``..``, otherwise a single name token,
+                wildcard token or already transformed bracket selector.
+
+        Returns:
+            RecursiveSelector wrapping the child selector, or None.
+        """
+        if not items:
+            return RecursiveSelector(name=None)
+        (selector,) = items
+        if isinstance(selector, Token):
+            return RecursiveSelector(name=self.field([selector]))
+        return RecursiveSelector(name=selector)
+
+    def filter(self, items: list[FilterExpression]) -> FilterSelector:
+        """Transform filter selector.
+
+        Args:
+            items: List containing a single filter expression.
+
+        Returns:
+            FilterSelector wrapping the expression.
+        """
+        (expression,) = items
+        return FilterSelector(expression=expression)
+
+    def or_expr(self, items: list[FilterExpression]) -> LogicalOr:
+        """Transform ``||`` expression."""
+        left, right = items
+        return LogicalOr(left=left, right=right)
+
+    def and_expr(self, items: list[FilterExpression]) -> LogicalAnd:
+        """Transform ``&&`` expression."""
+        left, right = items
+        return LogicalAnd(left=left, right=right)
+
+    def not_expr(self, items: list[FilterExpression]) -> LogicalNot:
+        """Transform ``!`` expression."""
+        (expression,) = items
+        return LogicalNot(expression=expression)
+
+    def test_expr(self, items: list[FilterQuery]) -> ExistenceTest:
+        """Transform existence test."""
+        (query,) = items
+        return ExistenceTest(query=query)
+
+    def comparison(self, items: list[Any]) -> Comparison:
+        """Transform comparison expression.
+
+        Args:
+            items: Left operand, comparison operator token, right operand.
+
+        Returns:
+            Comparison object.
+
+        Raises:
+            ValueError: If an operand is a query that can select more than
+                one node.
+        """
+        left, op, right = items
+        for operand in (left, right):
+            if isinstance(operand, FilterQuery) and not operand.singular:
+                msg = "Comparison operands must be singular queries"
+                raise ValueError(msg)
+        return Comparison(left=left, op=str(op), right=right)
+
+    def relative_query(self, items: list[Any]) -> FilterQuery:
+        """Transform ``@``-rooted filter query."""
+        return FilterQuery(segments=tuple(items), absolute=False)
+
+    def absolute_query(self, items: list[Any]) -> FilterQuery:
+        """Transform ``$``-rooted filter query."""
+        return FilterQuery(segments=tuple(items), absolute=True)
+
+    def number(self, items: list[Token]) -> Literal:
+        """Transform number literal into an int or float."""
+        (token,) = items
+        if any(c in token for c in ".eE"):
+            return Literal(value=float(token))
+        return Literal(value=int(token))
+
+    def string_literal(self, items: list[Token]) -> Literal:
+        """Transform quoted string literal."""
+        (token,) = items
+        return Literal(value=_unquote(token))
+
+    def true(self, _: Any) -> Literal:
+        """Transform ``true`` literal."""
+        return Literal(value=True)
+
+    def false(self, _: Any) -> Literal:
+        """Transform ``false`` literal."""
+        return Literal(value=False)
+
+    def null(self, _: Any) -> Literal:
+        """Transform ``null`` literal."""
+        return Literal(value=None)
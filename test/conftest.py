@@ -1,3 +1,5 @@
+import json
+
 import pytest
 from pathlib import Path
 
@@ -34,3 +36,9 @@ def sample_nested_json():
 @pytest.fixture
 def sample_json_path_complex():
     return "$.store.book[?(@.price < 10)].title"
+
+
+@pytest.fixture
+def test_data():
+    with open(Path(__file__).parent / "data" / "test_data.json") as f:
+        return json.load(f)
@@ -0,0 +1,90 @@
+import asyncio
+import json
+from pathlib import Path
+
+import pytest
+
+from json_path_parser.aio import aiter_stream, aiter_stream_many, astream_select
+from json_path_parser.evaluator import JSONPathEvaluator
+
+DATA = (Path(__file__).parent / "data" / "test_data.json").read_bytes()
+
+
+async def chunks(data, size):
+    for start in range(0, len(data), size):
+        yield data[start : start + size]
+
+
+def run(coroutine):
+    return asyncio.run(coroutine)
+
+
+class TestAsyncStreaming:
+    @pytest.mark.parametrize("path", ["$.store.book[*].author", "$..price", "$.store.book[?@.price < 10].title"])
+    @pytest.mark.parametrize("size", [1, 7, 1 << 20])
+    def test_matches_in_memory(self, test_data, path, size):
+        expected = JSONPathEvaluator(test_data).select(path)
+        assert run(astream_select(path, chunks(DATA, size))) == expected
+
+    def test_text_chunks(self, test_data):
+        text = DATA.decode()
+        assert run(astream_select("$..author", chunks(text, 5))) == JSONPathEvaluator(test_data).select("$..author")
+
+    def test_stream_reader(self, test_data):
+        async def main():
+            reader = asyncio.StreamReader()
+            reader.feed_data(DATA)
+            reader.feed_eof()
+            return [value async for value in aiter_stream("$..price", reader, chunk_size=16)]
+
+        assert run(main()) == JSONPathEvaluator(test_data).select("$..price")
+
+    def test_yields_to_the_loop(self):
+        document = json.dumps({"items": list(range(20000))}).encode()
+        ticks = 0
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                ticks += 1
+                await asyncio.sleep(0)
+
+        async def main():
+            task = asyncio.create_task(ticker())
+            await asyncio.sleep(0)
+            values = await astream_select("$.items[-1]", chunks(document, len(document)), chunk_size=1024)
+            task.cancel()
+            return values
+
+        assert run(main()) == [19999]
+        assert ticks >= len(document) // 1024
+
+    def test_matches_arrive_before_the_end(self):
+        async def body():
+            yield b'{"a": [1, 2'
+            yield b", 3], "
+            raise ConnectionError
+
+        async def main():
+            seen = []
+            with pytest.raises(ConnectionError):
+                async for value in aiter_stream("$.a[*]", body()):
+                    seen.append(value)
+            return seen
+
+        assert run(main()) == [1, 2, 3]
+
+    def test_many_paths_one_pass(self, test_data):
+        paths = {"authors": "$..author", "cheap": "$.store.book[?@.price < 10].title"}
+        pairs = run(_collect(aiter_stream_many(paths, chunks(DATA, 64))))
+        evaluator = JSONPathEvaluator(test_data)
+        for key, path in paths.items():
+            assert [value for k, value in pairs if k == key] == evaluator.select(path)
+
+    def test_invalid_json(self):
+        with pytest.raises(ValueError, match="end of JSON"):
+            run(astream_select("$.a", chunks(b'{"a": [1', 3)))
+
+
+async def _collect(iterator):
+    return [item async for item in iterator]
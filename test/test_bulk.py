@@ -0,0 +1,61 @@
+import io
+import json
+
+import pytest
+
+from json_path_parser.__main__ import main
+from json_path_parser.bulk import bulk_select, iter_bulk, iter_chunks
+
+RECORDS = [{"id": i, "tags": [f"t{j}" for j in range(i % 4)]} for i in range(200)]
+
+
+@pytest.fixture
+def jsonl_file(tmp_path):
+    path = tmp_path / "records.jsonl"
+    lines = [json.dumps(record) for record in RECORDS]
+    lines.insert(10, "")  # blank lines are skipped but still counted
+    path.write_text("\n".join(lines) + "\n")
+    return path
+
+
+class TestIterChunks:
+    def test_chunks_hold_whole_lines(self):
+        data = b'{"a": 1}\n{"a": 22}\n{"a": 333}'
+        chunks = list(iter_chunks(io.BytesIO(data), chunk_size=4))
+        assert b"".join(chunk for chunk, _ in chunks) == data
+        assert all(chunk.endswith(b"\n") for chunk, _ in chunks[:-1])
+        assert [first for _, first in chunks] == [0, 1, 2]
+
+
+class TestBulk:
+    def test_in_process(self, jsonl_file):
+        assert bulk_select("$.id", jsonl_file, workers=0, chunk_size=64) == [[r["id"]] for r in RECORDS]
+
+    def test_process_pool_keeps_order(self, jsonl_file):
+        expected = [r["tags"] for r in RECORDS]
+        assert bulk_select("$.tags", jsonl_file, workers=2, chunk_size=256, max_in_flight=2) == [
+            [tags] for tags in expected
+        ]
+
+    def test_unordered_yields_every_record(self, jsonl_file):
+        records = list(iter_bulk("$.tags[*]", jsonl_file, workers=2, ordered=False, chunk_size=128))
+        assert len(records) == len(RECORDS)
+        line_numbers = sorted(lineno for lineno, _ in records)
+        assert line_numbers == list(range(10)) + list(range(11, len(RECORDS) + 1))
+
+    def test_invalid_line_reports_line_number(self):
+        source = io.BytesIO(b'{"a": 1}\n{"a": \n')
+        with pytest.raises(ValueError, match="line 2"):
+            list(iter_bulk("$.a", source, workers=0))
+
+
+class TestCommandLine:
+    def test_json_document(self, tmp_path, capsys):
+        path = tmp_path / "doc.json"
+        path.write_text('{"a": [1, {"b": 2}]}')
+        assert main(["$.a[*]", str(path)]) == 0
+        assert capsys.readouterr().out == '1\n{"b": 2}\n'
+
+    def test_jsonl(self, jsonl_file, capsys):
+        assert main(["$.id", str(jsonl_file), "--jsonl", "-j", "0"]) == 0
+        assert capsys.readouterr().out.splitlines()[:3] == ["[0]", "[1]", "[2]"]
@@ -0,0 +1,91 @@
+import threading
+
+import pytest
+from lark.exceptions import LarkError
+
+from json_path_parser.cache import PathCache, compile
+from json_path_parser.evaluator import JSONPathEvaluator
+from json_path_parser.parsed_dataclasses import Field
+
+
+class TestPathCache:
+    def test_hit_returns_same_object(self):
+        cache = PathCache(maxsize=4)
+        first = cache.get("$.store.book")
+        assert cache.get("$.store.book") is first
+        stats = cache.stats()
+        assert (stats.hits, stats.misses, stats.size) == (1, 1, 1)
+        assert stats.hit_rate == 0.5
+
+    def test_lru_eviction_order(self):
+        cache = PathCache(maxsize=2)
+        cache.get("$.a")
+        cache.get("$.b")
+        cache.get("$.a")  # $.b is now least recently used
+        cache.get("$.c")
+        assert "$.a" in cache
+        assert "$.b" not in cache
+        assert cache.stats().evictions == 1
+
+    def test_invalidate(self):
+        cache = PathCache()
+        cache.get("$.a")
+        cache.get("$.b")
+        cache.invalidate("$.a")
+        assert "$.a" not in cache
+        assert len(cache) == 1
+        cache.invalidate()
+        assert len(cache) == 0
+
+    def test_resize_evicts(self):
+        cache = PathCache(maxsize=3)
+        for name in "abc":
+            cache.get(f"$.{name}")
+        cache.resize(1)
+        assert len(cache) == 1
+        assert "$.c" in cache
+
+    def test_zero_size_disables_storage(self):
+        cache = PathCache(maxsize=0)
+        assert cache.get("$.a").segments == (Field(name="a"),)
+        assert len(cache) == 0
+
+    def test_negative_size_rejected(self):
+        with pytest.raises(ValueError):
+            PathCache(maxsize=-1)
+
+    def test_parse_errors_are_not_cached(self):
+        cache = PathCache()
+        with pytest.raises(LarkError):
+            cache.get("$[")
+        assert len(cache) == 0
+
+    def test_concurrent_access(self):
+        cache = PathCache(maxsize=8)
+        paths = [f"$.field{i % 16}" for i in range(400)]
+        errors = []
+
+        def worker():
+            try:
+                for path in paths:
+                    cache.get(path)
+            except Exception as exc:  # pragma: no cover - reported below
+                errors.append(exc)
+
+        threads = [threading.Thread(target=worker) for _ in range(4)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert not errors
+        stats = cache.stats()
+        assert stats.hits + stats.misses == 1600
+        assert stats.size <= 8
+
+
+class TestCompile:
+    def test_compiled_path_is_reusable(self, test_data):
+        path = compile("$.store.book[0].title")
+        evaluator = JSONPathEvaluator(test_data)
+        assert evaluator.select(path) == ["Sayings of the Century"]
+        assert evaluator.select(compile("$.store.book[0].title")) == ["Sayings of the Century"]
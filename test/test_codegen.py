@@ -0,0 +1,51 @@
+import pytest
+
+from json_path_parser.cache import PathCache
+from json_path_parser.codegen import generate_source
+from json_path_parser.parsed_dataclasses import Field, JSONPath
+from json_path_parser.plan import QueryPlan
+
+PATHS = [
+    "$",
+    "$.store.book[*].author",
+    "$.store.book[0].title",
+    "$.store.book[-1].price",
+    "$.store.book[-9]",
+    "$.store.book[1:3].title",
+    "$.store.book[::-1].metadata.year",
+    "$.store.book[::0]",
+    "$.store.book[0,-1,7].isbn",
+    "$.store.*",
+    "$.store.book.*.tags[*]",
+    '$.config["special-key"]',
+    "$.users[*].purchase_history[*].item",
+    "$.store.bicycle[0]",
+    "$.missing.deeper",
+]
+
+
+class TestCodegen:
+    @pytest.mark.parametrize("json_path", PATHS)
+    def test_matches_interpreter(self, test_data, json_path):
+        interpreted = PathCache(backend="interpreter").get(json_path)
+        generated = PathCache(backend="codegen").get(json_path)
+        assert generated.function is not None
+        assert generated.evaluate(test_data) == interpreted.evaluate(test_data)
+
+    def test_scalar_document(self):
+        plan = PathCache(backend="codegen").get("$[*]")
+        assert plan.evaluate(3) == []
+
+    def test_generated_source_uses_direct_lookups(self):
+        source = generate_source(JSONPath(segments=[Field(name="store"), Field(name="book")]))
+        assert source.startswith("def query(document):")
+        assert ".get('store', _MISSING)" in source
+
+    def test_deep_paths_fall_back_to_interpreter(self):
+        plan = QueryPlan.from_path(JSONPath(segments=[Field(name="a")] * 200), backend="codegen")
+        assert plan.function is None
+        assert plan.evaluate({"a": 1}) == []
+
+    def test_unknown_backend(self):
+        with pytest.raises(ValueError, match="Unknown backend"):
+            QueryPlan.from_path(JSONPath(segments=[]), backend="jit")
@@ -0,0 +1,86 @@
+import pytest
+
+from json_path_parser.evaluator import JSONPathEvaluator
+
+np = pytest.importorskip("numpy")
+
+BOOKS = {
+    "books": [
+        {"title": "A", "price": 8.95, "copies": 3},
+        {"title": "B", "price": None, "copies": 1},
+        {"title": "C", "copies": 2.5},
+        {"title": "D", "price": 22, "copies": True},
+    ],
+}
+
+
+class TestSelectArray:
+    def test_prices(self, test_data):
+        evaluator = JSONPathEvaluator(test_data)
+        result = evaluator.select_array("$.store.book[*].price")
+        assert result.dtype == np.float64
+        assert result.tolist() == evaluator.select("$.store.book[*].price")
+
+    def test_null_and_mismatched_values_are_masked(self):
+        result = JSONPathEvaluator([1, None, "x", True, 2.5]).select_array("$[*]")
+        assert result.mask.tolist() == [False, True, True, True, False]
+        assert result.compressed().tolist() == [1.0, 2.5]
+
+    def test_integer_dtype_masks_fractions(self):
+        result = JSONPathEvaluator([1, 2.5, 3]).select_array("$[*]", dtype="int64")
+        assert result.tolist() == [1, None, 3]
+
+    @pytest.mark.parametrize(
+        ("values", "dtype"),
+        [
+            ([1, -1, 2], "uint8"),
+            ([1, 1000, 2], "int8"),
+            ([1, 2**70, 2], "int64"),
+            ([1, 2**70, 2], "uint64"),
+        ],
+    )
+    def test_integers_out_of_range_are_masked(self, values, dtype):
+        result = JSONPathEvaluator(values).select_array("$[*]", dtype=dtype)
+        assert result.tolist() == [1, None, 2]
+        # A null in the chunk takes the value-by-value path instead.
+        result = JSONPathEvaluator([*values, None]).select_array("$[*]", dtype=dtype)
+        assert result.tolist() == [1, None, 2, None]
+
+    def test_grows_past_initial_capacity(self):
+        values = list(range(5000))
+        assert JSONPathEvaluator(values).select_array("$[*]", dtype="int32").tolist() == values
+
+    def test_empty(self):
+        assert JSONPathEvaluator({}).select_array("$.missing[*]").shape == (0,)
+
+
+class TestSelectColumns:
+    def test_columns_stay_aligned(self):
+        columns = JSONPathEvaluator(BOOKS).select_columns(
+            "$.books[*]",
+            {"price": "$.price", "copies": "$.copies", "title": "$.title"},
+            dtype={"price": "float64", "copies": "int64", "title": "U8"},
+        )
+        assert columns["price"].tolist() == [8.95, None, None, 22.0]
+        assert columns["copies"].tolist() == [3, 1, None, None]
+        assert columns["title"].tolist() == ["A", "B", "C", "D"]
+
+    def test_structured(self):
+        result = JSONPathEvaluator(BOOKS).select_columns(
+            "$.books[*]",
+            {"price": "$.price", "first_char": "$.title"},
+            dtype={"price": "float32", "first_char": "U1"},
+            structured=True,
+        )
+        assert result.dtype.names == ("price", "first_char")
+        assert result["price"].mask.tolist() == [False, True, True, False]
+        assert result["first_char"].tolist() == ["A", "B", "C", "D"]
+
+    def test_non_singular_column_uses_first_match(self, test_data):
+        columns = JSONPathEvaluator(test_data).select_columns(
+            "$.store.book[*]",
+            {"tag": "$.tags[*]"},
+            dtype="U16",
+        )
+        expected = [book["tags"][0] if book.get("tags") else None for book in test_data["store"]["book"]]
+        assert columns["tag"].tolist() == expected
@@ -0,0 +1,195 @@
+import pytest
+from lark.exceptions import LarkError
+
+from json_path_parser.cache import PathCache, compile
+from json_path_parser.evaluator import JSONPathEvaluator
+from json_path_parser.parsed_dataclasses import Field, JSONPath
+from json_path_parser.plan import QueryPlan, iter_containers
+
+
+class TestSelect:
+    @pytest.mark.parametrize("json_path,expected", [
+        ("$", None),
+        ("$.store.book[0].title", ["Sayings of the Century"]),
+        ("$.store.book[-1].author", ["J. R. R. Tolkien"]),
+        ("$.store.book[*].price", [8.95, 12.99, 8.99, 22.99]),
+        ("$.store.book[1:3].title", ["Sword of Honour", "Moby Dick"]),
+        ("$.store.book[::-2].price", [22.99, 12.99]),
+        ("$.store.book[::0]", []),
+        ("$.store.book[0,2,0].price", [8.95, 8.99, 8.95]),
+        ("$.store.book[4]", []),
+        ('$.config["special-key"]', ["value with spaces"]),
+        ("$.config.shipping.*", [50.0, 5.99, 12.99]),
+        ("$.users[*].preferences.categories[0]", ["fiction", "reference"]),
+        ("$.store.book.title", []),
+        ("$.missing", []),
+    ])
+    def test_select(self, test_data, json_path, expected):
+        if expected is None:
+            expected = [test_data]
+        assert JSONPathEvaluator(test_data).select(json_path) == expected
+
+    def test_dot_wildcard_selects_array_elements(self, test_data):
+        evaluator = JSONPathEvaluator(test_data)
+        assert evaluator.select("$.store.book.*") == evaluator.select("$.store.book[*]")
+
+
+class TestQueryPlan:
+    def test_plan_does_not_mutate_path(self, test_data):
+        path = JSONPath(segments=[Field(name="store"), Field(name="bicycle"), Field(name="color")])
+        evaluator = JSONPathEvaluator(test_data)
+        assert evaluator.select(path) == ["red"]
+        assert evaluator.select(path) == ["red"]
+        assert len(path.segments) == 3
+
+    def test_plan_is_reusable_across_documents(self):
+        plan = compile("$.a[0]")
+        assert plan.evaluate({"a": [1, 2]}) == [1]
+        assert plan.evaluate({"a": [3]}) == [3]
+        assert plan.evaluate({"b": 1}) == []
+
+    def test_plan_is_immutable(self):
+        plan = QueryPlan.from_path(JSONPath(segments=[Field(name="a")]))
+        with pytest.raises(AttributeError):
+            plan.steps = ()
+
+    def test_unknown_segment_rejected(self):
+        with pytest.raises(TypeError, match="Unsupported segment"):
+            QueryPlan.from_path(JSONPath(segments=["bogus"]))
+
+
+class TestLazyEvaluation:
+    @pytest.mark.parametrize("backend", ["interpreter", "codegen"])
+    @pytest.mark.parametrize("json_path", [
+        "$.store.book[*].author",
+        "$.store.book[::-1].tags[1:]",
+        "$.users[*].purchase_history[0,1].price",
+        "$.store.*",
+    ])
+    def test_iterate_matches_evaluate(self, test_data, backend, json_path):
+        plan = PathCache(backend=backend).get(json_path)
+        assert list(plan.iterate(test_data)) == plan.evaluate(test_data)
+
+    def test_limit(self, test_data):
+        evaluator = JSONPathEvaluator(test_data)
+        assert evaluator.select("$.store.book[*].price", limit=2) == [8.95, 12.99]
+        assert evaluator.select("$.store.book[*].price", limit=0) == []
+
+    def test_first(self, test_data):
+        evaluator = JSONPathEvaluator(test_data)
+        assert evaluator.first("$.users[*].name") == "John Doe"
+        assert evaluator.first("$.missing", default="n/a") == "n/a"
+
+    def test_exists_and_count(self, test_data):
+        evaluator = JSONPathEvaluator(test_data)
+        assert evaluator.exists("$.store.bicycle")
+        assert not evaluator.exists("$.store.bicycle.wheels")
+        assert evaluator.count("$.store.book[*].tags[*]") == 12
+        assert evaluator.count("$.missing") == 0
+
+    @pytest.mark.parametrize("backend", ["interpreter", "codegen"])
+    def test_exists_stops_at_first_match(self, backend):
+        visited = []
+
+        class Tracking(dict):
+            def get(self, key, default=None):
+                visited.append(key)
+                return super().get(key, default)
+
+            def __contains__(self, key):
+                visited.append(key)
+                return super().__contains__(key)
+
+        data = {"items": [Tracking(id=i) for i in range(1000)]}
+        plan = PathCache(backend=backend).get("$.items[*].id")
+        assert JSONPathEvaluator(data).exists(plan)
+        assert len(visited) == 1
+
+
+class TestRecursiveDescent:
+    @pytest.mark.parametrize("backend", ["interpreter", "codegen"])
+    @pytest.mark.parametrize("json_path,expected", [
+        ("$..author", ["Nigel Rees", "Evelyn Waugh", "Herman Melville", "J. R. R. Tolkien"]),
+        ("$.store..price", [8.95, 12.99, 8.99, 22.99, 19.95, 1299.99, 799.99]),
+        ("$..purchase_history[0].item", ["Moby Dick", "Sayings of the Century"]),
+        ("$.config..*", [
+            "Books & More", "USD", 0.08,
+            {"free_threshold": 50.0, "standard_rate": 5.99, "express_rate": 12.99},
+            "value with spaces",
+            {"books": "/api/v1/books", "users": "/api/v1/users", "orders": "/api/v1/orders"},
+            50.0, 5.99, 12.99, "/api/v1/books", "/api/v1/users", "/api/v1/orders",
+        ]),
+        ("$..nonexistent", []),
+    ])
+    def test_recursive(self, test_data, backend, json_path, expected):
+        plan = PathCache(backend=backend).get(json_path)
+        assert plan.evaluate(test_data) == expected
+        assert list(plan.iterate(test_data)) == expected
+
+    def test_child_results_follow_descendant_order(self):
+        data = {"a": {"b": {"a": 2}}, "c": [{"a": 3}]}
+        assert JSONPathEvaluator(data).select("$..a") == [{"b": {"a": 2}}, 2, 3]
+
+    def test_bare_descent_matches_wildcard(self, test_data):
+        evaluator = JSONPathEvaluator(test_data)
+        assert evaluator.select("$..") == evaluator.select("$..*")
+
+    @pytest.mark.parametrize("backend", ["interpreter", "codegen"])
+    def test_deep_nesting_does_not_recurse(self, backend):
+        depth = 50_000
+        data = leaf = {}
+        for _ in range(depth):
+            leaf["child"] = {}
+            leaf = leaf["child"]
+        leaf["target"] = "found"
+        plan = PathCache(backend=backend).get("$..target")
+        assert plan.evaluate(data) == ["found"]
+
+    def test_each_node_visited_once(self):
+        data = {"a": [{"b": 1}, {"b": [2, {"b": 3}]}]}
+        containers = list(iter_containers(data))
+        assert len(containers) == len({id(c) for c in containers}) == 6
+
+
+class TestFilters:
+    @pytest.mark.parametrize("backend", ["interpreter", "codegen"])
+    @pytest.mark.parametrize("json_path,expected", [
+        ("$.store.book[?(@.price < 10)].title", ["Sayings of the Century", "Moby Dick"]),
+        ("$.store.book[?@.price >= 12.99].price", [12.99, 22.99]),
+        ('$.store.book[?@.category == "fiction" && @.price < 20].title', ["Sword of Honour", "Moby Dick"]),
+        ('$.store.book[?@.category == "reference" || @.metadata.year < 1900].title',
+         ["Sayings of the Century", "Moby Dick"]),
+        ("$.store.book[?!(@.price < 20)].title", ["The Lord of the Rings"]),
+        ("$.store.book[?@.available == false].title", ["Sword of Honour"]),
+        ("$.store.electronics[?@.in_stock].brand", ["Apple", "Samsung"]),
+        ("$.store.electronics[?!@.missing].brand", ["Apple", "Samsung"]),
+        ("$.store.book[?@.tags[?@ == 'classic']].title", ["Sword of Honour", "Moby Dick"]),
+        ("$.store.book[?@.price < $.config.shipping.express_rate].title", ["Sayings of the Century", "Moby Dick"]),
+        ("$..[?@.price > 1000].model", ["MacBook Pro"]),
+        ("$.users[*].preferences[?@ == 25.0]", [25.0]),
+        ("$.store.book[?@.metadata == $.store.book[0].metadata].author", ["Nigel Rees"]),
+    ])
+    def test_filter(self, test_data, backend, json_path, expected):
+        plan = PathCache(backend=backend).get(json_path)
+        assert plan.evaluate(test_data) == expected
+
+    @pytest.mark.parametrize("json_path,expected", [
+        ("$[?@ == 1]", [1]),            # true is not a number
+        ("$[?@ == true]", [True]),
+        ("$[?@ == null]", [None]),
+        ("$[?@ < 2]", [1, 0.5]),        # strings and booleans are not ordered with numbers
+        ("$[?@ >= 'b']", ["b"]),
+        ("$[?@.x == @.y]", [1, True, None, 0.5, "b", {}]),  # Nothing == Nothing
+        ("$[?@.x < @.y]", []),
+        ("$[?@ != 1]", [True, None, 0.5, "b", {}]),
+    ])
+    def test_rfc_comparison_semantics(self, json_path, expected):
+        data = [1, True, None, 0.5, "b", {}]
+        assert JSONPathEvaluator(data).select(json_path) == expected
+
+    def test_non_singular_comparison_rejected(self):
+        with pytest.raises(LarkError):
+            PathCache().get("$[?@.a[*] == 1]")
+
+    def test_filter_on_scalar_selects_nothing(self):
+        assert JSONPathEvaluator({"a": 1}).select("$.a[?@ == 1]") == []
@@ -0,0 +1,84 @@
+import pytest
+
+from json_path_parser.cache import PathCache
+from json_path_parser.evaluator import JSONPathEvaluator
+from json_path_parser.explain import explain, explain_analyze
+from json_path_parser.formatting import format_name, format_path
+from json_path_parser.parsed_dataclasses import JSONPath
+
+
+class TestFormatting:
+    @pytest.mark.parametrize(
+        "path",
+        [
+            "$.store.book[*].title",
+            "$..book[-1]",
+            "$.store.book[0,2]",
+            "$.store.book[1:3]",
+            "$.store.book[::-1]",
+            "$..",
+            "$.store.book[?@.price < 10 && (@.category == 'fiction' || !@.isbn)].title",
+            "$.store.book[?!(@.price > $.expensive)]",
+            "$..[?@.tags[0] == \"cold\"].name",
+        ],
+    )
+    def test_formatted_path_selects_the_same(self, test_data, path):
+        formatted = format_path(JSONPath(PathCache().get(path).segments))
+        evaluator = JSONPathEvaluator(test_data)
+        assert evaluator.select(formatted) == evaluator.select(path)
+
+    def test_format_name_escapes(self):
+        assert format_name("it's") == "['it\\'s']"
+        assert format_name("a\\b\n\x01") == "['a\\\\b\\n\\u0001']"
+        assert format_path(JSONPath(PathCache().get("$.a['b c'][0]").segments)) == "$['a']['b c'][0]"
+
+
+class TestExplain:
+    def test_plan(self):
+        explanation = explain("$.store..price")
+        assert explanation.path == "$['store']..['price']"
+        assert explanation.backend == "interpreter"
+        assert explanation.notes == ("parsed by fast scanner",)
+        assert [(s.selector, s.kind) for s in explanation.segments] == [
+            ("['store']", "name"),
+            ("..['price']", "descendant name"),
+        ]
+        assert explanation.segments[1].notes == ("walks every container below the input",)
+        assert explanation.stats is None
+
+    def test_index_and_warnings(self, test_data):
+        explanation = JSONPathEvaluator(test_data, index=True).explain("$..*[?@.price]")
+        assert "bound to document index" in explanation.notes
+        assert explanation.segments[0].notes == ("document index: container range",)
+        assert explanation.warnings
+        assert not explain("$.store.book[?@.price]").warnings
+
+    def test_analyze(self):
+        document = {"a": [{"b": 1}, {"b": 2}, {"c": 3}], "d": {"b": 4}}
+        explanation = explain_analyze(document, "$..b")
+        (stats,) = explanation.stats
+        assert (stats.inputs, stats.outputs) == (1, 3)
+        assert stats.visited == 10
+        explanation = explain_analyze(document, "$.a[?@.b > 1].b")
+        assert [(s.inputs, s.outputs, s.visited) for s in explanation.stats] == [(1, 1, 1), (1, 1, 4), (1, 1, 1)]
+        assert explanation.seconds >= 0
+
+    def test_analyze_matches_select(self, test_data):
+        path = "$..book[?@.price < 10].title"
+        for index in (False, True):
+            evaluator = JSONPathEvaluator(test_data, index=index)
+            explanation = evaluator.explain_analyze(path)
+            assert explanation.stats[-1].outputs == len(evaluator.select(path))
+
+    def test_render(self, test_data):
+        text = str(JSONPathEvaluator(test_data).explain_analyze("$..*[?@.price < 10]"))
+        lines = text.splitlines()
+        assert lines[0].startswith("$..[*][?@['price'] < 10]  (interpreter")
+        assert "visited" in lines[1]
+        assert lines[-2].endswith("ms")
+        assert lines[-1].startswith("warning: ..[*] followed by")
+
+    def test_render_aligns_header_with_short_rows(self):
+        header, row = str(explain_analyze({"a": [1]}, "$.*.*")).splitlines()[1:3]
+        assert header.index("segment") == row.index("[*]")
+        assert header.index("kind") == row.index("wildcard")
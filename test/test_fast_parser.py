@@ -0,0 +1,121 @@
+import os
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import json_path_parser
+from json_path_parser.cache import PathCache
+from json_path_parser.fast_parser import parse_fast
+from json_path_parser.parser import create_parser
+from json_path_parser.transformer import JSONPathTransformer
+
+SRC = str(Path(json_path_parser.__file__).parent.parent)
+
+
+def run_python(code):
+    env = {**os.environ, "PYTHONPATH": SRC}
+    result = subprocess.run([sys.executable, "-c", code], env=env, capture_output=True, text=True, check=True)
+    return result.stdout.strip()
+
+
+SIMPLE_PATHS = [
+    "$",
+    "$.a",
+    "$.store.book",
+    "$.*",
+    "$.a.*.b_2",
+    "$._x",
+    "$.true",
+    "$.users[0].name",
+    '$.config["special-key"]',
+    "$['a \"quoted\" name']",
+    "$['']",
+    "$['\u00e9']",
+    "$[-1]",
+    "$[+2]",
+    "$[007]",
+    "$[*]",
+    "$[0][1]",
+    "$[1,-2,3]",
+    "$[1:]",
+    "$[:2]",
+    "$[::2]",
+    "$[1:2:]",
+    "$[:]",
+    "$[-1::-1]",
+    "$..a",
+    "$..*",
+    "$..[0]",
+    "$..['x']",
+    "$..[*]",
+    "$..[1:2]",
+    "$.a..b[0].c",
+]
+
+
+class TestFastParser:
+    @pytest.mark.parametrize("path", SIMPLE_PATHS)
+    def test_matches_grammar(self, path):
+        expected = JSONPathTransformer().transform(create_parser().parse(path))
+        assert parse_fast(path) == expected
+
+    @pytest.mark.parametrize(
+        "path",
+        [
+            "$[?@.a]",
+            "$. a",
+            "$[ 0 ]",
+            "$['a\\'b']",
+            '$["\\u0041"]',
+            "$..",
+            "$...a",
+            "$.1a",
+            "$.a.",
+            "$[1.5]",
+            "a.b",
+            "",
+        ],
+    )
+    def test_declines_other_paths(self, path):
+        assert parse_fast(path) is None
+
+    def test_cache_falls_back_to_grammar(self):
+        cache = PathCache()
+        assert cache.get("$[ 0 ]").segments == cache.get("$[0]").segments
+        with pytest.raises(Exception, match="Unexpected"):
+            cache.get("$.a.")
+
+
+class TestColdStart:
+    def test_import_does_not_load_lark(self):
+        code = (
+            "import sys, json_path_parser as j\n"
+            "before = 'lark' in sys.modules\n"
+            "assert j.JSONPathEvaluator({'a': {'b': 1}}).select('$.a.b') == [1]\n"
+            "print(before, 'lark' in sys.modules)\n"
+        )
+        assert run_python(code) == "False False"
+
+    def test_grammar_loaded_on_demand(self):
+        code = (
+            "import sys, json_path_parser as j\n"
+            "assert j.JSONPathEvaluator({'a': [1]}).select('$.a[?@ == 1]') == [1]\n"
+            "print('lark' in sys.modules)\n"
+        )
+        assert run_python(code) == "True"
+
+    def test_import_leaves_logging_unconfigured(self):
+        code = (
+            "import logging, json_path_parser\n"
+            "from json_path_parser.logger import logger\n"
+            "print(len(logging.getLogger().handlers), logger.getEffectiveLevel())\n"
+        )
+        assert run_python(code) == "0 30"
+
+    def test_lazy_exports(self):
+        assert set(json_path_parser.__all__) <= set(dir(json_path_parser))
+        assert json_path_parser.compile("$.a") is json_path_parser.compile("$.a")
+        with pytest.raises(AttributeError):
+            json_path_parser.missing  # noqa: B018
@@ -0,0 +1,140 @@
+import copy
+
+import pytest
+
+from json_path_parser.evaluator import JSONPathEvaluator
+from json_path_parser.index import DocumentIndex
+
+PATHS = [
+    "$..price",
+    "$..author",
+    "$..*",
+    "$..[0]",
+    "$..[-1]",
+    "$..tags[0]",
+    "$.store..price",
+    "$..book[?@.price < 10].title",
+    "$..[?@.price > 100].model",
+    "$..['special-key']",
+    "$.store.book[*].title",
+]
+
+
+class TestDocumentIndex:
+    @pytest.mark.parametrize("path", PATHS)
+    def test_matches_unindexed(self, test_data, path):
+        indexed = JSONPathEvaluator(test_data, index=True)
+        assert indexed.select(path) == JSONPathEvaluator(test_data).select(path)
+        assert list(indexed.iter_select(path)) == JSONPathEvaluator(test_data).select(path)
+
+    def test_tables(self):
+        document = {"a": [1, {"b": 2}, []], "b": {"b": None}}
+        index = DocumentIndex(document)
+        assert index.containers == [document, document["a"], document["a"][1], document["a"][2], document["b"]]
+        assert index.ends == [5, 4, 3, 4, 5]
+        assert index.lengths == [2, 3, 1, 0, 1]
+        assert index.tags == b"oaoao"
+        assert index.with_key(document, "b") == [document, document["a"][1], document["b"]]
+        assert index.with_key(document["a"], "b") == [document["a"][1]]
+        assert index.arrays(document, min_length=1) == [document["a"]]
+        assert index.with_key({"b": 1}, "b") is None
+
+    def test_recursive_queries_do_not_walk(self, test_data, monkeypatch):
+        evaluator = JSONPathEvaluator(test_data, index=True)
+        expected = {path: JSONPathEvaluator(test_data).select(path) for path in ("$..price", "$..*", "$..[0]")}
+
+        def no_walk(_value):
+            raise AssertionError
+
+        monkeypatch.setattr("json_path_parser.plan.iter_containers", no_walk)
+        monkeypatch.setattr("json_path_parser.index.iter_containers", no_walk)
+        for path, values in expected.items():
+            assert evaluator.select(path) == values
+
+    def test_plans_without_recursion_are_not_rebound(self, test_data):
+        index = JSONPathEvaluator(test_data, index=True).index
+        plan = JSONPathEvaluator(test_data)._plan("$.store.book[0]")  # noqa: SLF001
+        assert index.bind(plan) is plan
+
+    def test_stale_until_rebuilt(self, test_data):
+        data = copy.deepcopy(test_data)
+        evaluator = JSONPathEvaluator(data, index=True)
+        before = evaluator.select("$..price")
+        data["store"]["book"].append({"title": "New", "price": 1})
+        assert evaluator.select("$..price") == before
+        evaluator.rebuild_index("$.store.book")
+        assert evaluator.select("$..price") == JSONPathEvaluator(data).select("$..price")
+        data["extra"] = {"price": 2}
+        evaluator.rebuild_index()
+        assert evaluator.select("$..price")[-1] == 2
+
+    def test_refresh_shifts_positions(self):
+        document = {"a": [{"x": 1}], "b": {"x": 2}}
+        index = DocumentIndex(document)
+        document["a"].append({"x": 3, "y": [{"x": 4}]})
+        assert index.refresh(document["a"])
+        assert index.ends == [7, 6, 3, 6, 6, 6, 7]
+        assert [obj["x"] for obj in index.with_key(document, "x")] == [1, 3, 4, 2]
+        assert index.refresh({"x": 1}) is False
+
+    @pytest.mark.parametrize(
+        "change",
+        [
+            lambda doc: doc["a"].append({"x": 3, "y": [{"x": 4}]}),
+            lambda doc: doc["a"].clear(),
+            lambda doc: doc["a"][0].update(z=[[], {"w": 0}]),
+            lambda doc: doc["a"][0].pop("x"),
+            lambda doc: doc["a"].__setitem__(0, {"x": 5}),
+        ],
+    )
+    def test_refresh_matches_fresh_build(self, change):
+        document = {"k": {"x": 0}, "a": [{"x": 1}], "b": {"x": 2, "c": [{"x": 3}]}}
+        index = DocumentIndex(document)
+        change(document)
+        assert index.refresh(document["a"])
+        fresh = DocumentIndex(document)
+        assert [id(c) for c in index.containers] == [id(c) for c in fresh.containers]
+        assert (index.ends, index.lengths, index.tags) == (fresh.ends, fresh.lengths, fresh.tags)
+        assert index._keys == fresh._keys  # noqa: SLF001
+        assert index._arrays == fresh._arrays  # noqa: SLF001
+        assert all(index.position(c) == p for p, c in enumerate(fresh.containers))
+
+    def test_refresh_walks_only_the_subtree(self, monkeypatch):
+        document = {"a": [{"x": 1}], "b": [{"x": i} for i in range(100)]}
+        index = DocumentIndex(document)
+        document["a"].append({"x": 2})
+        walked = []
+        monkeypatch.setattr(DocumentIndex, "_derive", lambda _self: walked.append("derive"))
+        assert index.refresh(document["a"])
+        assert walked == []
+        assert [obj["x"] for obj in index.with_key(document, "x")][:3] == [1, 2, 0]
+
+    def test_refresh_declines_shared_containers(self):
+        shared = [1, 2]
+        evaluator = JSONPathEvaluator({"a": shared, "b": shared}, index=True)
+        assert evaluator.select("$..[1]") == [2, 2]
+        assert evaluator.index.refresh(shared) is False
+        shared.pop()
+        evaluator.rebuild_index("$.a")
+        assert evaluator.select("$..[1]") == []
+        assert evaluator.index.lengths == [2, 1, 1]
+
+    def test_refresh_declines_containers_it_made_shared(self):
+        document = {"a": {}, "b": {}}
+        index = DocumentIndex(document)
+        shared = [{"x": 1}]
+        document["a"]["v"] = document["b"]["v"] = shared
+        assert index.refresh(document["a"])
+        assert index.refresh(document["b"])
+        assert index.refresh(shared) is False
+        assert index.refresh(shared[0]) is False
+        assert index.refresh(document["a"]) is False
+
+    def test_assigning_data_discards_index(self):
+        evaluator = JSONPathEvaluator({"a": {"k": 1}}, index=True)
+        assert evaluator.select("$..k") == [1]
+        evaluator.json_data = {"b": {"k": 2}}
+        assert evaluator.select("$..k") == [2]
+
+    def test_unindexed_evaluator_has_no_index(self):
+        assert JSONPathEvaluator({}).index is None
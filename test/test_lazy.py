@@ -0,0 +1,74 @@
+import copy
+import json
+from pathlib import Path
+
+import pytest
+
+from json_path_parser.cache import PathCache
+from json_path_parser.evaluator import JSONPathEvaluator
+from json_path_parser.lazy import LazyArray, LazyDocument, LazyObject, materialize
+
+DATA_FILE = Path(__file__).parent / "data" / "test_data.json"
+
+PATHS = [
+    "$",
+    "$.store.book[*].author",
+    "$.store.book[-1].title",
+    "$.store.book[::-1].price",
+    "$..price",
+    "$..*",
+    "$.store.book[?@.price < 10].title",
+    "$..[?@.price > 100].model",
+    '$.config["special-key"]',
+]
+
+
+@pytest.fixture
+def document():
+    with LazyDocument(DATA_FILE) as document:
+        yield document
+
+
+class TestLazyDocument:
+    @pytest.mark.parametrize("path", PATHS)
+    @pytest.mark.parametrize("backend", ["interpreter", "codegen"])
+    def test_matches_loaded_document(self, document, test_data, path, backend):
+        plan = PathCache(backend=backend).get(path)
+        assert JSONPathEvaluator(document.root).select(plan) == JSONPathEvaluator(test_data).select(plan)
+
+    def test_views_are_dicts_and_lists(self, document, test_data):
+        assert isinstance(document.root, LazyObject)
+        assert isinstance(document.root["store"]["book"], LazyArray)
+        assert document.root == test_data
+        assert materialize(document.root) == test_data
+        assert type(copy.deepcopy(document.root)) is dict
+
+    def test_only_touched_containers_are_decoded(self, document):
+        evaluator = JSONPathEvaluator(document.root)
+        assert evaluator.select("$.store.book[0].title") == ["Sayings of the Century"]
+        users = dict.__getitem__(document.root, "users")
+        assert list.__len__(users) == 0  # not decoded yet
+        assert len(users) == 2
+
+    def test_from_bytes(self):
+        document = LazyDocument(b' {"a]": "[{", "b": [1.5, true, null, "\\u00e9"]} ')
+        assert materialize(document.root) == {"a]": "[{", "b": [1.5, True, None, "é"]}
+        assert LazyDocument(b"5").root == 5
+
+    def test_deeply_nested(self):
+        text = b"[" * 300 + b"1" + b"]" * 300
+        assert materialize(LazyDocument(text).root) == json.loads(text)
+
+    @pytest.mark.parametrize(
+        "text",
+        [b'{"a": [1}', b"[1]]", b"[[1]", b'{"a": 1} x', b'{"a" 1}', b"[1 2]"],
+    )
+    def test_malformed(self, text):
+        with pytest.raises(ValueError, match="offset"):
+            materialize(LazyDocument(text).root)
+
+    def test_empty_file(self, tmp_path):
+        path = tmp_path / "empty.json"
+        path.write_bytes(b"")
+        with pytest.raises(ValueError, match="empty"):
+            LazyDocument(path)
@@ -0,0 +1,80 @@
+import pytest
+
+from json_path_parser.cache import compile as compile_path
+from json_path_parser.evaluator import JSONPathEvaluator
+from json_path_parser.locations import Location
+
+PATHS = [
+    "$",
+    "$.store.book[*].title",
+    "$['store']['book'][-1]",
+    "$.store.book[0,-1,0].price",
+    "$.store.book[1:3].title",
+    "$.store.book[::-2].title",
+    "$.store.book[?@.price < 10].title",
+    "$..price",
+    "$..*",
+    "$..[0]",
+    "$..book[?@.isbn]",
+    "$.users[*].purchase_history[-1:].item",
+    '$.config["special-key"]',
+    "$.missing.deeper",
+]
+
+
+class TestLocate:
+    @pytest.mark.parametrize("path", PATHS)
+    def test_values_match_select(self, test_data, path):
+        evaluator = JSONPathEvaluator(test_data)
+        values = evaluator.select(path)
+        locations = evaluator.locate(path)
+        assert len(locations) == len(values)
+        assert all(location.value is value for location, value in zip(locations, values))
+        assert [location.value for location in evaluator.iter_locate(path)] == values
+
+    @pytest.mark.parametrize("path", PATHS)
+    def test_normalized_paths_select_their_value(self, test_data, path):
+        evaluator = JSONPathEvaluator(test_data)
+        for location in evaluator.locate(path):
+            assert evaluator.select(location.path) == [location.value]
+
+    def test_normalized_form(self, test_data):
+        evaluator = JSONPathEvaluator(test_data)
+        (location,) = evaluator.locate("$.store.book[-1].title")
+        last = len(test_data["store"]["book"]) - 1
+        assert location.path == f"$['store']['book'][{last}]['title']"
+        assert location.keys == ("store", "book", last, "title")
+        assert str(location) == location.path
+        assert repr(location) == f"Location({location.path!r})"
+
+    def test_names_escaped(self):
+        document = {"it's": {"a\nb": 1}}
+        (location,) = JSONPathEvaluator(document).locate("$.*.*")
+        assert location.path == "$['it\\'s']['a\\nb']"
+
+    def test_root(self):
+        (location,) = JSONPathEvaluator({"a": 1}).locate("$")
+        assert (location.parent, location.key, location.path) == (None, None, "$")
+
+    def test_prefixes_shared(self, test_data):
+        locations = JSONPathEvaluator(test_data).locate("$.store.book[*].title")
+        # A Location is its (parent, key, value) node; parents are shared nodes.
+        books = {id(location[0][0]) for location in locations}
+        assert len(books) == 1
+        assert locations[0].parent.parent.keys == ("store", "book")
+
+    def test_limit(self, test_data):
+        locations = JSONPathEvaluator(test_data).locate("$..price", limit=2)
+        assert [location.path for location in locations] == [
+            location.path for location in JSONPathEvaluator(test_data).locate("$..price")[:2]
+        ]
+
+    def test_indexed_evaluator_same_locations(self, test_data):
+        indexed = JSONPathEvaluator(test_data, index=True)
+        plain = JSONPathEvaluator(test_data)
+        assert [str(loc) for loc in indexed.locate("$..title")] == [str(loc) for loc in plain.locate("$..title")]
+
+    def test_located_steps_compiled_once(self, test_data):
+        plan = compile_path("$.store")
+        assert plan.located_steps is plan.located_steps
+        assert isinstance(plan.locate(test_data)[0], Location)
@@ -0,0 +1,104 @@
+import pytest
+
+from json_path_parser import metrics
+from json_path_parser.cache import PathCache
+from json_path_parser.evaluator import JSONPathEvaluator
+from json_path_parser.metrics import Histogram, MetricsRegistry
+
+
+@pytest.fixture
+def registry():
+    registry = metrics.enable(MetricsRegistry())
+    yield registry
+    metrics.disable()
+
+
+class TestMetrics:
+    def test_disabled_by_default(self):
+        assert metrics.active is None
+
+    def test_parse_and_compile(self, registry):
+        cache = PathCache()
+        cache.get("$.a[0]")
+        cache.get("$.a[?@.b]")
+        with pytest.raises(Exception):  # noqa: B017, PT011
+            cache.get("$.a[")
+        assert registry.parse_seconds.count(("fast",)) == 1
+        assert registry.parse_seconds.count(("lark",)) == 1
+        assert registry.transform_seconds.count() == 1
+        assert registry.compile_seconds.count(("interpreter",)) == 2
+        assert registry.parse_errors.value() == 1
+
+    def test_evaluation(self, registry, test_data):
+        evaluator = JSONPathEvaluator(test_data)
+        books = evaluator.select("$.store.book[*].title")
+        evaluator.select("$.store.book[*].title")
+        labels = ("$.store.book[*].title",)
+        assert registry.evaluate_seconds.count(labels) == 2
+        assert registry.result_size.sum(labels) == 2 * len(books)
+        # root (``.store.book`` is one step), the book array and each book
+        assert registry.nodes_visited.sum(labels) == 2 * (2 + len(books))
+
+    def test_every_entry_point_recorded(self, registry):
+        evaluator = JSONPathEvaluator({"a": [1, 2, 3]})
+        evaluator.select("$.a[*]", limit=1)
+        assert list(evaluator.iter_select("$.a[*]")) == [1, 2, 3]
+        evaluator.first("$.a[*]")
+        evaluator.exists("$.a[*]")
+        evaluator.count("$.a[*]")
+        evaluator.locate("$.a[*]")
+        evaluator.locate("$.a[*]", limit=2)
+        evaluator.select_batch(["$.a[*]"])
+        labels = ("$.a[*]",)
+        assert registry.evaluate_seconds.count(labels) == 8
+        assert registry.result_size.sum(labels) == 1 + 3 + 1 + 1 + 3 + 3 + 2 + 3
+        # the root enters ``.a`` and the array enters ``[*]``
+        assert registry.nodes_visited.sum(labels) == 8 * 2
+
+    def test_select_many_is_one_query(self, registry):
+        evaluator = JSONPathEvaluator({"a": {"b": 1, "c": 2}})
+        evaluator.select_many({"b": "$.a.b", "c": "$.a.c"})
+        labels = ("$.a.b, $.a.c",)
+        assert registry.evaluate_seconds.count(labels) == 1
+        assert registry.result_size.sum(labels) == 2
+        # The root enters the shared ``a`` step, then ``a`` enters both names.
+        assert registry.nodes_visited.sum(labels) == 3
+
+    def test_results_unchanged(self, registry, test_data):
+        path = "$..book[?@.price < 10].title"
+        with_metrics = JSONPathEvaluator(test_data).select(path)
+        metrics.disable()
+        assert JSONPathEvaluator(test_data).select(path) == with_metrics
+
+    def test_series_are_bounded(self):
+        histogram = Histogram("h", "help", ("path",), max_series=2)
+        for path in ("a", "b", "c", "d"):
+            histogram.observe(1, (path,))
+        histogram.observe(1, ("a",))
+        assert histogram.count(("a",)) == 2
+        assert histogram.count(("__other__",)) == 2
+
+    def test_export(self, registry):
+        cache = PathCache()
+        registry.watch_cache(cache, "test")
+        cache.get("$.a")
+        cache.get("$.a")
+        cache.get("$.a").evaluate({"a": 1})
+        exported = registry.as_dict()
+        hits = exported["jsonpath_cache_hits_total"]["samples"]
+        assert hits == [{"name": "jsonpath_cache_hits_total", "labels": {"cache": "test"}, "value": 2}]
+        assert exported["jsonpath_evaluate_seconds"]["type"] == "histogram"
+
+        text = registry.to_prometheus()
+        assert "# TYPE jsonpath_evaluate_seconds histogram" in text
+        assert 'jsonpath_evaluate_seconds_count{path="$.a"} 1' in text
+        assert 'jsonpath_result_size_bucket{path="$.a",le="1"} 1' in text
+        assert 'jsonpath_cache_hit_ratio{cache="test"} 0.6666666666666666' in text
+        assert text.endswith("\n")
+
+    def test_reset_and_kind_conflicts(self, registry):
+        registry.parse_errors.inc()
+        registry.reset()
+        assert registry.parse_errors.value() == 0
+        with pytest.raises(ValueError, match="counter"):
+            registry.histogram("jsonpath_parse_errors_total", "help")
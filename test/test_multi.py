@@ -0,0 +1,67 @@
+from json_path_parser.evaluator import JSONPathEvaluator
+from json_path_parser.multi import MultiPlan
+
+PATHS = {
+    "titles": "$.store.book[*].title",
+    "prices": "$.store.book[*].price",
+    "cheap": "$.store.book[?@.price < 10].title",
+    "first_author": "$.store.book[0].author",
+    "threshold": "$.config.shipping.free_threshold",
+    "special": '$.config["special-key"]',
+    "authors": "$..author",
+    "root": "$",
+    "missing": "$.store.missing.deeper",
+}
+
+
+class TestSelectMany:
+    def test_matches_individual_selects(self, test_data):
+        evaluator = JSONPathEvaluator(test_data)
+        results = evaluator.select_many(PATHS)
+        assert list(results) == list(PATHS)
+        for name, path in PATHS.items():
+            assert results[name] == evaluator.select(path), name
+
+    def test_duplicate_paths_get_independent_lists(self, test_data):
+        results = JSONPathEvaluator(test_data).select_many({"a": "$.users[*].id", "b": "$.users[*].id"})
+        assert results["a"] == results["b"] == [1, 2]
+        assert results["a"] is not results["b"]
+
+    def test_prebuilt_plan_is_reusable(self):
+        plan = MultiPlan.from_paths({"x": "$.a.x", "y": "$.a.y"})
+        assert JSONPathEvaluator({"a": {"x": 1, "y": 2}}).select_many(plan) == {"x": [1], "y": [2]}
+        assert JSONPathEvaluator({"a": {"x": 3}}).select_many(plan) == {"x": [3], "y": []}
+
+    def test_shared_prefix_traversed_once(self):
+        lookups = []
+
+        class Tracking(dict):
+            def __contains__(self, key):
+                lookups.append(key)
+                return super().__contains__(key)
+
+        data = Tracking(store=Tracking(book=[{"title": "t", "price": 1}]))
+        JSONPathEvaluator(data).select_many({
+            "titles": "$.store.book[*].title",
+            "prices": "$.store.book[*].price",
+        })
+        assert lookups == ["store", "book"]
+
+    def test_paths_diverging_inside_a_name_chain_share_its_prefix(self):
+        lookups = []
+
+        class Tracking(dict):
+            def __contains__(self, key):
+                lookups.append(key)
+                return super().__contains__(key)
+
+        data = Tracking(store=Tracking(book=[{"title": "t"}], bicycle=Tracking(color="red", gear=Tracking(n=3))))
+        paths = {
+            "titles": "$.store.book[*].title",
+            "color": "$.store.bicycle.color",
+            "gears": "$.store.bicycle.gear.n",
+        }
+        assert JSONPathEvaluator(data).select_many(paths) == {"titles": ["t"], "color": ["red"], "gears": [3]}
+        assert lookups.count("store") == 1
+        assert lookups.count("bicycle") == 1
+
@@ -0,0 +1,151 @@
+import copy
+
+import pytest
+
+from json_path_parser.evaluator import JSONPathEvaluator
+from json_path_parser.index import DocumentIndex
+from json_path_parser.mutation import delete_values, set_values, update_values
+
+
+@pytest.fixture
+def document():
+    return {
+        "a": [0, 1, 2, 3, 4, 5],
+        "b": {"c": 1, "d": {"c": 2}},
+        "items": [{"id": 1, "secret": "x"}, {"id": 2}, {"id": 3, "secret": "y"}],
+    }
+
+
+class TestSet:
+    def test_in_place(self, document):
+        items = document["items"]
+        assert set_values(document, "$.items[*].secret", "***") is document
+        assert document["items"] is items
+        assert [item.get("secret") for item in items] == ["***", None, "***"]
+
+    def test_no_members_created(self, document):
+        set_values(document, "$.b.missing", 1)
+        assert "missing" not in document["b"]
+
+    def test_negative_index(self, document):
+        set_values(document, "$.a[-1]", "last")
+        assert document["a"][-1] == "last"
+        assert len(document["a"]) == 6
+
+    def test_recursive(self, document):
+        set_values(document, "$..c", 0)
+        assert document["b"] == {"c": 0, "d": {"c": 0}}
+
+    def test_root(self, document):
+        assert set_values(document, "$", [1]) == [1]
+
+
+class TestUpdate:
+    def test_applies_function(self, document):
+        update_values(document, "$.a[1:4]", lambda n: n * 10)
+        assert document["a"] == [0, 10, 20, 30, 4, 5]
+
+    def test_duplicates_updated_once(self, document):
+        update_values(document, "$.a[0,0,-6]", lambda n: n + 1)
+        assert document["a"][0] == 1
+
+    def test_innermost_first(self):
+        document = {"x": {"x": {"x": 1}}}
+        seen = []
+
+        def record(value):
+            seen.append(copy.deepcopy(value))
+            return {"wrapped": value} if isinstance(value, dict) else value
+
+        update_values(document, "$..x", record)
+        assert seen == [1, {"x": 1}, {"x": {"wrapped": {"x": 1}}}]
+
+    def test_root(self):
+        assert update_values(3, "$", lambda n: n + 1) == 4
+
+
+class TestDelete:
+    @pytest.mark.parametrize(
+        ("path", "expected"),
+        [
+            ("$.a[1:5:2]", [0, 2, 4, 5]),
+            ("$.a[::-2]", [0, 2, 4]),
+            ("$.a[4,0,4,-1]", [1, 2, 3]),
+            ("$.a[?@ > 2]", [0, 1, 2]),
+            ("$.a[*]", []),
+            ("$.a[10]", [0, 1, 2, 3, 4, 5]),
+        ],
+    )
+    def test_array_items(self, document, path, expected):
+        delete_values(document, path)
+        assert document["a"] == expected
+
+    def test_members(self, document):
+        delete_values(document, "$.items[*].secret")
+        assert document["items"] == [{"id": 1}, {"id": 2}, {"id": 3}]
+
+    def test_nested_matches(self, document):
+        delete_values(document, "$..c")
+        assert document["b"] == {"d": {}}
+        delete_values(document, "$..*")
+        assert document == {}
+
+    def test_root_rejected(self, document):
+        before = copy.deepcopy(document)
+        with pytest.raises(ValueError, match="root"):
+            delete_values(document, "$")
+        assert document == before
+
+    def test_matches_recomputed_selection(self, test_data):
+        path = "$.store.book[?@.price < 10]"
+        expected = [book for book in test_data["store"]["book"] if not book["price"] < 10]
+        delete_values(test_data, path)
+        assert test_data["store"]["book"] == expected
+
+
+class TestIndexMaintenance:
+    @pytest.mark.parametrize(
+        "change",
+        [
+            lambda doc, index: set_values(doc, "$.b.d", {"c": 3, "e": [1]}, index=index),
+            lambda doc, index: delete_values(doc, "$.items[0,2]", index=index),
+            lambda doc, index: delete_values(doc, "$..c", index=index),
+            lambda doc, index: update_values(doc, "$..*", lambda v: v, index=index),
+            lambda doc, index: set_values(doc, "$.items[*].id", {"c": 9}, index=index),
+        ],
+    )
+    def test_index_matches_fresh_build(self, document, change):
+        index = DocumentIndex(document)
+        change(document, index)
+        fresh = DocumentIndex(document)
+        assert [id(c) for c in index.containers] == [id(c) for c in fresh.containers]
+        assert index.ends == fresh.ends
+        assert index.with_key(document, "c") == fresh.with_key(document, "c")
+
+
+    def test_shared_value_then_delete(self):
+        evaluator = JSONPathEvaluator({"a": {}, "b": {}}, index=True)
+        evaluator.set("$.*", [1, 2])
+        assert evaluator.select("$..[1]") == [2, 2]
+        evaluator.delete("$.a[1]")
+        assert evaluator.json_data == {"a": [1], "b": [1]}
+        assert evaluator.select("$..[1]") == []
+        assert evaluator.index.lengths == DocumentIndex(evaluator.json_data).lengths
+
+
+class TestEvaluator:
+    def test_methods(self, document):
+        evaluator = JSONPathEvaluator(document, index=True)
+        assert evaluator.select("$..c") == [1, 2]
+        evaluator.set("$..c", 7)
+        assert evaluator.select("$..c") == [7, 7]
+        evaluator.update("$.a[*]", str)
+        assert evaluator.select("$.a[0]") == ["0"]
+        evaluator.delete("$.b.d")
+        assert evaluator.select("$..c") == [7]
+        assert evaluator.json_data is document
+
+    def test_root_replaced(self):
+        evaluator = JSONPathEvaluator({"a": 1}, index=True)
+        evaluator.set("$", {"b": {"a": 2}})
+        assert evaluator.select("$..a") == [2]
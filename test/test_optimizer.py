@@ -0,0 +1,157 @@
+import io
+import json
+
+import pytest
+
+from json_path_parser.cache import PathCache
+from json_path_parser.evaluator import JSONPathEvaluator
+from json_path_parser.explain import explain
+from json_path_parser.optimizer import expand, optimize
+from json_path_parser.parsed_dataclasses import (
+    BracketSelector,
+    ExistenceTest,
+    Field,
+    FieldChain,
+    FilterQuery,
+    FilterSelector,
+    Index,
+    IndexList,
+    RecursiveSelector,
+    Slice,
+)
+from json_path_parser.parser import create_parser
+from json_path_parser.plan import QueryPlan
+from json_path_parser.streaming import stream_select
+from json_path_parser.transformer import JSONPathTransformer
+
+PATHS = [
+    "$.store.book[*].title",
+    "$['store']['book'][*]['author']",
+    "$.store['bicycle'].color",
+    "$.store.book[0,0,1].title",
+    "$.store.book[2,0,2].price",
+    "$.store.book[0:].price",
+    "$.store.book[::1].price",
+    "$.store.book[0::1].title",
+    "$.store.book[:].tags[0]",
+    "$.store.book[0:2:1].title",
+    "$.store.book[0::-1].title",
+    "$.store.book[::-1].price",
+    "$.store.book[*][0]",
+    "$..",
+    "$..[*]",
+    "$..['price']",
+    "$..book[0:]",
+    "$.store.book[?@.tags[0,0,1]].title",
+    "$.store.book[?@.tags[1,0] && @['price'] < 10].title",
+    "$.store.book[?!@.isbn].title",
+    "$.store.book[?@['price'] > $['expensive']].title",
+    "$.users[*].purchase_history[*].item",
+    "$.users[?@.purchase_history[?@['price'] > 10]].name",
+    '$.config["special-key"]',
+    "$.store.missing.deeper",
+]
+
+_parser = create_parser()
+
+
+def parse(path_str):
+    return JSONPathTransformer().transform(_parser.parse(path_str))
+
+
+class TestRewrites:
+    def test_fuses_member_names(self):
+        path = optimize(parse("$.store['book'][*].title.text"))
+        assert path.segments == (
+            FieldChain(names=("store", "book")),
+            Field(name="*", wildcard=True),
+            FieldChain(names=("title", "text")),
+        )
+
+    def test_single_name_stays_a_field(self):
+        assert optimize(parse("$.a[0]")).segments[0] == Field(name="a")
+
+    def test_recursive_selectors_normalized(self):
+        assert optimize(parse("$..")).segments == (RecursiveSelector(name=Field(name="*", wildcard=True)),)
+        assert optimize(parse("$..['a']")) == optimize(parse("$..a"))
+
+    @pytest.mark.parametrize("slice_text", ["[:]", "[0:]", "[::1]", "[0::1]"])
+    def test_full_slices_canonical(self, slice_text):
+        (segment,) = optimize(parse(f"${slice_text}")).segments
+        assert segment == BracketSelector(content=Slice(start=None, end=None, step=None))
+
+    def test_reverse_slice_from_zero_kept(self):
+        (segment,) = optimize(parse("$[0::-1]")).segments
+        assert segment.content == Slice(start=0, end=None, step=-1)
+
+    def test_index_lists_kept_outside_existence_tests(self):
+        (segment,) = optimize(parse("$[2,0,2]")).segments
+        assert segment.content == IndexList(indices=(2, 0, 2))
+
+    @pytest.mark.parametrize(
+        ("path", "selector"),
+        [
+            ("$[?@.tags[1,0,1]]", IndexList(indices=(0, 1))),
+            ("$[?@.tags[3,3]]", Index(idx=3)),
+        ],
+    )
+    def test_index_lists_in_existence_tests(self, path, selector):
+        (segment,) = optimize(parse(path)).segments
+        filter_selector = segment.content if isinstance(segment, BracketSelector) else segment
+        assert isinstance(filter_selector, FilterSelector)
+        assert filter_selector.expression == ExistenceTest(
+            query=FilterQuery(segments=(Field(name="tags"), BracketSelector(content=selector)))
+        )
+
+    @pytest.mark.parametrize("path", PATHS)
+    def test_idempotent(self, path):
+        once = optimize(parse(path))
+        assert optimize(once) == once
+
+    def test_expand(self):
+        segments = optimize(parse("$.a.b[0].c")).segments
+        assert expand(segments) == (Field(name="a"), Field(name="b"), BracketSelector(content=Index(idx=0)), Field(name="c"))
+
+    def test_original_path_untouched(self):
+        path = parse("$['a']['b']")
+        QueryPlan.from_path(path)
+        assert len(path.segments) == 2
+
+
+class TestSameResults:
+    @pytest.mark.parametrize("backend", ["interpreter", "codegen"])
+    @pytest.mark.parametrize("path", PATHS)
+    def test_evaluate(self, test_data, path, backend):
+        ast = parse(path)
+        plain = QueryPlan.from_path(ast, backend, optimize=False)
+        optimized = QueryPlan.from_path(ast, backend)
+        assert optimized.evaluate(test_data) == plain.evaluate(test_data)
+        assert list(optimized.iterate(test_data)) == plain.evaluate(test_data)
+
+    @pytest.mark.parametrize("path", PATHS)
+    def test_indexed(self, test_data, path):
+        expected = QueryPlan.from_path(parse(path), optimize=False).evaluate(test_data)
+        assert JSONPathEvaluator(test_data, index=True).select(path) == expected
+
+    # Streaming orders nested recursive matches differently and rejects
+    # filters on the root, see StreamingQuery.
+    @pytest.mark.parametrize("path", [p for p in PATHS if p not in ("$..", "$..[*]") and "$[" not in p])
+    def test_streaming(self, test_data, path):
+        source = io.StringIO(json.dumps(test_data))
+        assert stream_select(path, source, chunk_size=7) == JSONPathEvaluator(test_data).select(path)
+
+    def test_select_many_shares_chains(self, test_data):
+        results = JSONPathEvaluator(test_data).select_many({"a": "$.store.book[*].title", "b": "$['store']['book'][*]['price']"})
+        plain = QueryPlan.from_path(parse("$.store.book[*].price"), optimize=False)
+        assert results["b"] == plain.evaluate(test_data)
+
+    def test_full_slice_does_not_copy(self):
+        items = [1, 2]
+        (step,) = PathCache().get("$[0:]").steps
+        assert step(items, items) is items
+
+    def test_explain_shows_chain(self):
+        explanation = explain("$.store.book[0]")
+        assert explanation.path == "$['store']['book'][0]"
+        assert [segment.kind for segment in explanation.segments] == ["name chain", "index"]
+        assert explanation.segments[0].notes == ("direct lookup",)
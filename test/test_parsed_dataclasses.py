@@ -0,0 +1,50 @@
+import dataclasses
+
+import pytest
+
+from json_path_parser.cache import PathCache
+from json_path_parser.evaluator import JSONPathEvaluator
+from json_path_parser.parsed_dataclasses import Field, IndexList, JSONPath, Literal
+
+
+def parse(path_str):
+    return PathCache(maxsize=0).get(path_str).segments
+
+
+class TestImmutableAst:
+    def test_nodes_are_frozen_and_slotted(self):
+        field = Field(name="a")
+        with pytest.raises(dataclasses.FrozenInstanceError):
+            field.name = "b"
+        assert not hasattr(field, "__dict__")
+
+    def test_sequences_are_tuples(self):
+        assert JSONPath(segments=[Field(name="a")]).segments == (Field(name="a"),)
+        assert IndexList(indices=[1, 2]) == IndexList(indices=(1, 2))
+
+    def test_equal_paths_hash_equal(self):
+        path = "$.store.book[?@.price < 10 && @.isbn].title"
+        first, second = JSONPath(parse(path)), JSONPath(parse(path))
+        assert first == second
+        assert hash(first) == hash(second)
+        assert len({first, second, JSONPath(parse("$.store"))}) == 2
+
+    def test_names_are_interned(self):
+        name = "".join(["ti", "tle"])
+        assert Field(name=name).name is Field(name="title").name
+
+    def test_literal_types_stay_distinct(self):
+        assert Literal(value=True) != Literal(value=1)
+        assert Literal(value=1) == Literal(value=1)
+        assert len({Literal(value=True), Literal(value=1), Literal(value=None)}) == 3
+
+    def test_parsed_path_as_cache_key(self):
+        cache = PathCache()
+        path = JSONPath(parse("$.a.b"))
+        assert cache.get(path) is cache.get(JSONPath(parse("$.a.b")))
+        assert JSONPathEvaluator({"a": {"b": 1}}).select(path) == [1]
+
+    def test_shared_prefix_keeps_literal_types_apart(self):
+        evaluator = JSONPathEvaluator({"items": [{"v": True}, {"v": 1}]})
+        results = evaluator.select_many({"t": "$.items[?@.v == true]", "one": "$.items[?@.v == 1]"})
+        assert results == {"t": [{"v": True}], "one": [{"v": 1}]}
@@ -1,6 +1,26 @@
 import pytest
 from lark import Lark, Tree
 
+from lark.exceptions import LarkError, UnexpectedCharacters
+
+from json_path_parser.parsed_dataclasses import (
+    BracketSelector,
+    Comparison,
+    ExistenceTest,
+    Field,
+    FilterQuery,
+    FilterSelector,
+    IndexList,
+    Literal,
+    LogicalAnd,
+    Name,
+    Slice,
+)
+from json_path_parser import parser as parser_module
+from json_path_parser.cache import PathCache
+from json_path_parser.parser import PARSER_TABLE, create_parser, default_parser, load_parser, save_parser
+from json_path_parser.transformer import JSONPathTransformer
+
 
 class TestParser:
     def test_parse_simple(self, parser: Lark, sample_json_path: str):
@@ -19,3 +39,111 @@ class TestParser:
         assert tree.data == "root"
         assert len(tree.children) == 0
         assert isinstance(tree, Tree)
+
+
+class TestParserBackends:
+    @pytest.mark.parametrize("json_path", [
+        "$",
+        "$.*",
+        "$.store.book[0].title",
+        "$.store.book[-1]",
+        "$.store.book[1:]",
+        "$.store.book[:2]",
+        "$.store.book[::-1]",
+        "$.store.book[0,2]",
+        "$.store.book[*].author",
+        '$.config["special-key"]',
+        "$['single quoted']",
+        "$..author",
+        "$..*",
+        "$..[0]",
+    ])
+    def test_lalr_matches_earley(self, json_path: str) -> None:
+        """Test that the LALR backend builds the same trees as Earley."""
+        lalr = create_parser()
+        earley = create_parser(parser="earley")
+        assert lalr.parse(json_path) == earley.parse(json_path)
+
+    def test_unknown_backend(self) -> None:
+        with pytest.raises(ValueError, match="Unknown parser backend"):
+            create_parser(parser="cyk")
+
+    def test_save_and_load_roundtrip(self, tmp_path) -> None:
+        """Test that a serialized parser table parses like a fresh one."""
+        parser_file = tmp_path / "jsonpath.lark"
+        save_parser(create_parser(), parser_file)
+        loaded = load_parser(parser_file)
+        assert loaded.parse("$.store.book[1:3]") == create_parser().parse("$.store.book[1:3]")
+
+    def test_stale_table_rejected(self, tmp_path) -> None:
+        parser_file = tmp_path / "jsonpath.lark"
+        parser_file.write_bytes(b"0" * 64 + b"\n")
+        with pytest.raises(ValueError, match="another grammar"):
+            load_parser(parser_file)
+
+    def test_shipped_table_is_current(self) -> None:
+        """Test that the packaged table matches the grammar; regenerate it if not."""
+        shipped = load_parser(PARSER_TABLE)
+        assert shipped.parse("$..book[?@.price < 10]") == create_parser().parse("$..book[?@.price < 10]")
+
+    def test_default_parser_falls_back(self, tmp_path, monkeypatch) -> None:
+        monkeypatch.setattr(parser_module, "PARSER_TABLE", tmp_path / "missing")
+        assert default_parser().parse("$.a") == create_parser().parse("$.a")
+
+    @pytest.mark.parametrize("json_path", [
+        '$["\\q"]',
+        "$['\\u12']",
+        '$["tab\there"]',
+        "$[?@.a == '\\x']",
+    ])
+    def test_bad_escapes_are_syntax_errors(self, json_path: str) -> None:
+        with pytest.raises(UnexpectedCharacters):
+            PathCache(maxsize=0).get(json_path)
+
+    @pytest.mark.parametrize("json_path,expected", [
+        ("$.a[1:]", Slice(start=1, end=None, step=None)),
+        ("$.a[:2]", Slice(start=None, end=2, step=None)),
+        ("$.a[::2]", Slice(start=None, end=None, step=2)),
+        ("$.a[1,2]", IndexList(indices=[1, 2])),
+        ('$.a["k"]', Name(name="k")),
+        ("$.a['it\\'s']", Name(name="it's")),
+    ])
+    def test_bracket_alternatives_transform(self, json_path: str, expected) -> None:
+        """Test that each bracket alternative maps to its own dataclass."""
+        result = JSONPathTransformer().transform(create_parser().parse(json_path))
+        assert result.segments[-1] == BracketSelector(content=expected)
+
+
+class TestFilterGrammar:
+    @pytest.mark.parametrize("json_path", [
+        "$.store.book[?(@.price < 10)].title",
+        "$[?@.a && !@.b || ($.x == 'q')]",
+        "$[?@ == null]",
+        "$[?!(@.a >= 1.5e3)]",
+        "$.a[?@[0] != -1]",
+        "$[?@.true == true]",
+    ])
+    def test_filters_parse_with_both_backends(self, json_path: str) -> None:
+        assert create_parser().parse(json_path) == create_parser(parser="earley").parse(json_path)
+
+    @pytest.mark.parametrize("json_path", [
+        "$[?(price < 10)]",     # queries must start with @ or $
+        "$[?@.price === 10]",
+        "$[?]",
+        "$[?@.a &&]",
+    ])
+    def test_invalid_filters(self, json_path: str) -> None:
+        with pytest.raises(LarkError):
+            create_parser().parse(json_path)
+
+    def test_filter_transform(self) -> None:
+        result = JSONPathTransformer().transform(create_parser().parse("$[?@.price < 10 && @.isbn]"))
+        (segment,) = result.segments
+        assert segment == BracketSelector(content=FilterSelector(expression=LogicalAnd(
+            left=Comparison(
+                left=FilterQuery(segments=[Field(name="price")]),
+                op="<",
+                right=Literal(value=10),
+            ),
+            right=ExistenceTest(query=FilterQuery(segments=[Field(name="isbn")])),
+        )))
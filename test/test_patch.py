@@ -0,0 +1,81 @@
+import pytest
+
+from json_path_parser.patch import apply_patch, parse_pointer
+
+
+@pytest.fixture
+def document():
+    return {"a": [1, 2, 3], "b": {"c": 1, "d": 2, "e": 3}, "x/y": {"~": 0}}
+
+
+class TestPointer:
+    def test_tokens_unescaped(self):
+        assert parse_pointer("") == ()
+        assert parse_pointer("/x~1y/~0") == ("x/y", "~")
+        assert parse_pointer("/") == ("",)
+
+    def test_must_start_with_slash(self):
+        with pytest.raises(ValueError, match="must start with"):
+            parse_pointer("a/b")
+
+
+class TestApplyPatch:
+    def test_operations(self, document):
+        result = apply_patch(
+            document,
+            [
+                {"op": "add", "path": "/a/1", "value": 9},
+                {"op": "add", "path": "/a/-", "value": 4},
+                {"op": "remove", "path": "/b/c"},
+                {"op": "replace", "path": "/x~1y/~0", "value": 1},
+                {"op": "move", "from": "/b/d", "path": "/f"},
+                {"op": "copy", "from": "/a", "path": "/g"},
+                {"op": "test", "path": "/g/1", "value": 9},
+            ],
+        )
+        assert result is document
+        assert document == {"a": [1, 9, 2, 3, 4], "b": {"e": 3}, "x/y": {"~": 1}, "f": 2, "g": [1, 9, 2, 3, 4]}
+        assert document["g"] is not document["a"]
+
+    def test_root(self, document):
+        assert apply_patch(document, [{"op": "replace", "path": "", "value": [1]}]) == [1]
+
+    @pytest.mark.parametrize(
+        ("operation", "message"),
+        [
+            ({"op": "remove", "path": "/b/missing"}, "not found"),
+            ({"op": "add", "path": "/a/4", "value": 0}, "out of range"),
+            ({"op": "add", "path": "/a/01", "value": 0}, "Invalid array index"),
+            ({"op": "replace", "path": "/a/-", "value": 0}, "Invalid array index"),
+            ({"op": "test", "path": "/b/c", "value": True}, "Test failed"),
+            ({"op": "move", "from": "/b", "path": "/b/c"}, "own children"),
+            ({"op": "add", "path": "/z"}, "no 'value'"),
+            ({"op": "copy", "path": "/z"}, "no 'from'"),
+            ({"op": "frobnicate", "path": "/z"}, "Unknown"),
+            ({"op": "remove", "path": ""}, "root"),
+        ],
+    )
+    def test_errors(self, document, operation, message):
+        with pytest.raises(ValueError, match=message):
+            apply_patch(document, [operation])
+
+    def test_child_of_scalar(self, document):
+        with pytest.raises(TypeError, match="inside a int"):
+            apply_patch(document, [{"op": "add", "path": "/a/0/x", "value": 0}])
+
+    def test_atomic(self, document):
+        before = repr(document)
+        with pytest.raises(ValueError, match="Test failed"):
+            apply_patch(
+                document,
+                [
+                    {"op": "remove", "path": "/b/c"},
+                    {"op": "remove", "path": "/a/0"},
+                    {"op": "add", "path": "/b/z", "value": 0},
+                    {"op": "replace", "path": "/b/d", "value": 0},
+                    {"op": "move", "from": "/x~1y", "path": "/a/0"},
+                    {"op": "test", "path": "/b/e", "value": 4},
+                ],
+            )
+        # Member order is restored too.
+        assert repr(document) == before
@@ -0,0 +1,95 @@
+import io
+import json
+from pathlib import Path
+
+import pytest
+
+from json_path_parser.evaluator import JSONPathEvaluator
+from json_path_parser.streaming import StreamingQuery, iter_stream, stream_select
+
+DATA_FILE = Path(__file__).parent / "data" / "test_data.json"
+
+PATHS = [
+    "$",
+    "$.store",
+    "$.store.book[*].author",
+    "$.store.book[1:3].title",
+    "$.store.book[-1].title",
+    "$.store.book[::-1].price",
+    "$.store.book[0,2].price",
+    "$.store.book[2,0].price",
+    "$..price",
+    "$.store.book[?@.price < 10].title",
+    "$..[?@.price > 100].model",
+    "$.users[*].purchase_history[*].item",
+    '$.config["special-key"]',
+    "$.store.*",
+    "$.missing",
+    "$..tags[0]",
+    "$.store.book[*].tags[-1]",
+]
+
+
+class TestStreamSelect:
+    @pytest.mark.parametrize("path", PATHS)
+    @pytest.mark.parametrize("chunk_size", [1, 7, 65536])
+    def test_matches_in_memory_select(self, test_data, path, chunk_size):
+        expected = JSONPathEvaluator(test_data).select(path)
+        assert stream_select(path, DATA_FILE, chunk_size=chunk_size) == expected
+
+    def test_recursive_wildcard_in_document_order(self, test_data):
+        streamed = stream_select("$..*", DATA_FILE, chunk_size=5)
+        expected = JSONPathEvaluator(test_data).select("$..*")
+        assert sorted(map(json.dumps, streamed)) == sorted(map(json.dumps, expected))
+
+    def test_iter_stream_is_lazy(self):
+        source = io.BytesIO(b'{"items": [1, 2, 3, 4]}')
+        matches = iter_stream("$.items[*]", source, chunk_size=2)
+        assert next(matches) == 1
+        assert source.tell() < len(source.getvalue())
+
+    def test_text_stream(self):
+        assert stream_select("$.a", io.StringIO('{"a": "x"}')) == ["x"]
+
+
+class TestStreamingQuery:
+    def test_feed_returns_completed_matches(self):
+        query = StreamingQuery("$.a[*]")
+        assert query.feed('{"a": [1, ') == [1]
+        assert query.feed("2]}") == [2]
+        assert query.close() == []
+
+    def test_numbers_split_across_chunks(self):
+        query = StreamingQuery("$[*]")
+        results = []
+        for char in "[8.95, -1e-3, 10]":
+            results += query.feed(char)
+        results += query.close()
+        assert results == [8.95, -0.001, 10]
+
+    def test_utf8_split_across_chunks(self):
+        data = json.dumps({"name": "café ☃"}, ensure_ascii=False).encode()
+        query = StreamingQuery("$.name")
+        results = []
+        for i in range(len(data)):
+            results += query.feed(data[i : i + 1])
+        assert results + query.close() == ["café ☃"]
+
+    def test_escaped_strings(self):
+        assert stream_select("$['a\"b']", io.BytesIO(rb'{"a\"b": "\u00e9\n"}')) == ["\u00e9\n"]
+
+    def test_skipped_subtrees_are_not_decoded(self):
+        data = b'{"skip": {"deep": ["\\u00e9", 1.5, [true]]}, "keep": 1}'
+        assert stream_select("$.keep", io.BytesIO(data), chunk_size=3) == [1]
+
+    @pytest.mark.parametrize(
+        "text",
+        ['{"a": 1', '{"a" 1}', "[1, 2,, 3]", '{"a": tru}', "[01]", "[1] 2"],
+    )
+    def test_malformed_input(self, text):
+        with pytest.raises(ValueError, match="."):
+            stream_select("$..*", io.StringIO(text))
+
+    def test_root_in_filter_rejected(self):
+        with pytest.raises(ValueError, match="'\\$'"):
+            StreamingQuery("$.store.book[?@.price < $.config.shipping.free_threshold]")
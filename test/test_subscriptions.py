@@ -0,0 +1,172 @@
+import copy
+import random
+
+import pytest
+
+from json_path_parser import subscriptions
+from json_path_parser.locations import normalized_path
+from json_path_parser.subscriptions import LiveDocument
+
+PATHS = [
+    "$",
+    "$.store.book[*].title",
+    "$.store.book[0]",
+    "$.store.book[-1].price",
+    "$.store.book[1:3].author",
+    "$.store.book[::-1].title",
+    "$.store.book[0,-1].isbn",
+    "$.store.book[?@.price < 10].title",
+    "$.store.book[?@.tags[0] == 'x']",
+    "$..price",
+    "$..*",
+    "$..book[?@.isbn].author",
+    "$.store.*",
+    "$.store.book[?@.price > $.expensive].title",
+    "$.missing.deeper",
+]
+
+
+def expected(subscription, document):
+    return {loc.path: loc.value for loc in subscription.plan.locate(document)}
+
+
+def random_operation(rng, document):
+    books = document["store"]["book"]
+    i = rng.randrange(len(books)) if books else 0
+    choices = [
+        {"op": "replace", "path": f"/store/book/{i}/price", "value": rng.choice([1, 8.5, 25])},
+        {"op": "add", "path": f"/store/book/{rng.randint(0, len(books))}", "value": {"title": "n", "price": rng.randint(1, 30), "tags": ["x"]}},
+        {"op": "add", "path": "/store/book/-", "value": {"title": "m", "isbn": "1"}},
+        {"op": "add", "path": f"/store/book/{i}/isbn", "value": "2"},
+        {"op": "replace", "path": "/expensive", "value": rng.randint(1, 30)},
+        {"op": "add", "path": "/store/bicycle/price", "value": rng.randint(1, 30)},
+        {"op": "replace", "path": "/store/extra", "value": {"price": 3}} if "extra" in document["store"] else {"op": "add", "path": "/store/extra", "value": {"price": 3}},
+    ]
+    if books:
+        choices += [
+            {"op": "remove", "path": f"/store/book/{i}"},
+            {"op": "remove", "path": f"/store/book/{len(books) - 1}"},
+            {"op": "replace", "path": f"/store/book/{i}/tags", "value": [rng.choice("xy")]},
+            {"op": "move", "from": f"/store/book/{i}", "path": "/store/book/0"},
+            {"op": "copy", "from": f"/store/book/{i}", "path": "/store/book/-"},
+        ]
+    return rng.choice(choices)
+
+
+class TestLiveDocument:
+    def test_matches_follow_random_patches(self, test_data):
+        rng = random.Random(7)
+        document = copy.deepcopy(test_data)
+        document["expensive"] = 10
+        live = LiveDocument(document)
+        state = {}
+
+        def callback_for(path):
+            def callback(delta):
+                current = state[path]
+                for key in delta.removed:
+                    del current[key]
+                current.update(delta.added)
+
+            return callback
+
+        subscriptions = {path: live.subscribe(path, callback_for(path)) for path in PATHS}
+        for path, subscription in subscriptions.items():
+            state[path] = dict(subscription.matches)
+        for _ in range(200):
+            operations = [random_operation(rng, live.document) for _ in range(rng.randint(1, 3))]
+            try:
+                live.patch(operations)
+            except ValueError:
+                continue
+            for path, subscription in subscriptions.items():
+                full = expected(subscription, live.document)
+                assert subscription.matches == full, (path, operations)
+                assert state[path] == full, (path, operations)
+
+    def test_delta(self):
+        live = LiveDocument({"orders": [{"id": 1, "qty": 2}, {"id": 2, "qty": 5}]})
+        deltas = []
+        live.subscribe("$.orders[?@.qty > 3].id", deltas.append)
+        live.patch([{"op": "replace", "path": "/orders/0/qty", "value": 4}])
+        (delta,) = deltas
+        assert delta.added == {"$['orders'][0]['id']": 1}
+        assert delta.removed == {}
+        live.patch([{"op": "remove", "path": "/orders/0"}])
+        # Both shifted: order 2 is now at index 0.
+        assert deltas[1].removed == {"$['orders'][0]['id']": 1, "$['orders'][1]['id']": 2}
+        assert deltas[1].added == {"$['orders'][0]['id']": 2}
+
+    def test_changed_value_in_both(self):
+        live = LiveDocument({"a": {"b": 1}})
+        deltas = []
+        live.subscribe("$.a", deltas.append)
+        live.patch([{"op": "add", "path": "/a/c", "value": 2}])
+        (delta,) = deltas
+        assert delta.added == delta.removed == {"$['a']": {"b": 1, "c": 2}}
+
+    def test_unaffected_subscriptions_not_notified_or_evaluated(self, test_data):
+        live = LiveDocument(copy.deepcopy(test_data))
+        calls = []
+        subscription = live.subscribe("$.store.book[*].title", calls.append)
+        other = live.subscribe("$..price", calls.append)
+
+        def fail(_document):
+            raise AssertionError("evaluated the whole document")
+
+        object.__setattr__(subscription.plan, "locate", fail)
+        object.__setattr__(other.plan, "locate", fail)
+        live.patch([{"op": "replace", "path": "/store/bicycle/color", "value": "blue"}])
+        assert calls == []
+        live.patch([{"op": "replace", "path": "/store/book/0/price", "value": 1}])
+        assert len(calls) == 1
+        assert calls[0].added == {"$['store']['book'][0]['price']": 1}
+
+    def test_refresh_visits_only_related_matches(self, monkeypatch):
+        live = LiveDocument({"items": [{"v": i} for i in range(100)]})
+        deltas = []
+        live.subscribe("$.items[*].v", deltas.append)
+        walk = subscriptions._walk  # noqa: SLF001
+        visited = []
+
+        def counting_walk(node, keys):
+            for item in walk(node, keys):
+                visited.append(item)
+                yield item
+
+        monkeypatch.setattr(subscriptions, "_walk", counting_walk)
+        live.patch([{"op": "replace", "path": "/items/3/v", "value": -1}])
+        assert visited == [(("items", 3, "v"), 3)]
+        assert deltas[0].added == {"$['items'][3]['v']": -1}
+        assert deltas[0].removed == {"$['items'][3]['v']": 3}
+
+    def test_failed_patch_changes_nothing(self):
+        live = LiveDocument({"a": [1, 2]})
+        calls = []
+        live.subscribe("$.a[*]", calls.append)
+        with pytest.raises(ValueError, match="Test failed"):
+            live.patch([{"op": "remove", "path": "/a/0"}, {"op": "test", "path": "/a/0", "value": 1}])
+        assert live.document == {"a": [1, 2]}
+        assert calls == []
+
+    def test_root_replaced(self):
+        live = LiveDocument({"a": 1})
+        deltas = []
+        live.subscribe("$.a", deltas.append)
+        live.patch([{"op": "replace", "path": "", "value": {"a": 2}}])
+        assert live.document == {"a": 2}
+        assert deltas[0].removed == {"$['a']": 1}
+        assert deltas[0].added == {"$['a']": 2}
+
+    def test_unsubscribe(self):
+        live = LiveDocument({"a": 1})
+        calls = []
+        subscription = live.subscribe("$.a", calls.append)
+        live.unsubscribe(subscription)
+        live.patch([{"op": "replace", "path": "/a", "value": 2}])
+        assert calls == []
+        with pytest.raises(ValueError):
+            live.unsubscribe(subscription)
+
+    def test_normalized_keys(self):
+        assert normalized_path(("a", 0, "it's")) == "$['a'][0]['it\\'s']"
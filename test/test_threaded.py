@@ -0,0 +1,79 @@
+import copy
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from json_path_parser.cache import PathCache
+from json_path_parser.evaluator import JSONPathEvaluator
+from json_path_parser.parsed_dataclasses import JSONPath
+from json_path_parser.threaded import _batches, select_batch, select_each
+
+PATHS = [
+    "$.store.book[*].author",
+    "$..price",
+    "$.store.book[?@.price < 10].title",
+    "$..book[-1]",
+    "$.store.*",
+    "$..[0]",
+    "$.users[*].purchase_history[*].item",
+]
+
+
+class TestThreaded:
+    @pytest.mark.parametrize("workers", [1, 4])
+    def test_select_batch(self, test_data, workers):
+        expected = [JSONPathEvaluator(test_data).select(path) for path in PATHS]
+        assert select_batch(test_data, PATHS, max_workers=workers) == expected
+        assert JSONPathEvaluator(test_data, index=True).select_batch(PATHS, max_workers=workers) == expected
+
+    def test_select_each(self, test_data):
+        documents = [{"a": i} for i in range(100)] + [test_data]
+        results = select_each("$..a", documents, max_workers=3)
+        assert results[:100] == [[i] for i in range(100)]
+        assert results[100] == JSONPathEvaluator(test_data).select("$..a")
+
+    def test_existing_executor(self, test_data):
+        with ThreadPoolExecutor(2) as pool:
+            results = select_batch(test_data, PATHS * 3, executor=pool)
+        assert results == [JSONPathEvaluator(test_data).select(path) for path in PATHS * 3]
+
+    def test_empty(self):
+        assert select_batch({}, []) == []
+        assert select_each("$", []) == []
+
+    def test_batches_cover_items_in_order(self):
+        items = list(range(103))
+        batches = _batches(items, 4)
+        assert len(batches) == 16
+        assert [item for batch in batches for item in batch] == items
+        assert _batches([1, 2], 8) == [[1], [2]]
+
+
+class TestSharedState:
+    def test_concurrent_compile_and_select(self, test_data):
+        data = copy.deepcopy(test_data)
+        cache = PathCache(maxsize=3)
+        parsed = {path: JSONPath(cache.get(path).segments) for path in PATHS}
+        expected = {path: JSONPathEvaluator(data).select(path) for path in PATHS}
+        evaluator = JSONPathEvaluator(data, index=True)
+        barrier = threading.Barrier(8)
+        failures = []
+
+        def worker(offset):
+            barrier.wait()
+            for i in range(200):
+                path = PATHS[(offset + i) % len(PATHS)]
+                if cache.get(path).evaluate(data) != expected[path]:
+                    failures.append(path)
+                if evaluator.select(parsed[path]) != expected[path]:
+                    failures.append(path)
+
+        threads = [threading.Thread(target=worker, args=(i,)) for i in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        assert failures == []
+        assert parsed == {path: JSONPath(PathCache().get(path).segments) for path in PATHS}
+        assert data == test_data